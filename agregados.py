@@ -0,0 +1,194 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CAMINHO_AGREGADOS = 'agregados_diarios.parquet'
+
+# Métricas escalares por dia; as demais são contagens por chave (idioma, conceito...)
+METRICAS_ESCALARES = ('reviews', 'positivas', 'soma_minutos', 'n_minutos')
+METRICAS_CHAVEADAS = ('faixa', 'idioma', 'conceito', 'mencoes_aspecto', 'positivas_aspecto')
+
+FAIXAS_HORAS = [('0-2h', -np.inf, 2), ('2-5h', 2, 5), ('5-10h', 5, 10), ('10+h', 10, np.inf)]
+
+_COLUNAS = ['dia', 'metrica', 'chave', 'valor']
+
+
+def _longo(dias, metrica, valores, chaves=None):
+    """Tabela longa (dia, metrica, chave, valor) somando `valores` por dia (e chave)"""
+    partes = pd.DataFrame({'dia': dias, 'chave': '' if chaves is None else chaves, 'valor': valores})
+    soma = partes.groupby(['dia', 'chave'], sort=True, observed=True)['valor'].sum().reset_index()
+    soma['metrica'] = metrica
+    return soma[_COLUNAS]
+
+
+def _pares(contagens, dias, filtro=None):
+    """Expande [{chave: ocorrências} por review] em arrays paralelos (dia, chave, ocorrências)"""
+    tamanhos = np.fromiter((len(c) for c in contagens), dtype=np.int64, count=len(contagens))
+    chaves = [chave for c in contagens for chave in c]
+    valores = np.fromiter((v for c in contagens for v in c.values()), dtype=np.int64, count=len(chaves))
+    dias_pares = np.repeat(dias, tamanhos)
+    if filtro is not None:
+        manter = np.repeat(filtro, tamanhos)
+        return dias_pares[manter], [c for c, m in zip(chaves, manter) if m], valores[manter]
+    return dias_pares, chaves, valores
+
+
+def parciais_diarios(df, acertos=None):
+    """
+    Contagens parciais por dia (coluna 'Data da Review') de um bloco de
+    reviews, em formato longo: reviews, positivas, soma/contagem de minutos,
+    faixas de horas, idiomas e, com os `acertos` do CasadorConceitos,
+    conceitos e menções/positivas por aspecto. Reviews sem data ficam de fora.
+    """
+    dias = pd.to_datetime(df['Data da Review']).dt.normalize().to_numpy()
+    partes = [_longo(dias, 'reviews', np.ones(len(df), dtype=np.int64))]
+
+    recomendado = None
+    if 'Recomendado' in df.columns:
+        recomendado = (df['Recomendado'] == True).to_numpy()
+        partes.append(_longo(dias, 'positivas', recomendado.astype(np.int64)))
+    if 'Horas Jogadas' in df.columns:
+        minutos = pd.to_numeric(df['Horas Jogadas'], errors='coerce').to_numpy(dtype=np.float64)
+        presentes = ~np.isnan(minutos)
+        partes.append(_longo(dias, 'soma_minutos', np.where(presentes, minutos, 0.0)))
+        partes.append(_longo(dias, 'n_minutos', presentes.astype(np.int64)))
+        horas = minutos / 60
+        for faixa, minimo, maximo in FAIXAS_HORAS:
+            na_faixa = (horas > minimo) & (horas <= maximo)
+            partes.append(_longo(dias, 'faixa', na_faixa.astype(np.int64), faixa))
+    if 'Idioma' in df.columns:
+        partes.append(_longo(dias, 'idioma', df['Idioma'].notna().to_numpy().astype(np.int64),
+                             df['Idioma'].astype(str).to_numpy()))
+
+    if acertos is not None:
+        # Conceitos somam ocorrências; aspectos contam uma menção por review
+        dias_conceitos, conceitos, ocorrencias = _pares([a['conceitos'] for a in acertos], dias)
+        if conceitos:
+            partes.append(_longo(dias_conceitos, 'conceito', ocorrencias, conceitos))
+        aspectos = [a['aspectos'] for a in acertos]
+        dias_aspectos, chaves, _ = _pares(aspectos, dias)
+        if chaves:
+            partes.append(_longo(dias_aspectos, 'mencoes_aspecto', np.ones(len(chaves), dtype=np.int64), chaves))
+        if recomendado is not None:
+            dias_positivos, chaves, _ = _pares(aspectos, dias, recomendado)
+            if chaves:
+                partes.append(_longo(dias_positivos, 'positivas_aspecto', np.ones(len(chaves), dtype=np.int64), chaves))
+
+    tabela = pd.concat(partes, ignore_index=True)
+    return tabela[tabela['valor'] != 0]
+
+
+class AgregadosTemporais:
+    """
+    Camada materializada de agregados diários das reviews.
+
+    Cada linha é uma contagem parcial (dia, métrica, chave, valor). Totais de
+    qualquer janela (histórico completo, últimos 30 dias) e séries (mensal,
+    semanal) saem da soma dos dias da janela, sem reprocessar as reviews.
+
+    `substituir` troca apenas os dias presentes nos parciais recebidos: ao
+    coletar reviews novas, basta recalcular os dias afetados. A tabela é
+    gravada em Parquet com a versão da análise (mapas de palavras-chave); uma
+    versão diferente invalida os agregados.
+    """
+
+    def __init__(self, versao=None, tabela=None):
+        self.versao = versao
+        self.tabela = tabela if tabela is not None else pd.DataFrame(
+            {'dia': pd.Series(dtype='datetime64[ns]'), 'metrica': pd.Series(dtype=object),
+             'chave': pd.Series(dtype=object), 'valor': pd.Series(dtype=np.float64)}
+        )
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_AGREGADOS, versao=None):
+        """Lê os agregados; devolve uma camada vazia se não existirem ou a versão mudou"""
+        try:
+            tabela = pq.read_table(caminho)
+        except FileNotFoundError:
+            return cls(versao)
+        metadados = tabela.schema.metadata or {}
+        versao_salva = metadados.get(b'versao', b'').decode()
+        if versao is not None and versao_salva != versao:
+            print(f"Agregados em '{caminho}' são de outra versão da análise; serão recalculados.")
+            return cls(versao)
+        return cls(versao_salva or versao, tabela.to_pandas())
+
+    def salvar(self, caminho=CAMINHO_AGREGADOS):
+        tabela = pa.Table.from_pandas(self.tabela, preserve_index=False)
+        tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}), b'versao': (self.versao or '').encode()})
+        pq.write_table(tabela, caminho)
+
+    @property
+    def dias(self):
+        return self.tabela['dia'].nunique()
+
+    def substituir(self, parciais):
+        """Troca os dias presentes em `parciais` pelos novos valores"""
+        if isinstance(parciais, list):
+            parciais = pd.concat(parciais, ignore_index=True) if parciais else None
+        if parciais is None or parciais.empty:
+            return self
+        novos = parciais.groupby(['dia', 'metrica', 'chave'], sort=False)['valor'].sum().reset_index()
+        mantidos = self.tabela[~self.tabela['dia'].isin(novos['dia'].unique())]
+        tabela = pd.concat([mantidos, novos[_COLUNAS]], ignore_index=True)
+        tabela['valor'] = tabela['valor'].astype(np.float64)
+        self.tabela = tabela.sort_values(['dia', 'metrica', 'chave'], kind='stable').reset_index(drop=True)
+        return self
+
+    def _janela(self, inicio=None, fim=None):
+        tabela = self.tabela
+        if inicio is not None:
+            tabela = tabela[tabela['dia'] >= pd.Timestamp(inicio)]
+        if fim is not None:
+            tabela = tabela[tabela['dia'] <= pd.Timestamp(fim)]
+        return tabela
+
+    def totais(self, inicio=None, fim=None):
+        """
+        Soma dos dias em [inicio, fim]: {métrica escalar: valor} e
+        {métrica chaveada: Counter}, na ordem do primeiro dia em que a chave aparece.
+        """
+        janela = self._janela(inicio, fim)
+        totais = {m: 0 for m in METRICAS_ESCALARES}
+        totais.update({m: Counter() for m in METRICAS_CHAVEADAS})
+        for (metrica, chave), valor in janela.groupby(['metrica', 'chave'], sort=False)['valor'].sum().items():
+            valor = int(valor) if metrica != 'soma_minutos' else float(valor)
+            if metrica in METRICAS_ESCALARES:
+                totais[metrica] = valor
+            else:
+                totais[metrica][chave] = valor
+        return totais
+
+    def ultimos_dias(self, n=30):
+        """Totais dos `n` dias terminando no dia mais recente com reviews"""
+        if self.tabela.empty:
+            return self.totais()
+        fim = self.tabela['dia'].max()
+        return self.totais(fim - pd.Timedelta(days=n - 1), fim)
+
+    def serie(self, frequencia='M'):
+        """
+        Tendência por período ('M' mensal, 'W' semanal): reviews, positivas,
+        aprovação (%) e média de horas jogadas.
+        """
+        escalares = self.tabela[self.tabela['metrica'].isin(METRICAS_ESCALARES)]
+        if escalares.empty:
+            return []
+        largura = escalares.pivot_table(index='dia', columns='metrica', values='valor', aggfunc='sum', fill_value=0)
+        largura = largura.reindex(columns=list(METRICAS_ESCALARES), fill_value=0)
+        periodos = largura.groupby(largura.index.to_period(frequencia)).sum()
+
+        serie = []
+        for periodo, linha in periodos.iterrows():
+            reviews = int(linha['reviews'])
+            serie.append({
+                'periodo': str(periodo),
+                'reviews': reviews,
+                'positivas': int(linha['positivas']),
+                'aprovacao': round(100 * linha['positivas'] / reviews, 1) if reviews else None,
+                'avgPlaytime': round(linha['soma_minutos'] / linha['n_minutos'] / 60, 2) if linha['n_minutos'] else None,
+            })
+        return serie
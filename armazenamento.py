@@ -0,0 +1,128 @@
+import os
+import sys
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+# Diretório do dataset Parquet particionado (AppID=/Idioma=/Mes=)
+DIRETORIO_REVIEWS = 'dados_reviews'
+COLUNAS_PARTICAO = ['AppID', 'Idioma', 'Mes']
+# Jogo dos scripts de um jogo só (The Vale: Shadow of the Crown); o
+# armazenamento pode ter outros jogos, gravados pelo lote_jogos.py
+APPID_PADRAO = 989790
+
+
+def normalizar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica os tipos colunares do armazenamento: Idioma categórico, Recomendado
+    booleano, horas/votos em int32, pontuação em float32 e Data da Review como
+    timestamp.
+    """
+    df = df.copy()
+    for coluna in ('ID da Review', 'ID do Autor'):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype(str)
+    for coluna in ('Horas Jogadas', 'Horas na Review', 'Votos Úteis'):
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce').fillna(0).astype('int32')
+    if 'Pontuação de Utilidade' in df.columns:
+        df['Pontuação de Utilidade'] = pd.to_numeric(df['Pontuação de Utilidade'], errors='coerce').astype('float32')
+    if 'Recomendado' in df.columns:
+        df['Recomendado'] = df['Recomendado'].astype(bool)
+    if 'Data da Review' in df.columns:
+        df['Data da Review'] = pd.to_datetime(df['Data da Review'])
+    if 'Idioma' in df.columns:
+        df['Idioma'] = df['Idioma'].astype('category')
+    return df
+
+
+def salvar_reviews(df: pd.DataFrame, appid: int, diretorio: str = DIRETORIO_REVIEWS) -> None:
+    """
+    Grava as reviews de um appid em Parquet, particionadas por appid/idioma/mês.
+    As partições tocadas são substituídas; as demais permanecem intactas.
+    """
+    df = normalizar_tipos(df)
+    df['AppID'] = int(appid)
+    df['Mes'] = df['Data da Review'].dt.strftime('%Y-%m')
+    df['Idioma'] = df['Idioma'].astype(str)
+    df.to_parquet(
+        diretorio,
+        engine='pyarrow',
+        index=False,
+        partition_cols=COLUNAS_PARTICAO,
+        existing_data_behavior='delete_matching'
+    )
+
+
+def existe_armazenamento(diretorio: str = DIRETORIO_REVIEWS) -> bool:
+    return os.path.isdir(diretorio) and any(os.scandir(diretorio))
+
+
+def diretorio_jogo(appid: Optional[int] = APPID_PADRAO, diretorio: str = DIRETORIO_REVIEWS) -> str:
+    """Partição de um jogo no armazenamento (o armazenamento inteiro se `appid` for None)"""
+    return diretorio if appid is None else os.path.join(diretorio, f'AppID={int(appid)}')
+
+
+def carregar_reviews(colunas: Optional[List[str]] = None, appid: Optional[int] = None,
+                     diretorio: str = DIRETORIO_REVIEWS) -> pd.DataFrame:
+    """
+    Lê o dataset Parquet carregando apenas as `colunas` pedidas.
+    `appid` filtra pela partição, sem ler os arquivos dos outros jogos.
+    """
+    filtros = [('AppID', '=', int(appid))] if appid is not None else None
+    df = pd.read_parquet(diretorio, engine='pyarrow', columns=colunas, filters=filtros)
+    if colunas is None:
+        df = df.drop(columns=['Mes'], errors='ignore')
+    return df
+
+
+def ler_em_blocos(origem: str = DIRETORIO_REVIEWS, tamanho_bloco: int = 50_000,
+                  colunas: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lê as reviews em blocos de até `tamanho_bloco` linhas, sem carregar o corpus
+    inteiro: lotes de row groups para o diretório Parquet, `chunksize` para
+    .csv e linhas para .jsonl. Planilhas .xlsx não podem ser lidas em partes e
+    são carregadas de uma vez.
+    """
+    if os.path.isdir(origem):
+        import pyarrow.dataset as ds
+        particionamento = ds.HivePartitioning.discover(infer_dictionary=True)
+        dataset = ds.dataset(origem, format='parquet', partitioning=particionamento)
+        if colunas is None:
+            colunas = [c for c in dataset.schema.names if c != 'Mes']
+        for lote in dataset.to_batches(columns=colunas, batch_size=tamanho_bloco):
+            if lote.num_rows:
+                yield lote.to_pandas()
+    elif origem.endswith('.csv'):
+        yield from pd.read_csv(origem, usecols=colunas, chunksize=tamanho_bloco)
+    elif origem.endswith('.jsonl'):
+        for bloco in pd.read_json(origem, lines=True, chunksize=tamanho_bloco):
+            yield bloco[colunas] if colunas else bloco
+    elif origem.endswith('.xlsx'):
+        df = pd.read_excel(origem, usecols=colunas)
+        for inicio in range(0, len(df), tamanho_bloco):
+            yield df.iloc[inicio:inicio + tamanho_bloco]
+    else:
+        raise ValueError(f"Formato de entrada não suportado: {origem}")
+
+
+def exportar_reviews(df: pd.DataFrame, caminho: str) -> None:
+    """Exporta as reviews para .xlsx ou .csv (formatos opcionais de intercâmbio)"""
+    df = df.drop(columns=['AppID', 'Mes'], errors='ignore')
+    if caminho.endswith('.xlsx'):
+        df.to_excel(caminho, index=False)
+    elif caminho.endswith('.csv'):
+        df.to_csv(caminho, index=False)
+    else:
+        raise ValueError(f"Formato de exportação não suportado: {caminho}")
+
+
+if __name__ == '__main__':
+    # Importa uma planilha existente (.xlsx/.csv) para o armazenamento Parquet
+    if len(sys.argv) < 3:
+        print("Uso: python armazenamento.py <arquivo.xlsx|arquivo.csv> <appid>")
+        sys.exit(1)
+    caminho, appid = sys.argv[1], int(sys.argv[2])
+    df = pd.read_excel(caminho) if caminho.endswith('.xlsx') else pd.read_csv(caminho)
+    salvar_reviews(df.dropna(subset=['Data da Review']), appid)
+    print(f"✓ {len(df)} reviews importadas para '{DIRETORIO_REVIEWS}/'")
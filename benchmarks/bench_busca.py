@@ -0,0 +1,78 @@
+"""
+Benchmark do índice de busca (busca_reviews.py) vs. varrer o DataFrame.
+
+Indexa um corpus sintético e compara, para os termos de cada aspecto, a
+contagem de menções/positivas via `str.contains` sobre todas as reviews com a
+consulta FTS5 (com e sem filtros de idioma e data), conferindo os resultados.
+
+Uso:
+    python benchmarks/bench_busca.py [tamanho]   (ex.: 50k, 200k)
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from busca_reviews import IndiceReviews
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho
+from processar_dados import ASPECTOS
+
+
+def contar_varrendo(df, termos, **filtros):
+    if filtros.get('idioma'):
+        df = df[df['Idioma'] == filtros['idioma']]
+    if filtros.get('desde'):
+        df = df[df['Data da Review'] >= pd.Timestamp(filtros['desde'])]
+    padrao = '|'.join(re.escape(t) for t in termos)
+    mencoes = df['Review'].str.lower().str.contains(padrao, regex=True, na=False)
+    return int(mencoes.sum()), int((mencoes & (df['Recomendado'] == True)).sum())
+
+
+def main():
+    tamanho = interpretar_tamanho(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df = GeradorCorpus().gerar_bloco(tamanho)
+    df['Data da Review'] = pd.to_datetime(df['Data da Review'])
+    casos = [{}, {'idioma': 'english'}, {'idioma': 'english', 'desde': df['Data da Review'].median()}]
+
+    with tempfile.TemporaryDirectory() as pasta:
+        with IndiceReviews(os.path.join(pasta, 'indice.sqlite')) as indice:
+            inicio = time.perf_counter()
+            indice.indexar(df, appid=989790)
+            t_indexacao = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            indice.indexar(df.tail(1000), appid=989790)
+            t_reindexacao = time.perf_counter() - inicio
+
+            print(f"\n{len(df)} reviews indexadas em {t_indexacao:.2f}s; "
+                  f"reenvio de 1000 inalteradas: {t_reindexacao * 1000:.1f} ms")
+            for filtros in casos:
+                t_varredura = t_indice = 0.0
+                for termos in ASPECTOS.values():
+                    inicio = time.perf_counter()
+                    esperado = contar_varrendo(df, termos, **filtros)
+                    t_varredura += time.perf_counter() - inicio
+
+                    inicio = time.perf_counter()
+                    contagens = indice.contar_por('recomendado', termos, **filtros)
+                    t_indice += time.perf_counter() - inicio
+                    obtido = (sum(contagens.values()), contagens.get(True, 0))
+                    assert obtido == esperado, f"{termos}: índice {obtido} != varredura {esperado}"
+
+                descricao = ', '.join(f"{k}={v}" for k, v in filtros.items()) or 'sem filtros'
+                print(f"{len(ASPECTOS)} aspectos ({descricao}): varredura {t_varredura * 1000:.0f} ms, "
+                      f"índice {t_indice * 1000:.1f} ms ({t_varredura / t_indice:.0f}x)")
+        # Ao fechar, o WAL é incorporado ao arquivo do índice
+        tamanho_indice = sum(os.path.getsize(os.path.join(pasta, f)) for f in os.listdir(pasta))
+        print(f"Índice em disco: {tamanho_indice / 2**20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
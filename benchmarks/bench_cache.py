@@ -0,0 +1,73 @@
+"""
+Benchmark: análise com cache de reviews (cache_reviews) em execuções repetidas.
+
+Mede a análise completa sem cache, com o cache vazio (primeira execução), com o
+cache cheio (reexecução) e com uma fração de reviews novas, verificando que o
+resultado é sempre igual ao da análise sem cache.
+
+Uso:
+    python benchmarks/bench_cache.py [fator_de_replicacao] [fracao_nova]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd
+
+import processar_dados as pdados
+
+CSV_PADRAO = os.path.join(RAIZ, 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+
+
+def corpus(base, fator, sufixo=''):
+    """Replica o CSV tornando cada cópia um texto distinto (cada review uma chave nova)"""
+    copias = []
+    for i in range(fator):
+        copia = base.copy()
+        copia['Review'] = copia['Review'].astype(str) + f' {sufixo}{i}'
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def analisar(df, cache=None):
+    inicio = time.perf_counter()
+    dados = pdados.AcumuladorAnalise(cache=cache).atualizar(df).resultado()
+    return dados, time.perf_counter() - inicio
+
+
+def main():
+    fator = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    fracao_nova = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+    base = pd.read_csv(CSV_PADRAO)
+    df = corpus(base, fator)
+    n_novas = max(1, int(len(df) * fracao_nova))
+    novas = corpus(base, -(-n_novas // len(base)), sufixo='nova').head(n_novas)
+    df_atualizado = pd.concat([df, novas], ignore_index=True)
+    print(f"Corpus: {len(df)} reviews; reexecução com {len(novas)} novas")
+
+    esperado, t_sem = analisar(df)
+    esperado_atualizado, _ = analisar(df_atualizado)
+    print(f"Sem cache:                 {t_sem:.2f}s")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'cache.sqlite')
+        for rotulo, dados_df, referencia in [
+            ('Cache vazio (1ª execução)', df, esperado),
+            ('Cache cheio (reexecução) ', df, esperado),
+            ('Com reviews novas        ', df_atualizado, esperado_atualizado),
+        ]:
+            cache = pdados.abrir_cache(caminho)
+            dados, t = analisar(dados_df, cache)
+            status = 'idêntico' if dados == referencia else 'DIFERENTE'
+            print(f"{rotulo}: {t:.2f}s ({t_sem / t:.1f}x) - {status} - "
+                  f"acerto {cache.taxa_acerto:.1%}")
+            cache.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: casamento de palavras-chave em passada única vs. implementação anterior.
+
+Compara extrair_conceitos / analisar_opiniao_aspectos / analisar_coocorrencia
+(derivadas de uma única passada do CasadorConceitos) com as versões antigas,
+que reescaneavam o corpus uma vez por termo/aspecto/conceito.
+
+Uso:
+    python benchmarks/bench_casamento.py [fator_de_replicacao]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd
+
+import processar_dados as pdados
+
+CSV_PADRAO = os.path.join(RAIZ, 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+
+
+# --- Implementações anteriores (referência) ---
+
+def extrair_conceitos_legado(df):
+    concept_counts = Counter()
+    reviews_text = ' '.join(df['Review'].astype(str).str.lower())
+    for concept, terms in pdados.KEYWORDS_CONCEITOS.items():
+        count = sum(reviews_text.count(term.lower()) for term in terms)
+        if count > 0:
+            concept_counts[concept] = count
+    return [
+        {'name': name.replace('_', ' ').title(), 'count': count}
+        for name, count in concept_counts.most_common(10)
+    ]
+
+
+def analisar_opiniao_aspectos_legado(df):
+    resultados = {}
+    for aspecto, keywords in pdados.ASPECTOS.items():
+        mentions = df[df['Review'].str.lower().str.contains('|'.join(keywords), na=False)]
+        if len(mentions) > 0:
+            positive_mentions = mentions[mentions['Recomendado'] == True]
+            resultados[aspecto] = int((len(positive_mentions) / len(mentions)) * 100)
+        else:
+            resultados[aspecto] = 50
+    return resultados
+
+
+def analisar_coocorrencia_legado(df, keywords):
+    coocorrencias = Counter()
+    for review in df['Review'].astype(str).str.lower():
+        conceitos_presentes = []
+        for concept, terms in keywords.items():
+            if any(term in review for term in terms):
+                conceitos_presentes.append(concept)
+        if len(conceitos_presentes) > 1:
+            conceitos_presentes.sort()
+            for i in range(len(conceitos_presentes)):
+                for j in range(i + 1, len(conceitos_presentes)):
+                    coocorrencias[f"{conceitos_presentes[i]}|{conceitos_presentes[j]}"] += 1
+    edges = []
+    for pair, weight in coocorrencias.most_common(15):
+        source, target = pair.split('|')
+        edges.append({
+            'source': source.replace('_', ' ').title(),
+            'target': target.replace('_', ' ').title(),
+            'weight': weight
+        })
+    return edges
+
+
+def cronometrar(func, *args):
+    inicio = time.perf_counter()
+    resultado = func(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    fator = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    base = pd.read_csv(CSV_PADRAO).dropna(subset=['Review'])
+    df = pd.concat([base] * fator, ignore_index=True)
+    print(f"Corpus: {len(df)} reviews ({len(base)} x {fator})")
+
+    legado = {}
+    t_legado = 0.0
+    legado['concepts'], t = cronometrar(extrair_conceitos_legado, df)
+    t_legado += t
+    legado['opinions'], t = cronometrar(analisar_opiniao_aspectos_legado, df)
+    t_legado += t
+    legado['coocorrencia'], t = cronometrar(analisar_coocorrencia_legado, df, pdados.KEYWORDS_COOCORRENCIA)
+    t_legado += t
+
+    acertos, t_novo = cronometrar(pdados.casar_reviews, df)
+    novo = {}
+    novo['concepts'], t = cronometrar(pdados.extrair_conceitos, df, acertos)
+    t_novo += t
+    novo['opinions'], t = cronometrar(pdados.analisar_opiniao_aspectos, df, acertos)
+    t_novo += t
+    novo['coocorrencia'], t = cronometrar(pdados.analisar_coocorrencia, df, pdados.KEYWORDS_COOCORRENCIA, acertos)
+    t_novo += t
+
+    print(f"Implementação anterior: {t_legado:.3f}s")
+    print(f"Passada única:          {t_novo:.3f}s  ({t_legado / t_novo:.1f}x)")
+    for chave in legado:
+        status = 'OK' if legado[chave] == novo[chave] else 'DIFERENTE'
+        print(f"  {chave}: {status}")
+
+
+if __name__ == '__main__':
+    main()
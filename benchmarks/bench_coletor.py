@@ -0,0 +1,54 @@
+"""
+Benchmark do coletor da Steam contra o servidor stub local.
+
+Compara a coleta serial (1 worker) com a concorrente (N workers) sobre vários
+appids e idiomas, com latência artificial e respostas 429 injetadas, e
+reporta a vazão em reviews/s.
+
+Uso:
+    python benchmarks/bench_coletor.py [workers]
+"""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from coletor_steam import ColetorSteam, LimitadorTaxa
+from stub_steam import ServidorStubSteam
+
+APPIDS = [989790, 1000001, 1000002]
+LANGUAGES = ['brazilian', 'english', 'spanish']
+REVIEWS_POR_FLUXO = 1000
+
+
+def executar(base_url, workers):
+    # Taxa alta: o gargalo deve ser a latência do stub, não o limitador
+    coletor = ColetorSteam(base_url=base_url, max_workers=workers,
+                           limitador=LimitadorTaxa(taxa=500, capacidade=50), espera_429=0.05)
+    try:
+        resultados = coletor.coletar(APPIDS, LANGUAGES)
+    finally:
+        coletor.fechar()
+    esperado = len(APPIDS) * len(LANGUAGES) * REVIEWS_POR_FLUXO
+    total = sum(len(r) for r in resultados.values())
+    assert total == esperado, f"esperadas {esperado} reviews, coletadas {total}"
+    return coletor.estatisticas.resumo()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 9
+    with ServidorStubSteam(reviews_por_fluxo=REVIEWS_POR_FLUXO, latencia=0.03, erro_429_a_cada=25) as stub:
+        serial = executar(stub.base_url, 1)
+        concorrente = executar(stub.base_url, workers)
+
+    print(f"\nSerial (1 worker):        {serial['reviews_por_segundo']} reviews/s "
+          f"({serial['duracao_s']}s, {serial['respostas_429']} respostas 429)")
+    print(f"Concorrente ({workers} workers): {concorrente['reviews_por_segundo']} reviews/s "
+          f"({concorrente['duracao_s']}s, {concorrente['respostas_429']} respostas 429)")
+    print(f"Ganho: {serial['duracao_s'] / concorrente['duracao_s']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark da detecção de quase duplicatas (duplicatas.py) em corpus sintéticos.
+
+Em cada bloco, uma fração das reviews é trocada por cópias de reviews
+anteriores com uma palavra editada (trocada ou removida). A conferência, em
+uma amostra, mede a cobertura dessas cópias e a similaridade de Jaccard exata
+(conjuntos de shingles em Python) de todos os pares marcados. Depois mede a
+inserção bloco a bloco no corpus inteiro: o tempo por bloco deve ficar
+estável à medida que o índice cresce (custo subquadrático), e o pico de
+memória do processo acompanha as assinaturas guardadas.
+
+Uso:
+    python benchmarks/bench_duplicatas.py [tamanho] [--copias FRACAO] [--limiar L]
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho
+from duplicatas import LIMIAR, TAMANHO_SHINGLE, DetectorDuplicatas
+from tokenizador import PADRAO_PALAVRA
+
+TAMANHO_BLOCO = 50_000
+# Só reviews longas são copiadas: uma edição em 30+ palavras mantém Jaccard > 0.8
+MIN_PALAVRAS_COPIA = 30
+
+
+def blocos_com_copias(gerador, tamanho, fracao, tamanho_bloco=TAMANHO_BLOCO, semente=0):
+    """Blocos sintéticos e, para cada cópia injetada, (posição da cópia, posição da original)"""
+    rng = np.random.default_rng(semente)
+    longas = []
+    for inicio in range(0, tamanho, tamanho_bloco):
+        bloco = gerador.gerar_bloco(min(tamanho_bloco, tamanho - inicio), inicio)
+        textos = bloco['Review'].tolist()
+        copias = []
+        if longas:
+            for i in rng.choice(len(textos), int(fracao * len(textos)), replace=False).tolist():
+                origem = longas[int(rng.integers(len(longas)))]
+                palavras = origem[1].split()
+                j = int(rng.integers(len(palavras)))
+                palavras[j:j + 1] = [] if rng.random() < 0.5 else ['editado']
+                textos[i] = ' '.join(palavras)
+                copias.append((inicio + i, origem[0]))
+        longas.extend((inicio + i, t) for i, t in enumerate(textos)
+                      if len(t.split()) >= MIN_PALAVRAS_COPIA and len(longas) < 100_000)
+        bloco['Review'] = textos
+        yield bloco, copias
+
+
+def shingles(texto):
+    palavras = PADRAO_PALAVRA.findall(texto.lower())
+    return {tuple(palavras[i:i + TAMANHO_SHINGLE]) for i in range(len(palavras) - TAMANHO_SHINGLE + 1)}
+
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def conferir(gerador, tamanho, fracao, limiar):
+    """
+    Cobertura das cópias injetadas cuja Jaccard exata com a original atinge o
+    limiar e Jaccard exata de todos os pares marcados
+    """
+    detector = DetectorDuplicatas(limiar)
+    textos, anteriores, copias = [], [], []
+    for bloco, injetadas in blocos_com_copias(gerador, tamanho, fracao, tamanho_bloco=2_000):
+        textos.extend(bloco['Review'].tolist())
+        anteriores.append(detector.adicionar(bloco['Review'].tolist()))
+        copias.extend(injetadas)
+    anteriores = np.concatenate(anteriores)
+    similares = [c for c, o in copias if jaccard(textos[c], textos[o]) >= limiar]
+    achadas = sum(anteriores[c] >= 0 for c in similares)
+    print(f"Conferência em {tamanho} reviews: {achadas}/{len(similares)} cópias injetadas com Jaccard ≥ {limiar} "
+          f"encontradas ({100 * achadas / max(len(similares), 1):.1f}%; {len(copias)} cópias no total)")
+    arestas = detector.arestas()
+    exatas = np.array([jaccard(textos[a], textos[b]) for a, b in arestas.tolist()])
+    print(f"{len(arestas)} pares marcados; Jaccard exata: mínima {exatas.min():.2f}, média {exatas.mean():.2f}, "
+          f"{100 * (exatas >= limiar - 0.1).mean():.1f}% ≥ {limiar - 0.1:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tamanho', nargs='?', default='200k')
+    parser.add_argument('--copias', type=float, default=0.02, metavar='FRACAO',
+                        help='Fração de cada bloco trocada por cópias editadas')
+    parser.add_argument('--limiar', type=float, default=LIMIAR)
+    args = parser.parse_args()
+    tamanho = interpretar_tamanho(args.tamanho)
+    gerador = GeradorCorpus()
+
+    conferir(gerador, min(tamanho, 20_000), args.copias, args.limiar)
+
+    detector = DetectorDuplicatas(args.limiar)
+    print(f"\nLSH: {detector.bandas} bandas × {detector.linhas} linhas ({detector.n_permutacoes} permutações)")
+    tempos, total_copias, achadas = [], 0, 0
+    for bloco, copias in blocos_com_copias(gerador, tamanho, args.copias):
+        inicio = time.perf_counter()
+        anteriores = detector.adicionar(bloco['Review'].tolist())
+        tempos.append(time.perf_counter() - inicio)
+        total_copias += len(copias)
+        achadas += sum(anteriores[c - detector.total + len(bloco)] >= 0 for c, _ in copias)
+    inicio = time.perf_counter()
+    resumo = detector.resumo()
+    t_grupos = time.perf_counter() - inicio
+
+    duracao = sum(tempos)
+    print(f"{detector.total} reviews em {duracao:.2f}s ({detector.total / duracao:,.0f} reviews/s); "
+          f"grupos: {t_grupos:.2f}s")
+    print(f"Tempo por bloco de {TAMANHO_BLOCO}: primeiro {tempos[0]:.2f}s, último {tempos[-1]:.2f}s")
+    print(f"{resumo['duplicadas']} quase duplicatas em {resumo['grupos']} grupos (maior: {resumo['maiorGrupo']}); "
+          f"cópias injetadas encontradas: {achadas}/{total_copias}")
+    print(f"Chaves de banda no índice: {len(detector.indice)} em {len(detector.indice.execucoes)} execuções")
+    # ru_maxrss em KiB no Linux
+    print(f"Pico de memória do processo: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
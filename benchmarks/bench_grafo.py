@@ -0,0 +1,132 @@
+"""
+Benchmark do grafo de termos (grafo_termos.py) em corpus sintéticos.
+
+Confere as co-ocorrências com uma contagem de referência em Python puro
+(Counter de pares) em uma amostra. Depois mede as duas passadas e a gravação
+em GEXF e GraphML: tempo, nós, arestas, tamanho dos arquivos e pico de
+memória do processo. O corpus real reamostrado tem só alguns milhares de
+palavras distintas. Para chegar a 10k+ nós e milhões de arestas, `--zipf`
+gera textos com palavras sorteadas por uma distribuição de Zipf sobre um
+vocabulário artificial.
+
+Uso:
+    python benchmarks/bench_grafo.py [tamanho] [--nos N] [--janela J] [--zipf PALAVRAS]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho
+from grafo_termos import GrafoTermos
+from tokenizador import STOPWORDS, STOPWORDS_POR_IDIOMA, tokenizar
+
+TAMANHO_BLOCO = 50_000
+LETRAS = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+
+
+def gerar_zipf(n, palavras, semente=0):
+    """Blocos de reviews com 20 a 120 palavras de um vocabulário artificial com frequências de Zipf"""
+    rng = np.random.default_rng(semente)
+    # Palavra k = k escrito em base 26 com letras, prefixada para ter 3+ letras
+    vocabulario = []
+    for k in range(palavras):
+        letras = []
+        while True:
+            k, resto = divmod(k, 26)
+            letras.append(LETRAS[resto])
+            if not k:
+                break
+        vocabulario.append('zz' + ''.join(letras))
+    vocabulario = np.array(vocabulario)
+    for inicio in range(0, n, TAMANHO_BLOCO):
+        tamanho = min(TAMANHO_BLOCO, n - inicio)
+        comprimentos = rng.integers(20, 121, tamanho)
+        ids = np.minimum(rng.zipf(1.1, comprimentos.sum()), palavras) - 1
+        partes = np.split(vocabulario[ids], np.cumsum(comprimentos)[:-1])
+        datas = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730, tamanho), unit='D')
+        yield pd.DataFrame({'Review': [' '.join(p) for p in partes], 'Data da Review': datas})
+
+
+def conferir(blocos, janela):
+    """
+    Compara as co-ocorrências do grafo com um Counter de pares montado review
+    a review, sem as stopwords do idioma de cada review (como o GrafoTermos)
+    """
+    grafo = GrafoTermos(max_nos=10**9, janela=janela, min_coocorrencia=1, pmi_minimo=None)
+    grafo.construir(lambda: iter(blocos))
+    referencia = Counter()
+    for bloco in blocos:
+        idiomas = bloco['Idioma'] if 'Idioma' in bloco.columns else [None] * len(bloco)
+        for texto, idioma in zip(bloco['Review'], idiomas):
+            stopwords = STOPWORDS_POR_IDIOMA.get(idioma, STOPWORDS)
+            palavras = tokenizar(texto, stopwords) if isinstance(texto, str) else []
+            for i, a in enumerate(palavras):
+                for b in palavras[i + 1:i + 1 + janela]:
+                    if a != b:
+                        referencia[tuple(sorted((a, b)))] += 1
+    palavras = grafo.vocabulario.palavras
+    obtido = {
+        tuple(sorted((palavras[grafo.nos[a]], palavras[grafo.nos[b]]))): c
+        for a, b, c in zip(grafo.origens.tolist(), grafo.destinos.tolist(), grafo.coocorrencias.tolist())
+    }
+    assert obtido == dict(referencia), "co-ocorrências diferentes da contagem de referência"
+    print(f"Conferido com a referência: {len(obtido)} pares em {sum(len(b) for b in blocos)} reviews")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tamanho', nargs='?', default='100k')
+    parser.add_argument('--nos', type=int, default=10_000)
+    parser.add_argument('--janela', type=int, default=5)
+    parser.add_argument('--zipf', type=int, metavar='PALAVRAS', help='Vocabulário artificial com PALAVRAS palavras')
+    args = parser.parse_args()
+    tamanho = interpretar_tamanho(args.tamanho)
+
+    if args.zipf:
+        fonte = lambda: gerar_zipf(tamanho, args.zipf)
+        amostra = [next(gerar_zipf(2_000, args.zipf))]
+    else:
+        gerador = GeradorCorpus()
+        fonte = lambda: (gerador.gerar_bloco(min(TAMANHO_BLOCO, tamanho - i), i)
+                         for i in range(0, tamanho, TAMANHO_BLOCO))
+        amostra = [gerador.gerar_bloco(2_000)]
+    conferir(amostra, args.janela)
+
+    grafo = GrafoTermos(max_nos=args.nos, janela=args.janela)
+    inicio = time.perf_counter()
+    grafo.contar_frequencias(fonte())
+    t_frequencias = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    grafo.contar_pares(fonte())
+    grafo._finalizar()
+    t_pares = time.perf_counter() - inicio
+    print(f"\n{grafo.reviews} reviews, {len(grafo.vocabulario)} palavras distintas")
+    print(f"Frequências: {t_frequencias:.2f}s; pares: {t_pares:.2f}s "
+          f"({grafo.reviews / (t_frequencias + t_pares):,.0f} reviews/s)")
+    print(f"{len(grafo.nos)} nós, {len(grafo.origens)} arestas com PMI > 0, "
+          f"{len(grafo.codigos_periodos)} períodos")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in ('gexf', 'graphml'):
+            caminho = os.path.join(pasta, f'grafo.{formato}')
+            inicio = time.perf_counter()
+            grafo.salvar(caminho)
+            duracao = time.perf_counter() - inicio
+            print(f"{formato:>7}: {duracao:.2f}s, {os.path.getsize(caminho) / 2**20:.0f} MiB")
+    # ru_maxrss em KiB no Linux
+    print(f"Pico de memória do processo: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
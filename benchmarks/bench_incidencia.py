@@ -0,0 +1,106 @@
+"""
+Benchmark: co-ocorrência por matriz de incidência (Xᵀ·X) vs. laços por review.
+
+Compara a contagem de pares do dashboard (processar_dados) e os nós/arestas do
+Gephi (exportar_gephi) calculados com MatrizIncidencia com os laços anteriores
+(pares aninhados / itertools.combinations) e verifica que os Counters, inclusive
+a ordem de inserção usada no desempate, são idênticos.
+
+Uso:
+    python benchmarks/bench_incidencia.py [fator_de_replicacao]
+"""
+import itertools
+import os
+import sys
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd
+
+import processar_dados as pdados
+from incidencia import MatrizIncidencia
+
+CSV_PADRAO = os.path.join(RAIZ, 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+
+# Mapa de conceitos do exportar_gephi
+KEYWORDS_GEPHI = {
+    'Acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'blind', 'cego', 'visual'],
+    'Audio_Espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'binaural', 'hearing', 'headphones'],
+    'Narrativa': ['story', 'narrative', 'história', 'plot', 'writing', 'voice acting'],
+    'Imersao': ['immersive', 'immersion', 'imersivo', 'atmosphere'],
+    'Combate': ['combat', 'fight', 'battle', 'combate', 'luta'],
+    'Exploracao': ['exploration', 'explore', 'exploração', 'world'],
+    'Jogabilidade': ['gameplay', 'mechanics', 'jogabilidade', 'play'],
+    'Acessivel': ['accessible', 'barrier-free', 'inclusive']
+}
+
+
+# --- Implementações anteriores (referência) ---
+
+def contar_coocorrencias_legado(acertos, keywords):
+    coocorrencias = Counter()
+    for acerto in acertos:
+        conceitos_presentes = sorted(c for c in keywords if c in acerto['coocorrencia'])
+        for i in range(len(conceitos_presentes)):
+            for j in range(i + 1, len(conceitos_presentes)):
+                coocorrencias[f"{conceitos_presentes[i]}|{conceitos_presentes[j]}"] += 1
+    return coocorrencias
+
+
+def grafo_gephi_legado(reviews, keywords_map):
+    all_terms_freq = Counter()
+    edges_counter = Counter()
+    for review in reviews:
+        present_concepts = {
+            concept for concept, terms in keywords_map.items()
+            if any(term in review for term in terms)
+        }
+        nodes_list = sorted(present_concepts)
+        for node in nodes_list:
+            all_terms_freq[node] += 1
+        for pair in itertools.combinations(nodes_list, 2):
+            edges_counter[tuple(sorted(pair))] += 1
+    return all_terms_freq, edges_counter
+
+
+def grafo_gephi_matriz(reviews, keywords_map):
+    incidencia = MatrizIncidencia.de_textos(reviews, keywords_map)
+    return incidencia.contar_nos(), incidencia.contar_pares()
+
+
+def cronometrar(func, *args):
+    inicio = time.perf_counter()
+    resultado = func(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def mesma_ordem(a, b):
+    return list(a.items()) == list(b.items())
+
+
+def main():
+    fator = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    base = pd.read_csv(CSV_PADRAO, usecols=['Review'])
+    df = pd.concat([base] * fator, ignore_index=True)
+    print(f"Corpus: {len(df)} reviews ({len(base)} x {fator})")
+
+    # Dashboard: o casamento de palavras-chave é comum às duas versões
+    acertos = pdados.casar_reviews(df)
+    legado, t_legado = cronometrar(contar_coocorrencias_legado, acertos, pdados.KEYWORDS_COOCORRENCIA)
+    novo, t_novo = cronometrar(pdados.contar_coocorrencias, acertos, pdados.KEYWORDS_COOCORRENCIA)
+    status = 'idêntico' if mesma_ordem(legado, novo) else 'DIFERENTE'
+    print(f"Dashboard - laços: {t_legado:.3f}s | Xᵀ·X: {t_novo:.3f}s ({t_legado / t_novo:.1f}x) - {status}")
+
+    # Gephi: inclui o casamento dos termos (substring por termo vs. autômato)
+    reviews = df['Review'].astype(str).str.lower().tolist()
+    (nos_l, arestas_l), t_legado = cronometrar(grafo_gephi_legado, reviews, KEYWORDS_GEPHI)
+    (nos_n, arestas_n), t_novo = cronometrar(grafo_gephi_matriz, reviews, KEYWORDS_GEPHI)
+    status = 'idêntico' if mesma_ordem(nos_l, nos_n) and mesma_ordem(arestas_l, arestas_n) else 'DIFERENTE'
+    print(f"Gephi     - laços: {t_legado:.3f}s | Xᵀ·X: {t_novo:.3f}s ({t_legado / t_novo:.1f}x) - {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark do tempo de inicialização dos subcomandos de cli.py.
+
+Cada comando roda em um processo novo (após uma execução de aquecimento, que
+compila os .pyc), e o tempo de parede é a mediana das repetições. Os comandos
+leves (`--help`, `resumo`, `relatorio`) devem ficar abaixo de --limite ms e
+não podem importar pandas, numpy, requests nem bs4. Uma execução extra com
+`python -X importtime` lista os pacotes pesados carregados por cada comando.
+Os `--help` dos scripts entram para comparação: eles importam o script
+inteiro.
+
+Uso:
+    python benchmarks/bench_inicializacao.py [--repeticoes N] [--limite MS]
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from instrumentacao import Execucao
+
+CLI = os.path.join(RAIZ, 'cli.py')
+PESADOS = ('pandas', 'numpy', 'scipy', 'pyarrow', 'requests', 'bs4')
+
+# (rótulo, argumentos do interpretador, comando leve?)
+COMANDOS = [
+    ('python -c pass', ['-c', 'pass'], False),
+    ('cli.py --help', [CLI, '--help'], True),
+    ('cli.py resumo', [CLI, 'resumo'], True),
+    ('cli.py relatorio', [CLI, 'relatorio'], True),
+    ('cli.py processar --help', [CLI, 'processar', '--help'], False),
+    ('cli.py consolidar --help', [CLI, 'consolidar', '--help'], False),
+    ('cli.py coletar --help', [CLI, 'coletar', '--help'], False),
+    ('cli.py gephi --help', [CLI, 'gephi', '--help'], False),
+]
+
+
+def preparar_diretorio(diretorio):
+    """dados_processados.json do repositório e um relatório de execução mínimo"""
+    shutil.copy(os.path.join(RAIZ, 'dados_processados.json'), diretorio)
+    with contextlib.redirect_stdout(io.StringIO()), \
+            Execucao('bench_inicializacao', os.path.join(diretorio, 'relatorio_execucao.json')):
+        pass
+
+
+def medir(argumentos, diretorio, repeticoes):
+    """Mediana, em ms, do tempo de parede de `python argumentos`"""
+    tempos = []
+    for i in range(repeticoes + 1):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=diretorio, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if i:
+            tempos.append(1000 * (time.perf_counter() - inicio))
+    return statistics.median(tempos)
+
+
+def pacotes_pesados(argumentos, diretorio):
+    """Pacotes de PESADOS importados pelo comando, com o tempo acumulado (ms) de cada um"""
+    processo = subprocess.run([sys.executable, '-X', 'importtime', *argumentos], cwd=diretorio, check=True,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    # Linhas "import time: próprio | acumulado | módulo"; o pacote raiz aparece com o nome sem pontos
+    carregados = {}
+    for linha in processo.stderr.splitlines():
+        partes = linha.split('|')
+        if len(partes) == 3 and partes[2].strip() in PESADOS:
+            carregados[partes[2].strip()] = int(partes[1]) / 1000
+    return carregados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=10)
+    parser.add_argument('--limite', type=float, default=100.0, metavar='MS',
+                        help='Tempo máximo dos comandos leves, em ms')
+    args = parser.parse_args()
+
+    falhas = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar_diretorio(diretorio)
+        print(f"{'comando':<28} {'mediana':>9}  pacotes pesados importados")
+        for rotulo, argumentos, leve in COMANDOS:
+            mediana = medir(argumentos, diretorio, args.repeticoes)
+            pesados = pacotes_pesados(argumentos, diretorio)
+            descricao = ', '.join(f"{nome} ({ms:.0f}ms)" for nome, ms in pesados.items()) or '-'
+            situacao = ''
+            if leve:
+                situacao = '  OK' if mediana <= args.limite and not pesados else '  FALHOU'
+                if situacao != '  OK':
+                    falhas.append(rotulo)
+            print(f"{rotulo:<28} {mediana:>7.0f}ms  {descricao}{situacao}")
+
+    leves = sum(leve for _, _, leve in COMANDOS)
+    print(f"\nComandos leves: {leves - len(falhas)} de {leves} abaixo de {args.limite:.0f}ms sem pacotes pesados")
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
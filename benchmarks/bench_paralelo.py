@@ -0,0 +1,55 @@
+"""
+Benchmark: análise serial vs. multiprocesso (gerar_json_dados_paralelo).
+
+Replica o CSV incluído no repositório, executa a análise serial e a paralela
+com 1..N processos, verifica que o resultado é idêntico e mede o ganho.
+
+Uso:
+    python benchmarks/bench_paralelo.py [fator_de_replicacao] [max_workers]
+"""
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd
+
+import processar_dados as pdados
+
+CSV_PADRAO = os.path.join(RAIZ, 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+
+
+def main():
+    fator = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    base = pd.read_csv(CSV_PADRAO)
+    df = pd.concat([base] * fator, ignore_index=True)
+    tamanho_bloco = max(1, len(df) // (4 * max_workers))
+    print(f"Corpus: {len(df)} reviews ({len(base)} x {fator}), blocos de {tamanho_bloco}")
+
+    # Saída redirecionada para não sobrescrever o dados_processados.json real
+    pdados_salvar = pdados.salvar_json_dados
+    pdados.salvar_json_dados = lambda dados, caminho=None: None
+    try:
+        inicio = time.perf_counter()
+        serial = pdados.gerar_json_dados(df)
+        t_serial = time.perf_counter() - inicio
+        print(f"Serial:       {t_serial:.2f}s")
+
+        workers = 1
+        while workers <= max_workers:
+            inicio = time.perf_counter()
+            paralelo = pdados.gerar_json_dados_paralelo(pdados.dividir_em_blocos(df, tamanho_bloco), workers)
+            t_paralelo = time.perf_counter() - inicio
+            status = 'idêntico' if paralelo == serial else 'DIFERENTE'
+            print(f"{workers} processo(s): {t_paralelo:.2f}s ({t_serial / t_paralelo:.1f}x) - {status}")
+            workers *= 2
+    finally:
+        pdados.salvar_json_dados = pdados_salvar
+
+
+if __name__ == '__main__':
+    main()
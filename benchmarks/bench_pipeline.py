@@ -0,0 +1,244 @@
+"""
+Benchmark de todas as etapas da pipeline sobre corpus sintéticos de tamanho crescente.
+
+Para cada tamanho (ex.: 10k, 100k, 1M, 10M) gera um corpus com o esquema e a
+mistura de idiomas do CSV incluído (ver corpus_sintetico.py) e mede, etapa por
+etapa, tempo de parede, tempo de CPU e pico de memória (RSS):
+
+    geracao, coleta (paginação contra o stub local da API), process_reviews,
+    salvar_reviews, carregar_dados, cada análise de gerar_json_dados,
+    gerar_json_dados completo, exportar_para_gephi e consolidar_dados.
+
+A coleta e o process_reviews usam no máximo --limite-coleta reviews (a
+paginação HTTP e o JSON bruto não escalam até milhões de linhas em memória).
+Os resultados são gravados em JSON, com o commit e a máquina, e podem ser
+comparados com uma execução anterior via --comparar.
+
+Uso:
+    python benchmarks/bench_pipeline.py --tamanhos 10k,100k --saida resultados.json
+    python benchmarks/bench_pipeline.py --tamanhos 10k --comparar resultados_anteriores.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import processar_dados as pdados
+from armazenamento import salvar_reviews
+from coletor_steam import ColetorSteam, LimitadorTaxa
+from exportar_gephi import exportar_para_gephi
+from getAvaliacoes_refactored import process_reviews
+
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho, reviews_brutas
+from stub_steam import ServidorStubSteam
+
+APPID = 989790
+
+
+class AmostradorMemoria:
+    """
+    Pico de RSS do processo durante um bloco, amostrado em uma thread.
+    Usa /proc/self/statm (Linux); sem ele, recorre ao ru_maxrss (pico desde o
+    início do processo).
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pico = 0
+        self._parar = threading.Event()
+        self._pagina = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self._proc = os.path.exists('/proc/self/statm')
+
+    def rss(self):
+        if self._proc:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * self._pagina
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maximo if sys.platform == 'darwin' else maximo * 1024
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, self.rss())
+
+    def __enter__(self):
+        self.inicial = self.pico = self.rss()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+        self.pico = max(self.pico, self.rss())
+
+
+class Medidor:
+    """Executa as etapas e acumula os registros de tempo/memória"""
+
+    def __init__(self, verboso=False):
+        self.resultados = []
+        self.verboso = verboso
+
+    def medir(self, tamanho, etapa, func, *args, linhas=None, **kwargs):
+        saida = io.StringIO()
+        erro = None
+        resultado = None
+        with AmostradorMemoria() as memoria:
+            inicio, inicio_cpu = time.perf_counter(), time.process_time()
+            try:
+                with contextlib.redirect_stdout(sys.stdout if self.verboso else saida):
+                    resultado = func(*args, **kwargs)
+            except ImportError as e:
+                erro = f"{type(e).__name__}: {e}"
+            duracao, cpu = time.perf_counter() - inicio, time.process_time() - inicio_cpu
+
+        registro = {
+            'tamanho': tamanho,
+            'etapa': etapa,
+            'linhas': linhas if linhas is not None else tamanho,
+            'segundos': round(duracao, 4),
+            'cpu_segundos': round(cpu, 4),
+            'pico_rss_mb': round(memoria.pico / 2**20, 1),
+            'delta_rss_mb': round((memoria.pico - memoria.inicial) / 2**20, 1),
+        }
+        if erro:
+            registro['erro'] = erro
+        self.resultados.append(registro)
+
+        if erro:
+            print(f"  {etapa:<28} indisponível ({erro})")
+        else:
+            taxa = registro['linhas'] / duracao if duracao > 0 else float('inf')
+            print(f"  {etapa:<28} {duracao:8.3f}s  cpu {cpu:8.3f}s  "
+                  f"+{registro['delta_rss_mb']:7.1f} MiB  ({taxa:,.0f} linhas/s)")
+        return resultado
+
+
+def coletar_do_stub(n):
+    """Pagina `n` reviews de um fluxo no stub local, sem latência nem limite de taxa"""
+    with ServidorStubSteam(reviews_por_fluxo=n, latencia=0) as stub:
+        coletor = ColetorSteam(stub.base_url, max_workers=1, limitador=LimitadorTaxa(taxa=1e9, capacidade=10**9))
+        try:
+            return coletor.coletar([APPID], ['english'])
+        finally:
+            coletor.fechar()
+
+
+def consolidar():
+    # Importado aqui: coletar_multiplataforma depende de bibliotecas opcionais
+    from coletar_multiplataforma import consolidar_dados
+    return consolidar_dados()
+
+
+def executar_tamanho(medidor, gerador, n, limite_coleta):
+    print(f"\n=== {n:,} reviews ===")
+    df = medidor.medir(n, 'geracao', gerador.gerar_df, n)
+
+    n_coleta = min(n, limite_coleta)
+    medidor.medir(n, 'coleta_paginacao', coletar_do_stub, n_coleta, linhas=n_coleta)
+    brutas = reviews_brutas(df.head(n_coleta))
+    medidor.medir(n, 'process_reviews', process_reviews, brutas, linhas=n_coleta)
+    del brutas
+
+    medidor.medir(n, 'salvar_reviews', salvar_reviews, df, APPID)
+    df.drop(columns=['ID da Review']).to_csv('reviews.csv', index=False)
+    df = medidor.medir(n, 'carregar_dados', pdados.carregar_dados)
+
+    medidor.medir(n, 'calcular_estatisticas', pdados.calcular_estatisticas, df)
+    medidor.medir(n, 'analisar_tempo_jogado', pdados.analisar_tempo_jogado, df)
+    acertos = medidor.medir(n, 'casar_reviews', pdados.casar_reviews, df)
+    medidor.medir(n, 'extrair_conceitos', pdados.extrair_conceitos, df, acertos)
+    medidor.medir(n, 'analisar_opiniao_aspectos', pdados.analisar_opiniao_aspectos, df, acertos)
+    medidor.medir(n, 'analisar_coocorrencia', pdados.analisar_coocorrencia, df, acertos=acertos)
+    textos = df['Review'].astype(str).tolist()
+    medidor.medir(n, 'gerar_ngrams_bigramas', pdados.gerar_ngrams, textos, 2, 15)
+    medidor.medir(n, 'gerar_ngrams_trigramas', pdados.gerar_ngrams, textos, 3, 10)
+    del acertos, textos
+
+    medidor.medir(n, 'gerar_json_dados', pdados.gerar_json_dados, df)
+    del df
+    medidor.medir(n, 'exportar_para_gephi', exportar_para_gephi, 'reviews.csv')
+    medidor.medir(n, 'consolidar_dados', consolidar)
+
+
+def commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual, caminho_anterior):
+    """Razão de tempo atual/anterior por (tamanho, etapa)"""
+    with open(caminho_anterior, encoding='utf-8') as f:
+        anterior = json.load(f)
+    tempos = {(r['tamanho'], r['etapa']): r['segundos'] for r in anterior['resultados'] if 'erro' not in r}
+
+    print(f"\n=== Comparação com {anterior.get('commit') or caminho_anterior} ===")
+    for r in atual['resultados']:
+        base = tempos.get((r['tamanho'], r['etapa']))
+        if base and 'erro' not in r:
+            razao = r['segundos'] / base
+            marca = '  << mais lento' if razao > 1.2 else ''
+            print(f"  {r['tamanho']:>10,} {r['etapa']:<28} {base:8.3f}s -> {r['segundos']:8.3f}s ({razao:.2f}x){marca}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das etapas da pipeline com corpus sintético')
+    parser.add_argument('--tamanhos', default='10k,100k', help='Tamanhos do corpus (ex.: 10k,100k,1M,10M)')
+    parser.add_argument('--limite-coleta', type=interpretar_tamanho, default=interpretar_tamanho('100k'),
+                        help='Máximo de reviews usadas na coleta e no process_reviews')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', default='bench_pipeline.json', help='Arquivo JSON com os resultados')
+    parser.add_argument('--comparar', metavar='JSON', help='Resultados anteriores para comparação')
+    parser.add_argument('--verboso', action='store_true', help='Mostra a saída das etapas')
+    args = parser.parse_args()
+
+    tamanhos = [interpretar_tamanho(t) for t in args.tamanhos.split(',')]
+    gerador = GeradorCorpus(semente=args.semente)
+    medidor = Medidor(args.verboso)
+    saida = os.path.abspath(args.saida)
+
+    # As etapas leem e gravam arquivos no diretório atual
+    diretorio_original = os.getcwd()
+    for n in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            os.chdir(pasta)
+            try:
+                executar_tamanho(medidor, gerador, n, args.limite_coleta)
+            finally:
+                os.chdir(diretorio_original)
+
+    relatorio = {
+        'commit': commit_atual(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'semente': args.semente,
+        'resultados': medidor.resultados,
+    }
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em '{saida}'")
+
+    if args.comparar:
+        comparar(relatorio, args.comparar)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark do motor de sentimento (sentimento.py) em corpus sintéticos.
+
+Mede a vazão (reviews/s) do MotorSentimento em lote, em um pool de processos
+e com o cache por hash (cheio, reexecução), conferindo que os resultados são
+iguais nos três modos, e a concordância do sentimento com a recomendação.
+
+Uso:
+    python benchmarks/bench_sentimento.py [tamanho] [workers]   (ex.: 100k, 1M)
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho
+from processar_dados import ASPECTOS
+from sentimento import LIMIAR, MotorSentimento, analisar_em_processos
+
+TAMANHO_BLOCO = 50_000
+
+
+def main():
+    tamanho = interpretar_tamanho(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    print(f"Gerando {tamanho} reviews sintéticas...")
+    blocos = list(GeradorCorpus().gerar(tamanho, TAMANHO_BLOCO))
+    textos = [t for bloco in blocos for t in bloco['Review'].tolist()]
+    recomendados = np.concatenate([bloco['Recomendado'].to_numpy(dtype=bool) for bloco in blocos])
+    caracteres = sum(len(t) for t in textos)
+    print(f"{len(textos)} reviews, {caracteres / 2**20:.0f} MiB de texto")
+
+    motor = MotorSentimento(ASPECTOS)
+    inicio = time.perf_counter()
+    serial = []
+    for i in range(0, len(textos), TAMANHO_BLOCO):
+        serial.extend(motor.analisar_lote(textos[i:i + TAMANHO_BLOCO]))
+    t_serial = time.perf_counter() - inicio
+    print(f"Serial:           {t_serial:.2f}s ({len(textos) / t_serial:,.0f} reviews/s)")
+
+    inicio = time.perf_counter()
+    paralelo = list(analisar_em_processos(textos, ASPECTOS, workers, TAMANHO_BLOCO))
+    t_paralelo = time.perf_counter() - inicio
+    assert paralelo == serial, "o pool deve devolver os mesmos resultados"
+    print(f"{workers} processos:      {t_paralelo:.2f}s ({len(textos) / t_paralelo:,.0f} reviews/s)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        cache = motor.abrir_cache(os.path.join(pasta, 'cache.sqlite'))
+        for rotulo in ('Cache vazio', 'Cache cheio'):
+            inicio = time.perf_counter()
+            com_cache = []
+            for i in range(0, len(textos), TAMANHO_BLOCO):
+                com_cache.extend(motor.analisar(textos[i:i + TAMANHO_BLOCO], cache))
+            t_cache = time.perf_counter() - inicio
+            assert com_cache == serial, "o cache deve devolver os mesmos resultados"
+            print(f"{rotulo + ':':<17} {t_cache:.2f}s ({len(textos) / t_cache:,.0f} reviews/s)")
+        cache.fechar()
+
+    polaridades = np.array([r['polaridade'] for r in serial])
+    polares = np.abs(polaridades) >= LIMIAR
+    concordancia = ((polaridades > 0) == recomendados)[polares].mean()
+    print(f"Concordância com a recomendação: {concordancia:.1%} ({polares.mean():.1%} das reviews não neutras)")
+
+
+if __name__ == '__main__':
+    main()
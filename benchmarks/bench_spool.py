@@ -0,0 +1,78 @@
+"""
+Benchmark do spool de respostas brutas da Steam.
+
+Coleta do stub local com e sem spool (custo de gravar as páginas), reproduz o
+dataset a partir do spool sem rede e compara a decodificação das páginas com
+json e orjson (quando instalado).
+
+Uso:
+    python benchmarks/bench_spool.py [reviews_por_fluxo]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import spool_steam
+from coletor_steam import ColetorSteam, LimitadorTaxa
+from spool_steam import ReprodutorSpool, SpoolRespostas
+from stub_steam import ServidorStubSteam
+
+APPIDS = [989790, 1000001]
+LANGUAGES = ['brazilian', 'english', 'spanish']
+
+
+def coletar(base_url, spool=None):
+    coletor = ColetorSteam(base_url, max_workers=len(APPIDS) * len(LANGUAGES),
+                           limitador=LimitadorTaxa(taxa=1e9, capacidade=10**9), spool=spool)
+    inicio = time.perf_counter()
+    try:
+        resultados = coletor.coletar(APPIDS, LANGUAGES)
+    finally:
+        coletor.fechar()
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    reviews_por_fluxo = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as pasta:
+        spool = SpoolRespostas(os.path.join(pasta, 'spool'))
+        with ServidorStubSteam(reviews_por_fluxo=reviews_por_fluxo, latencia=0) as stub:
+            sem_spool, t_sem = coletar(stub.base_url)
+            com_spool, t_com = coletar(stub.base_url, spool)
+
+        inicio = time.perf_counter()
+        reproduzidas = ReprodutorSpool(spool).coletar(APPIDS, LANGUAGES)
+        t_reproducao = time.perf_counter() - inicio
+        assert reproduzidas == com_spool == sem_spool, "a reprodução deve devolver as mesmas reviews"
+
+        tamanho = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(spool.diretorio) for f in fs)
+        linhas = [linha for appid in APPIDS for language in LANGUAGES
+                  for linha in spool_steam._abrir(spool.caminho(appid, language), 'rb')]
+
+    total = sum(len(r) for r in com_spool.values())
+    print(f"\n{total} reviews, {len(linhas)} páginas, spool com {tamanho / 2**20:.2f} MiB")
+    print(f"Coleta sem spool:  {t_sem:.3f}s")
+    print(f"Coleta com spool:  {t_com:.3f}s ({(t_com / t_sem - 1):+.0%})")
+    print(f"Reprodução:        {t_reproducao:.3f}s ({total / t_reproducao:,.0f} reviews/s, sem rede)")
+
+    inicio = time.perf_counter()
+    for linha in linhas:
+        json.loads(linha)
+    t_json = time.perf_counter() - inicio
+    print(f"Decodificação json:   {t_json:.3f}s")
+    if spool_steam.orjson is not None:
+        inicio = time.perf_counter()
+        for linha in linhas:
+            spool_steam.orjson.loads(linha)
+        t_orjson = time.perf_counter() - inicio
+        print(f"Decodificação orjson: {t_orjson:.3f}s ({t_json / t_orjson:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
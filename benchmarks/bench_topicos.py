@@ -0,0 +1,60 @@
+"""
+Benchmark da descoberta de tópicos (topicos.py) em corpus sintéticos.
+
+Mede o ajuste (k-means esférico em mini-lotes sobre TF-IDF com hashing) e a
+atribuição das reviews, em reviews/s, e o pico de memória do processo, que
+deve depender do tamanho do bloco e não do corpus. Mostra os tópicos
+encontrados.
+
+Uso:
+    python benchmarks/bench_topicos.py [tamanho] [k] [epocas]   (ex.: 1M 8; sem épocas, o ajuste decide)
+"""
+import os
+import resource
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus_sintetico import GeradorCorpus, interpretar_tamanho
+from topicos import ModeloTopicos
+
+TAMANHO_BLOCO = 50_000
+
+
+def main():
+    tamanho = interpretar_tamanho(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    epocas = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    gerador = GeradorCorpus()
+    fonte = lambda: (gerador.gerar_bloco(min(TAMANHO_BLOCO, tamanho - i), i)
+                     for i in range(0, tamanho, TAMANHO_BLOCO))
+    # Tempo de gerar o corpus, descontado das etapas
+    inicio = time.perf_counter()
+    for _ in fonte():
+        pass
+    t_geracao = time.perf_counter() - inicio
+
+    modelo = ModeloTopicos(k, epocas=epocas)
+    inicio = time.perf_counter()
+    modelo.ajustar(fonte)
+    epocas = modelo.epocas_ajustadas
+    t_ajuste = time.perf_counter() - inicio - epocas * t_geracao
+    inicio = time.perf_counter()
+    modelo.contar(fonte())
+    t_contagem = time.perf_counter() - inicio - t_geracao
+
+    print(f"{tamanho} reviews, k={k}, {epocas} época(s)")
+    print(f"Ajuste:     {t_ajuste:.2f}s ({tamanho * epocas / t_ajuste:,.0f} reviews/s)")
+    print(f"Atribuição: {t_contagem:.2f}s ({tamanho / t_contagem:,.0f} reviews/s)")
+    # ru_maxrss em KiB no Linux
+    print(f"Pico de memória do processo: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB\n")
+    for topico in modelo.topicos():
+        print(f"{topico['reviews']:>8} reviews, {topico['recomendadas']:>5}% recomendadas: {', '.join(topico['termos'])}")
+
+
+if __name__ == '__main__':
+    main()
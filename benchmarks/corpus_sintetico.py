@@ -0,0 +1,122 @@
+"""
+Gerador de corpus sintético de reviews no esquema do CSV incluído no repositório.
+
+Os metadados de cada review (idioma, horas jogadas, recomendação, votos) são
+reamostrados das linhas reais, o que preserva a mistura de idiomas e as
+correlações entre colunas. O texto junta de 1 a 4 frases reais do mesmo
+idioma, de modo que as palavras-chave e n-grams aparecem com frequência
+realista e praticamente toda review gerada é distinta.
+
+Uso direto (grava um CSV):
+    python benchmarks/corpus_sintetico.py <linhas> <saida.csv> [semente]
+"""
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PADRAO = os.path.join(RAIZ, 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+
+MAX_FRASES = 4
+_SEPARADOR_FRASES = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def interpretar_tamanho(texto):
+    """'10k' -> 10_000, '1M' -> 1_000_000, '2500' -> 2500"""
+    texto = texto.strip().lower()
+    multiplicador = {'k': 1_000, 'm': 1_000_000}.get(texto[-1], 1)
+    numero = texto[:-1] if multiplicador > 1 else texto
+    return int(float(numero) * multiplicador)
+
+
+class GeradorCorpus:
+    """Gera DataFrames sintéticos com as colunas do CSV de reviews (+ 'ID da Review')"""
+
+    def __init__(self, caminho_csv=CSV_PADRAO, semente=0):
+        base = pd.read_csv(caminho_csv).dropna(subset=['Review']).reset_index(drop=True)
+        self.base = base
+        self.semente = semente
+
+        self.frases = {}
+        for idioma, textos in base.groupby('Idioma')['Review']:
+            frases = [f.strip() for t in textos for f in _SEPARADOR_FRASES.split(t) if f.strip()]
+            self.frases[idioma] = np.array(frases, dtype=object)
+
+        datas = pd.to_datetime(base['Data da Review'])
+        self._data_min = int(datas.min().timestamp())
+        self._data_max = int(datas.max().timestamp())
+
+    def gerar_bloco(self, n, inicio=0):
+        """Bloco de `n` reviews; `inicio` numera os IDs e deriva a semente do bloco"""
+        rng = np.random.default_rng([self.semente, inicio])
+        linhas = rng.integers(0, len(self.base), size=n)
+        meta = self.base.iloc[linhas]
+
+        textos = np.empty(n, dtype=object)
+        idiomas = meta['Idioma'].to_numpy()
+        for idioma, frases in self.frases.items():
+            posicoes = np.flatnonzero(idiomas == idioma)
+            if len(posicoes) == 0:
+                continue
+            escolhidas = frases[rng.integers(0, len(frases), size=(len(posicoes), MAX_FRASES))].tolist()
+            quantidades = rng.integers(1, MAX_FRASES + 1, size=len(posicoes)).tolist()
+            textos[posicoes] = [' '.join(f[:k]) for f, k in zip(escolhidas, quantidades)]
+
+        timestamps = rng.integers(self._data_min, self._data_max + 1, size=n)
+        return pd.DataFrame({
+            'ID da Review': np.arange(inicio, inicio + n).astype(str),
+            'Horas Jogadas': meta['Horas Jogadas'].to_numpy(),
+            'Idioma': idiomas,
+            'Review': textos,
+            'Recomendado': meta['Recomendado'].to_numpy(),
+            'Votos Úteis': meta['Votos Úteis'].to_numpy(),
+            'Data da Review': pd.to_datetime(timestamps, unit='s'),
+        })
+
+    def gerar(self, n, tamanho_bloco=1_000_000):
+        """Gera `n` reviews em blocos de até `tamanho_bloco` linhas"""
+        for inicio in range(0, n, tamanho_bloco):
+            yield self.gerar_bloco(min(tamanho_bloco, n - inicio), inicio)
+
+    def gerar_df(self, n):
+        return pd.concat(self.gerar(n), ignore_index=True)
+
+    def escrever_csv(self, n, caminho, tamanho_bloco=1_000_000):
+        """Grava `n` reviews em CSV sem manter o corpus inteiro em memória"""
+        for i, bloco in enumerate(self.gerar(n, tamanho_bloco)):
+            bloco.to_csv(caminho, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+
+def reviews_brutas(df, appid=989790):
+    """Converte um DataFrame sintético para o JSON bruto da API da Steam"""
+    timestamps = (df['Data da Review'].astype('int64') // 10**9).tolist()
+    return [
+        {
+            'recommendationid': rid,
+            'author': {'steamid': str(76561197960265728 + i), 'playtime_forever': horas,
+                       'playtime_at_review': horas},
+            'language': idioma,
+            'review': texto,
+            'timestamp_created': ts,
+            'voted_up': recomendado,
+            'votes_up': votos,
+            'weighted_vote_score': '0.5',
+        }
+        for i, (rid, horas, idioma, texto, recomendado, votos, ts) in enumerate(zip(
+            df['ID da Review'].tolist(), df['Horas Jogadas'].tolist(), df['Idioma'].tolist(),
+            df['Review'].tolist(), df['Recomendado'].tolist(), df['Votos Úteis'].tolist(), timestamps
+        ))
+    ]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Uso: python benchmarks/corpus_sintetico.py <linhas> <saida.csv> [semente]")
+        sys.exit(1)
+    linhas = interpretar_tamanho(sys.argv[1])
+    semente = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    GeradorCorpus(semente=semente).escrever_csv(linhas, sys.argv[2])
+    print(f"✓ {linhas} reviews sintéticas gravadas em '{sys.argv[2]}'")
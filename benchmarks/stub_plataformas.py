@@ -0,0 +1,213 @@
+"""
+Servidor HTTP local de fixtures das plataformas (Metacritic, lojas e Epic).
+
+Cada plataforma tem uma página fixa com a nota em JSON-LD (schema.org
+AggregateRating); a do Epic é um JSON com `aggregateRating` e a da Nintendo
+não traz `bestRating` (nota de 0 a 5). O `modo` do servidor, que pode mudar
+com ele no ar, escolhe a resposta de GET /<plataforma>:
+
+    ok      200 com ETag; 304 se o If-None-Match for o mesmo
+    erro    500
+    lento   200 depois de `atraso` segundos (timeout do coletor)
+
+As URLs não mudam com o modo, então os snapshots de cache_plataformas/
+continuam valendo. Com --verificar, os cenários (200, 304, 500, timeout e
+servidor fora do ar) rodam contra coletar_fontes e o status e os valores de
+cada plataforma são conferidos.
+
+Uso direto:
+    python benchmarks/stub_plataformas.py [porta] [--modo ok|erro|lento]
+    python benchmarks/stub_plataformas.py --verificar
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def _pagina(avaliacao):
+    """Página HTML de loja com o AggregateRating em um bloco JSON-LD aninhado"""
+    produto = {'@context': 'https://schema.org', '@type': 'VideoGame',
+               'name': 'The Vale: Shadow of the Crown', 'aggregateRating': {'@type': 'AggregateRating', **avaliacao}}
+    return ('<html><head><script type="application/ld+json">'
+            f'{json.dumps({"@graph": [produto]})}</script></head><body></body></html>').encode('utf-8')
+
+
+FIXTURES = {
+    'metacritic': _pagina({'ratingValue': 81, 'bestRating': 100, 'reviewCount': 12}),
+    'xbox': _pagina({'ratingValue': 4.6, 'bestRating': 5, 'ratingCount': 140}),
+    'playstation': _pagina({'ratingValue': 9.0, 'bestRating': 10, 'ratingCount': 52}),
+    'nintendo': _pagina({'ratingValue': 4.4, 'ratingCount': 20}),
+    'epic': json.dumps({'aggregateRating': {'ratingValue': 4.8, 'bestRating': 5, 'ratingCount': 33}}).encode('utf-8'),
+}
+
+# Nota e total esperados em cada plataforma após um 200 (campos do consolidado)
+ESPERADOS = {
+    'metacritic': {'metascore.pc': 81, 'total_critic_reviews': 12},
+    'xbox': {'rating': 4.6, 'total_ratings': 140},
+    'playstation': {'rating': 4.5, 'total_ratings': 52},
+    'nintendo': {'rating': 4.4, 'total_ratings': 20},
+    'epic': {'rating': 4.8, 'total_ratings': 33},
+}
+
+MODOS = ('ok', 'erro', 'lento')
+
+
+class ServidorStubPlataformas:
+    """
+    Fixtures das plataformas em 127.0.0.1 (porta 0 = livre).
+    Uso: `with ServidorStubPlataformas() as stub: stub.urls()`.
+    """
+
+    def __init__(self, porta=0, modo='ok', atraso=2.0):
+        self.modo = modo
+        self.atraso = atraso
+        self.requisicoes = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._responder(self)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, porta = self.httpd.server_address
+        return f"http://{host}:{porta}"
+
+    def urls(self):
+        """{plataforma: URL}, no formato de `--url` do consolidado"""
+        return {nome: f"{self.base_url}/{nome}" for nome in FIXTURES}
+
+    def _responder(self, handler):
+        with self._lock:
+            self.requisicoes += 1
+
+        nome, modo = handler.path.strip('/'), self.modo
+        if nome not in FIXTURES:
+            self._enviar(handler, 404, b'')
+            return
+        if modo == 'erro':
+            self._enviar(handler, 500, b'erro interno')
+            return
+        if modo == 'lento':
+            time.sleep(self.atraso)
+
+        corpo = FIXTURES[nome]
+        etag = '"' + hashlib.sha256(corpo).hexdigest()[:16] + '"'
+        if handler.headers.get('If-None-Match') == etag:
+            self._enviar(handler, 304, b'', {'ETag': etag})
+            return
+        tipo = 'application/json' if corpo.startswith(b'{') else 'text/html; charset=utf-8'
+        self._enviar(handler, 200, corpo, {'ETag': etag, 'Content-Type': tipo})
+
+    def _enviar(self, handler, status, corpo, cabecalhos=None):
+        handler.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            handler.send_header(nome, valor)
+        if status != 304:
+            handler.send_header('Content-Length', str(len(corpo)))
+        handler.end_headers()
+        if status != 304:
+            handler.wfile.write(corpo)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _campo(dados, chave):
+    for parte in chave.split('.'):
+        dados = dados[parte]
+    return dados
+
+
+def verificar(timeout=0.5):
+    """Roda os cenários contra coletar_fontes; devolve o número de cenários que falharam"""
+    from coletar_multiplataforma import HEADERS, fontes_plataformas
+    from fontes_plataformas import coletar_fontes
+
+    # (cenário, modo do servidor ou None para fora do ar, status esperado, confere os valores?)
+    cenarios = [
+        ('500 sem snapshot', 'erro', 'padrao', False),
+        ('200', 'ok', 'atualizado', True),
+        ('304', 'ok', 'nao_modificado', True),
+        ('500', 'erro', 'cache', True),
+        ('timeout', 'lento', 'cache', True),
+        ('servidor fora do ar', None, 'cache', True),
+    ]
+    falhas = 0
+    stub = ServidorStubPlataformas(atraso=timeout * 4).__enter__()
+    urls = stub.urls()
+    with tempfile.TemporaryDirectory() as diretorio:
+        print(f"{'cenário':<20} {'tempo':>7}  status")
+        for rotulo, modo, esperado, conferir in cenarios:
+            if modo is None:
+                stub.__exit__()
+            else:
+                stub.modo = modo
+            # O primeiro cenário roda sem snapshots; os seguintes reaproveitam os do 200
+            pasta = os.path.join(diretorio, 'vazio') if esperado == 'padrao' else diretorio
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultados = coletar_fontes(fontes_plataformas(urls, timeout), HEADERS, pasta)
+            duracao = time.perf_counter() - inicio
+
+            erros = []
+            for nome, resultado in resultados.items():
+                if resultado['status'] != esperado:
+                    erros.append(f"{nome}: {resultado['status']} ({resultado['erro']})")
+                    continue
+                for chave, valor in ESPERADOS[nome].items() if conferir else ():
+                    obtido = _campo(resultado['dados'], chave)
+                    if obtido != valor:
+                        erros.append(f"{nome}: {chave}={obtido} (esperado {valor})")
+            falhas += bool(erros)
+            print(f"{rotulo:<20} {duracao:>6.2f}s  {esperado}: {'FALHOU' if erros else 'OK'}")
+            for erro in erros:
+                print(f"    - {erro}")
+    return falhas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('porta', type=int, nargs='?', default=8766)
+    parser.add_argument('--modo', choices=MODOS, default='ok', help='Resposta do servidor (padrão: ok)')
+    parser.add_argument('--verificar', action='store_true',
+                        help='Roda os cenários contra coletar_fontes em vez de só servir as fixtures')
+    args = parser.parse_args()
+
+    if args.verificar:
+        sys.exit(1 if verificar() else 0)
+    with ServidorStubPlataformas(porta=args.porta, modo=args.modo) as stub:
+        print(f"Fixtures das plataformas em {stub.base_url}/<plataforma>, modo {args.modo} (Ctrl+C para sair)")
+        print('Ex.: python coletar_multiplataforma.py --online ' +
+              ' '.join(f'--url {nome}={url}' for nome, url in stub.urls().items()))
+        try:
+            stub.thread.join()
+        except KeyboardInterrupt:
+            pass
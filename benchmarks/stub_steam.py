@@ -0,0 +1,153 @@
+"""
+Servidor HTTP local que emula a API /appreviews/{appid} da Steam.
+
+Suporta paginação por cursor, filtro por idioma, filter=recent (mais novas
+primeiro), latência artificial e respostas 429 injetadas a cada N
+requisições. Usado pelos benchmarks e para testar o coletor sem acessar a rede.
+
+Uso direto:
+    python benchmarks/stub_steam.py [porta]
+"""
+import json
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+TEXTOS = [
+    "Amazing audio design and a compelling story, truly immersive.",
+    "The combat system using only sound is revolutionary.",
+    "Jogo incrível, a história é envolvente e a acessibilidade é exemplar.",
+    "Muy buen juego, el sonido es espectacular pero es corto.",
+    "Great concept but the gameplay becomes repetitive after a few hours.",
+]
+
+
+def gerar_review(appid, language, indice):
+    """Review sintética no mesmo formato do JSON da Steam"""
+    return {
+        'recommendationid': str(appid * 10_000_000 + zlib.crc32(language.encode()) % 1000 * 10_000 + indice),
+        'author': {
+            'steamid': str(76561197960265728 + indice),
+            'playtime_forever': 60 + (indice * 37) % 1200,
+            'playtime_at_review': 30 + (indice * 17) % 600,
+        },
+        'language': language,
+        'review': TEXTOS[indice % len(TEXTOS)],
+        'timestamp_created': 1_600_000_000 + indice * 3600,
+        'voted_up': indice % 7 != 0,
+        'votes_up': indice % 5,
+        'weighted_vote_score': '0.5',
+    }
+
+
+class ServidorStubSteam:
+    """
+    Servidor em thread de fundo.
+
+    reviews_por_fluxo: total de reviews por (appid, idioma)
+    latencia: segundos de espera por requisição (emula a rede)
+    erro_429_a_cada: devolve 429 a cada N requisições (0 desativa)
+    """
+
+    def __init__(self, porta=0, reviews_por_fluxo=500, latencia=0.02, erro_429_a_cada=0, retry_after=None):
+        self.reviews_por_fluxo = reviews_por_fluxo
+        self.latencia = latencia
+        self.erro_429_a_cada = erro_429_a_cada
+        self.retry_after = retry_after
+        self.requisicoes = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Mantém conexões keep-alive
+            disable_nagle_algorithm = True  # Sem o atraso de ~40 ms do Nagle + ACK atrasado
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._responder(self)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, porta = self.httpd.server_address
+        return f"http://{host}:{porta}"
+
+    def _responder(self, handler):
+        with self._lock:
+            self.requisicoes += 1
+            numero = self.requisicoes
+
+        if self.latencia:
+            time.sleep(self.latencia)
+
+        url = urlparse(handler.path)
+        partes = url.path.strip('/').split('/')
+        if len(partes) != 2 or partes[0] != 'appreviews' or not partes[1].isdigit():
+            self._enviar(handler, 404, {'success': 0})
+            return
+
+        if self.erro_429_a_cada and numero % self.erro_429_a_cada == 0:
+            cabecalhos = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else {}
+            self._enviar(handler, 429, {'success': 0}, cabecalhos)
+            return
+
+        appid = int(partes[1])
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        language = params.get('language', 'english')
+        cursor = params.get('cursor', '*')
+        por_pagina = int(params.get('num_per_page', 100))
+
+        inicio = 0 if cursor == '*' else int(cursor.lstrip('c'))
+        fim = min(inicio + por_pagina, self.reviews_por_fluxo)
+        if params.get('filter') == 'recent':
+            # Mais recentes primeiro
+            indices = range(self.reviews_por_fluxo - 1 - inicio, self.reviews_por_fluxo - 1 - fim, -1)
+        else:
+            indices = range(inicio, fim)
+        reviews = [gerar_review(appid, language, i) for i in indices]
+        # Como a Steam, a última página devolve o mesmo cursor
+        proximo = f"c{fim}" if reviews else cursor
+
+        self._enviar(handler, 200, {
+            'success': 1,
+            'query_summary': {'num_reviews': len(reviews)},
+            'reviews': reviews,
+            'cursor': proximo,
+        })
+
+    def _enviar(self, handler, status, corpo, cabecalhos=None):
+        dados = json.dumps(corpo).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            handler.send_header(nome, valor)
+        handler.end_headers()
+        handler.wfile.write(dados)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    porta = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with ServidorStubSteam(porta=porta) as stub:
+        print(f"Stub da Steam em {stub.base_url}/appreviews/<appid> (Ctrl+C para sair)")
+        try:
+            stub.thread.join()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,364 @@
+"""
+Índice de busca local (SQLite FTS5) sobre o texto das reviews coletadas.
+
+Uso:
+    python busca_reviews.py --indexar
+    python busca_reviews.py audio sound --idioma english --exemplos 3
+    python busca_reviews.py --aspectos --desde 2024-01-01
+"""
+import argparse
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from armazenamento import APPID_PADRAO, DIRETORIO_REVIEWS, existe_armazenamento, ler_em_blocos
+from cache_reviews import hash_texto
+from instrumentacao import etapa
+
+CAMINHO_INDICE = 'indice_reviews.sqlite'
+
+# Campos agrupáveis em `contar_por`
+CAMPOS_AGRUPAVEIS = ('appid', 'idioma', 'recomendado')
+
+Termos = Union[str, Sequence[str], None]
+
+_GATILHO_INSERCAO = '''
+    CREATE TRIGGER IF NOT EXISTS reviews_ai AFTER INSERT ON reviews BEGIN
+        INSERT INTO textos (rowid, texto) VALUES (new.rowid, new.texto);
+    END;
+'''
+
+
+def _consulta_fts(termos: Termos) -> Optional[str]:
+    """
+    Expressão MATCH que casa qualquer um dos termos como substring (mesma regra
+    do CasadorConceitos). O tokenizador trigram exige termos de 3+ caracteres.
+    """
+    if termos is None:
+        return None
+    if isinstance(termos, str):
+        termos = [termos]
+    termos = [t.strip() for t in termos if t and t.strip()]
+    if not termos:
+        return None
+    curtos = [t for t in termos if len(t) < 3]
+    if curtos:
+        raise ValueError(f"Termos de busca precisam de ao menos 3 caracteres: {curtos}")
+    return ' OR '.join('"' + t.replace('"', '""') + '"' for t in termos)
+
+
+def _segundos(data: Any) -> int:
+    return int(pd.Timestamp(data).timestamp())
+
+
+def _ids_reviews(df: pd.DataFrame) -> List[str]:
+    """recommendationid quando existe; senão um hash estável do conteúdo (planilhas antigas)"""
+    if 'ID da Review' in df.columns:
+        return df['ID da Review'].astype(str).tolist()
+    chaves = df['Review'].astype(str) + '\x00' + df['Data da Review'].astype(str) + '\x00' + df['Idioma'].astype(str)
+    return ['h' + hash_texto(chave).hex() for chave in chaves]
+
+
+class IndiceReviews:
+    """
+    Índice invertido das reviews em SQLite: tabela `reviews` com os campos
+    filtráveis (appid, idioma, recomendado, data, minutos jogados) e o texto,
+    e uma tabela FTS5 de conteúdo externo sobre o texto, mantida em sincronia
+    por gatilhos.
+
+    O tokenizador é o trigram, que casa substrings sem diferenciar maiúsculas,
+    como o CasadorConceitos: as contagens de um aspecto batem com as da
+    análise completa. `indexar` faz upsert pelo ID da review e só reescreve
+    as linhas que mudaram, então basta passar as reviews novas de cada coleta.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_INDICE):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS reviews (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                appid INTEGER,
+                idioma TEXT,
+                recomendado INTEGER,
+                data INTEGER,
+                minutos INTEGER,
+                texto TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_reviews_filtros ON reviews (appid, idioma, data);
+            CREATE VIRTUAL TABLE IF NOT EXISTS textos USING fts5(
+                texto, content='reviews', content_rowid='rowid', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS reviews_ad AFTER DELETE ON reviews BEGIN
+                INSERT INTO textos (textos, rowid, texto) VALUES ('delete', old.rowid, old.texto);
+            END;
+            CREATE TRIGGER IF NOT EXISTS reviews_au AFTER UPDATE OF texto ON reviews BEGIN
+                INSERT INTO textos (textos, rowid, texto) VALUES ('delete', old.rowid, old.texto);
+                INSERT INTO textos (rowid, texto) VALUES (new.rowid, new.texto);
+            END;
+        ''' + _GATILHO_INSERCAO)
+
+    def __len__(self) -> int:
+        return self.conexao.execute('SELECT COUNT(*) FROM reviews').fetchone()[0]
+
+    def indexar(self, df: pd.DataFrame, appid: Optional[int] = None) -> int:
+        """
+        Insere ou atualiza as reviews de `df` (colunas do armazenamento). O appid
+        vem do argumento ou da coluna 'AppID'. Retorna as linhas alteradas.
+        """
+        if df.empty:
+            return 0
+        if appid is not None:
+            appids: Iterable[Any] = [int(appid)] * len(df)
+        elif 'AppID' in df.columns:
+            appids = df['AppID'].astype('int64').tolist()
+        else:
+            appids = [None] * len(df)
+        datas = pd.to_datetime(df['Data da Review'])
+        segundos = (datas.to_numpy(dtype='datetime64[s]').astype(np.int64)).tolist()
+        minutos = pd.to_numeric(df['Horas Jogadas'], errors='coerce') if 'Horas Jogadas' in df.columns else None
+        linhas = zip(
+            _ids_reviews(df),
+            appids,
+            df['Idioma'].astype(str).tolist(),
+            (df['Recomendado'] == True).astype(int).tolist(),
+            [s if not pd.isna(d) else None for s, d in zip(segundos, datas)],
+            [None if pd.isna(m) else int(m) for m in minutos] if minutos is not None else [None] * len(df),
+            [t if isinstance(t, str) else None for t in df['Review']],
+        )
+        # Carga inicial: inserir sem o gatilho e reconstruir o FTS de uma vez é
+        # cerca de 3x mais rápido que atualizá-lo linha a linha
+        carga_inicial = len(self) == 0
+        with self.conexao:
+            if carga_inicial:
+                self.conexao.execute('DROP TRIGGER reviews_ai')
+            # rowcount não inclui as linhas dos gatilhos nem as reviews inalteradas
+            cursor = self.conexao.executemany('''
+                INSERT INTO reviews (id, appid, idioma, recomendado, data, minutos, texto)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    appid = excluded.appid, idioma = excluded.idioma, recomendado = excluded.recomendado,
+                    data = excluded.data, minutos = excluded.minutos, texto = excluded.texto
+                WHERE texto IS NOT excluded.texto OR recomendado IS NOT excluded.recomendado
+                    OR minutos IS NOT excluded.minutos OR data IS NOT excluded.data
+                    OR idioma IS NOT excluded.idioma OR appid IS NOT excluded.appid
+            ''', linhas)
+            if carga_inicial:
+                self.conexao.execute("INSERT INTO textos (textos) VALUES ('rebuild')")
+                self.conexao.execute(_GATILHO_INSERCAO)
+        return cursor.rowcount
+
+    def indexar_armazenamento(self, diretorio: str = DIRETORIO_REVIEWS, tamanho_bloco: int = 50_000,
+                              appid: Optional[int] = None) -> int:
+        """
+        Indexa (ou atualiza) todo o armazenamento Parquet, em blocos. `diretorio`
+        também pode ser um .csv ou .jsonl; sem a coluna 'AppID', vale `appid`.
+        """
+        colunas = ['AppID', 'ID da Review', 'Idioma', 'Recomendado', 'Data da Review', 'Horas Jogadas', 'Review']
+        total = 0
+        with etapa('indexar_reviews') as medicao:
+            for bloco in ler_em_blocos(diretorio, tamanho_bloco):
+                bloco = bloco[[c for c in colunas if c in bloco.columns]]
+                self.indexar(bloco, appid)
+                total += len(bloco)
+            medicao.itens = total
+        with self.conexao:
+            self.conexao.execute("INSERT INTO textos (textos) VALUES ('optimize')")
+        return total
+
+    def _onde(self, termos: Termos = None, appid: Optional[int] = None,
+              idioma: Union[str, Sequence[str], None] = None, recomendado: Optional[bool] = None,
+              desde: Any = None, ate: Any = None,
+              horas_min: Optional[float] = None, horas_max: Optional[float] = None) -> Tuple[str, List[Any]]:
+        """Cláusula WHERE (sobre `reviews r`) e parâmetros dos filtros"""
+        condicoes, parametros = [], []
+        consulta = _consulta_fts(termos)
+        if consulta is not None:
+            condicoes.append('r.rowid IN (SELECT rowid FROM textos WHERE textos MATCH ?)')
+            parametros.append(consulta)
+        if appid is not None:
+            condicoes.append('r.appid = ?')
+            parametros.append(int(appid))
+        if idioma is not None:
+            idiomas = [idioma] if isinstance(idioma, str) else list(idioma)
+            condicoes.append(f"r.idioma IN ({','.join('?' * len(idiomas))})")
+            parametros.extend(idiomas)
+        if recomendado is not None:
+            condicoes.append('r.recomendado = ?')
+            parametros.append(int(bool(recomendado)))
+        if desde is not None:
+            condicoes.append('r.data >= ?')
+            parametros.append(_segundos(desde))
+        if ate is not None:
+            # `ate` inclui o dia inteiro
+            condicoes.append('r.data < ?')
+            parametros.append(_segundos(pd.Timestamp(ate).normalize() + pd.Timedelta(days=1)))
+        if horas_min is not None:
+            condicoes.append('r.minutos >= ?')
+            parametros.append(horas_min * 60)
+        if horas_max is not None:
+            condicoes.append('r.minutos <= ?')
+            parametros.append(horas_max * 60)
+        return (' WHERE ' + ' AND '.join(condicoes)) if condicoes else '', parametros
+
+    def buscar(self, termos: Termos = None, limite: Optional[int] = None, **filtros: Any) -> List[str]:
+        """IDs das reviews que mencionam qualquer um dos `termos` e passam nos filtros"""
+        onde, parametros = self._onde(termos, **filtros)
+        sql = f'SELECT r.id FROM reviews r{onde} ORDER BY r.data DESC, r.rowid'
+        if limite is not None:
+            sql += ' LIMIT ?'
+            parametros.append(int(limite))
+        return [linha[0] for linha in self.conexao.execute(sql, parametros)]
+
+    def contar(self, termos: Termos = None, **filtros: Any) -> int:
+        onde, parametros = self._onde(termos, **filtros)
+        return self.conexao.execute(f'SELECT COUNT(*) FROM reviews r{onde}', parametros).fetchone()[0]
+
+    def contar_por(self, campo: str, termos: Termos = None, **filtros: Any) -> Dict[Any, int]:
+        """Contagem das reviews encontradas por `campo` ('appid', 'idioma' ou 'recomendado')"""
+        if campo not in CAMPOS_AGRUPAVEIS:
+            raise ValueError(f"Campo de agrupamento inválido: {campo} (use {', '.join(CAMPOS_AGRUPAVEIS)})")
+        onde, parametros = self._onde(termos, **filtros)
+        linhas = self.conexao.execute(
+            f'SELECT r.{campo}, COUNT(*) FROM reviews r{onde} GROUP BY r.{campo} ORDER BY COUNT(*) DESC', parametros
+        )
+        if campo == 'recomendado':
+            return {bool(valor): n for valor, n in linhas}
+        return dict(linhas)
+
+    def exemplos(self, termos: Termos, n: int = 3, tamanho: int = 240, **filtros: Any) -> List[Dict[str, Any]]:
+        """
+        Até `n` reviews de exemplo para os termos, as mais úteis primeiro
+        (menor rank BM25, depois as mais recentes), com o texto cortado em
+        `tamanho` caracteres ao redor da primeira menção.
+        """
+        consulta = _consulta_fts(termos)
+        onde, parametros = self._onde(None, **filtros)
+        condicoes = onde.replace(' WHERE ', ' AND ', 1)
+        linhas = self.conexao.execute(f'''
+            SELECT r.id, r.idioma, r.recomendado, r.data, r.minutos, r.texto
+            FROM textos JOIN reviews r ON r.rowid = textos.rowid
+            WHERE textos MATCH ?{condicoes}
+            ORDER BY textos.rank, r.data DESC LIMIT ?
+        ''', [consulta, *parametros, int(n)]).fetchall()
+
+        termos_minusculos = [t.lower() for t in ([termos] if isinstance(termos, str) else termos)]
+        resultado = []
+        for id_review, idioma, recomendado, data, minutos, texto in linhas:
+            resultado.append({
+                'id': id_review,
+                'idioma': idioma,
+                'recomendado': bool(recomendado),
+                'data': pd.Timestamp(data, unit='s').strftime('%Y-%m-%d') if data is not None else None,
+                'horas': round(minutos / 60, 1) if minutos is not None else None,
+                'trecho': _trecho(texto, termos_minusculos, tamanho),
+            })
+        return resultado
+
+    def pontuar_aspectos(self, aspectos: Dict[str, List[str]], **filtros: Any) -> Dict[str, Dict[str, int]]:
+        """
+        Menções, positivas e pontuação (% positivas, 50 sem menções) de cada
+        aspecto, sob demanda para qualquer combinação de filtros.
+        """
+        resultado = {}
+        for aspecto, termos in aspectos.items():
+            contagens = self.contar_por('recomendado', termos, **filtros)
+            mencoes = sum(contagens.values())
+            positivas = contagens.get(True, 0)
+            resultado[aspecto] = {
+                'mencoes': mencoes,
+                'positivas': positivas,
+                'score': int(positivas / mencoes * 100) if mencoes else 50,
+            }
+        return resultado
+
+    def fechar(self) -> None:
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _trecho(texto: str, termos: List[str], tamanho: int) -> str:
+    """Janela de `tamanho` caracteres do texto começando pouco antes da primeira menção"""
+    texto = ' '.join(texto.split())
+    if len(texto) <= tamanho:
+        return texto
+    minusculo = texto.lower()
+    posicoes = [p for p in (minusculo.find(t) for t in termos) if p >= 0]
+    inicio = max(0, min(posicoes, default=0) - tamanho // 4)
+    fim = min(len(texto), inicio + tamanho)
+    inicio = max(0, fim - tamanho)
+    return ('…' if inicio else '') + texto[inicio:fim].strip() + ('…' if fim < len(texto) else '')
+
+
+def atualizar_indice(df: pd.DataFrame, appid: Optional[int] = None, caminho: str = CAMINHO_INDICE) -> None:
+    """Indexa as reviews recém-coletadas, se o índice de busca já existir"""
+    if not os.path.exists(caminho):
+        return
+    with IndiceReviews(caminho) as indice:
+        alteradas = indice.indexar(df, appid)
+    print(f"Índice de busca atualizado ({alteradas} reviews indexadas).")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Busca no texto das reviews coletadas')
+    parser.add_argument('termos', nargs='*', help='Termos procurados (qualquer um deles, como substring)')
+    parser.add_argument('--indice', default=CAMINHO_INDICE, help=f'Arquivo do índice (padrão: {CAMINHO_INDICE})')
+    parser.add_argument('--indexar', action='store_true', help='Indexa (ou atualiza) todo o armazenamento Parquet')
+    parser.add_argument('--appid', type=int)
+    parser.add_argument('--idioma', action='append', help='Filtra pelo idioma (pode repetir)')
+    parser.add_argument('--recomendado', choices=['sim', 'nao'])
+    parser.add_argument('--desde', help='Data inicial (AAAA-MM-DD)')
+    parser.add_argument('--ate', help='Data final, inclusive (AAAA-MM-DD)')
+    parser.add_argument('--horas-min', type=float)
+    parser.add_argument('--horas-max', type=float)
+    parser.add_argument('--exemplos', type=int, default=0, metavar='N', help='Mostra N reviews de exemplo')
+    parser.add_argument('--aspectos', action='store_true', help='Pontua os aspectos da análise com os filtros dados')
+    args = parser.parse_args()
+
+    filtros = {
+        'appid': args.appid, 'idioma': args.idioma, 'desde': args.desde, 'ate': args.ate,
+        'horas_min': args.horas_min, 'horas_max': args.horas_max,
+        'recomendado': None if args.recomendado is None else args.recomendado == 'sim',
+    }
+    with IndiceReviews(args.indice) as indice:
+        if args.indexar:
+            inicio = time.perf_counter()
+            if existe_armazenamento():
+                total = indice.indexar_armazenamento()
+            else:
+                # Sem coleta, como nos outros scripts: o CSV do repositório, que é do jogo padrão
+                print(f"'{DIRETORIO_REVIEWS}/' não encontrado; indexando o CSV do repositório (App ID {APPID_PADRAO})")
+                total = indice.indexar_armazenamento('The Vale - Shadow of the Crown  - reviews - Sheet1.csv',
+                                                     appid=APPID_PADRAO)
+            print(f"✓ {total} reviews lidas do armazenamento e indexadas em {time.perf_counter() - inicio:.2f}s ({len(indice)} no índice)")
+
+        if args.aspectos:
+            # Importado aqui: os mapas de aspectos vivem na análise
+            from processar_dados import ASPECTOS
+            for aspecto, pontuacao in indice.pontuar_aspectos(ASPECTOS, **filtros).items():
+                print(f"{aspecto:>20}: {pontuacao['score']:>3}% ({pontuacao['positivas']}/{pontuacao['mencoes']})")
+
+        if args.termos:
+            inicio = time.perf_counter()
+            total = indice.contar(args.termos, **filtros)
+            por_idioma = indice.contar_por('idioma', args.termos, **filtros)
+            por_recomendacao = indice.contar_por('recomendado', args.termos, **filtros)
+            duracao = (time.perf_counter() - inicio) * 1000
+            print(f"{total} reviews encontradas em {duracao:.1f} ms")
+            print(f"  por idioma: {por_idioma}")
+            print(f"  positivas: {por_recomendacao.get(True, 0)}, negativas: {por_recomendacao.get(False, 0)}")
+            for exemplo in indice.exemplos(args.termos, args.exemplos, **filtros) if args.exemplos else []:
+                sinal = '👍' if exemplo['recomendado'] else '👎'
+                print(f"\n{sinal} [{exemplo['idioma']}, {exemplo['data']}, {exemplo['horas']}h] {exemplo['trecho']}")
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from typing import Any, Callable, Dict, List, Sequence
+
+from tokenizador import Vocabulario
+
+CAMINHO_CACHE = 'cache_reviews.sqlite'
+
+# Limite de parâmetros por consulta (SQLITE_MAX_VARIABLE_NUMBER antigo é 999)
+_LOTE_SQL = 500
+
+
+def versao_de(*objetos: Any) -> str:
+    """
+    Hash estável dos objetos que definem o resultado da análise (mapas de
+    palavras-chave, stopwords, padrões de tokenização). Qualquer mudança neles
+    gera uma nova versão e invalida as entradas antigas.
+    """
+    def normalizar(obj):
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj)
+        raise TypeError(f"Tipo não serializável na versão: {type(obj).__name__}")
+
+    conteudo = json.dumps(objetos, sort_keys=True, ensure_ascii=False, default=normalizar)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+
+
+def hash_texto(texto: Any) -> bytes:
+    """Hash de conteúdo da review; valores não textuais (ex.: NaN) têm chave própria"""
+    chave = texto if isinstance(texto, str) else '\x00' + repr(texto)
+    return hashlib.blake2b(chave.encode('utf-8'), digest_size=16).digest()
+
+
+class CacheReviews:
+    """
+    Cache persistente (SQLite) do resultado da análise de cada review.
+
+    Os resultados são gravados com pickle, bem mais rápido de decodificar que
+    JSON; o arquivo é local e só deve ser lido pelo próprio pipeline.
+
+    A chave é (escopo, hash do texto, versão): `escopo` separa os consumidores
+    (ex.: 'processar', 'gephi') que compartilham o arquivo e `versao` identifica
+    os mapas de palavras-chave/stopwords usados. Ao abrir, entradas do mesmo
+    escopo com outra versão são descartadas.
+
+    O tamanho é limitado a `max_entradas` por escopo: ao fechar, as entradas
+    usadas há mais execuções são removidas primeiro (LRU por execução).
+
+    `vocabulario` é um tokenizador.Vocabulario persistido junto com o cache,
+    por escopo: resultados podem guardar arrays de ids dele, que continuam
+    válidos entre execuções. As palavras novas são gravadas na mesma
+    transação que os resultados que as usam.
+    """
+
+    def __init__(self, escopo: str, versao: str, caminho: str = CAMINHO_CACHE,
+                 max_entradas: int = 1_000_000):
+        self.escopo = escopo
+        self.versao = versao
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self.removidas = 0
+        self._vocabulario = None
+        self._palavras_gravadas = 0
+
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS analises (
+                escopo TEXT NOT NULL,
+                hash BLOB NOT NULL,
+                versao TEXT NOT NULL,
+                resultado BLOB NOT NULL,
+                execucao INTEGER NOT NULL,
+                PRIMARY KEY (escopo, hash, versao)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_analises_execucao ON analises (escopo, execucao);
+            CREATE TABLE IF NOT EXISTS execucoes (
+                escopo TEXT PRIMARY KEY,
+                numero INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS vocabulario (
+                escopo TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                palavra TEXT NOT NULL,
+                PRIMARY KEY (escopo, id)
+            ) WITHOUT ROWID;
+        ''')
+
+        with self.conexao:
+            # Invalidação: mapas/stopwords mudaram desde a última execução
+            cursor = self.conexao.execute(
+                'DELETE FROM analises WHERE escopo = ? AND versao != ?', (escopo, versao)
+            )
+            self.removidas += cursor.rowcount
+            self.conexao.execute(
+                'INSERT INTO execucoes (escopo, numero) VALUES (?, 1) '
+                'ON CONFLICT(escopo) DO UPDATE SET numero = numero + 1', (escopo,)
+            )
+            self.execucao = self.conexao.execute(
+                'SELECT numero FROM execucoes WHERE escopo = ?', (escopo,)
+            ).fetchone()[0]
+
+    @property
+    def vocabulario(self) -> Vocabulario:
+        """Vocabulário persistido do escopo (carregado no primeiro uso)"""
+        if self._vocabulario is None:
+            self._vocabulario = Vocabulario()
+            for id_, palavra in self.conexao.execute(
+                    'SELECT id, palavra FROM vocabulario WHERE escopo = ? ORDER BY id', (self.escopo,)):
+                if self._vocabulario.id(palavra) != id_:
+                    raise ValueError(f"Vocabulário do cache corrompido em '{self.caminho}' (id {id_})")
+            self._palavras_gravadas = len(self._vocabulario)
+        return self._vocabulario
+
+    def _gravar_vocabulario(self) -> None:
+        """Palavras internadas desde a última gravação (chamar dentro de uma transação)"""
+        if self._vocabulario is None or len(self._vocabulario) == self._palavras_gravadas:
+            return
+        novas = self._vocabulario.palavras[self._palavras_gravadas:]
+        self.conexao.executemany(
+            'INSERT INTO vocabulario (escopo, id, palavra) VALUES (?, ?, ?)',
+            [(self.escopo, self._palavras_gravadas + i, palavra) for i, palavra in enumerate(novas)]
+        )
+        self._palavras_gravadas = len(self._vocabulario)
+
+    def _buscar(self, hashes: List[bytes]) -> Dict[bytes, bytes]:
+        encontrados = {}
+        for inicio in range(0, len(hashes), _LOTE_SQL):
+            lote = hashes[inicio:inicio + _LOTE_SQL]
+            marcadores = ','.join('?' * len(lote))
+            parametros = [self.escopo, self.versao, *lote]
+            encontrados.update(self.conexao.execute(
+                f'SELECT hash, resultado FROM analises WHERE escopo = ? AND versao = ? AND hash IN ({marcadores})',
+                parametros
+            ))
+            self.conexao.execute(
+                f'UPDATE analises SET execucao = ? WHERE escopo = ? AND versao = ? AND hash IN ({marcadores})',
+                [self.execucao, *parametros]
+            )
+        return encontrados
+
+    def resolver(self, textos: Sequence[Any], calcular: Callable[[List[Any]], List[Any]]) -> List[Any]:
+        """
+        Resultado de cada texto, na ordem de entrada. Os textos ausentes do cache
+        (contados uma vez cada, mesmo se repetidos) são passados a `calcular`,
+        que deve devolver um resultado (serializável com pickle) por texto.
+        """
+        hashes = [hash_texto(t) for t in textos]
+        with self.conexao:
+            em_cache = self._buscar(list(set(hashes)))
+
+            faltantes = {}
+            for h, texto in zip(hashes, textos):
+                if h not in em_cache and h not in faltantes:
+                    faltantes[h] = texto
+            falhas = sum(1 for h in hashes if h not in em_cache)
+            self.acertos += len(hashes) - falhas
+            self.falhas += falhas
+
+            novos = {}
+            if faltantes:
+                resultados = calcular(list(faltantes.values()))
+                novos = dict(zip(faltantes, resultados))
+                self.conexao.executemany(
+                    'INSERT OR REPLACE INTO analises (escopo, hash, versao, resultado, execucao) VALUES (?, ?, ?, ?, ?)',
+                    [(self.escopo, h, self.versao, pickle.dumps(r, pickle.HIGHEST_PROTOCOL), self.execucao)
+                     for h, r in novos.items()]
+                )
+                self._gravar_vocabulario()
+
+        return [novos[h] if h in novos else pickle.loads(em_cache[h]) for h in hashes]
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def _despejar(self) -> None:
+        """Remove as entradas menos recentemente usadas além de `max_entradas`"""
+        total = self.conexao.execute(
+            'SELECT COUNT(*) FROM analises WHERE escopo = ?', (self.escopo,)
+        ).fetchone()[0]
+        excesso = total - self.max_entradas
+        if excesso > 0:
+            with self.conexao:
+                cursor = self.conexao.execute(
+                    'DELETE FROM analises WHERE escopo = ? AND hash IN ('
+                    'SELECT hash FROM analises WHERE escopo = ? ORDER BY execucao LIMIT ?)',
+                    (self.escopo, self.escopo, excesso)
+                )
+                self.removidas += cursor.rowcount
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': round(self.taxa_acerto, 4),
+            'removidas': self.removidas,
+            'tamanho_bytes': os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+        }
+
+    def fechar(self) -> None:
+        self._despejar()
+        self.conexao.close()
+        resumo = self.resumo()
+        print(f"Cache ({self.escopo}): {resumo['acertos']} acertos, {resumo['falhas']} falhas "
+              f"({resumo['taxa_acerto']:.1%} de acerto), {resumo['removidas']} entradas removidas")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
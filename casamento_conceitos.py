@@ -0,0 +1,116 @@
+import re
+from collections import Counter
+
+
+def _construir_trie(termos):
+    """Monta uma trie (dicionários aninhados) a partir da lista de termos"""
+    trie = {}
+    for termo in termos:
+        no = trie
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[''] = True  # Marca de fim de termo
+    return trie
+
+
+def _trie_para_regex(no):
+    """
+    Converte a trie em uma expressão regular com prefixos compartilhados.
+    Ex.: ['fight', 'fighting'] -> 'fight(?:ing)?'
+    O quantificador guloso garante que o termo mais longo seja tentado primeiro.
+    """
+    terminal = '' in no
+    ramos = [
+        re.escape(caractere) + _trie_para_regex(filho)
+        for caractere, filho in sorted(no.items()) if caractere != ''
+    ]
+    if not ramos:
+        return ''
+    corpo = ramos[0] if len(ramos) == 1 else '(?:' + '|'.join(ramos) + ')'
+    if terminal:
+        corpo = '(?:' + corpo + ')?'
+    return corpo
+
+
+class CasadorConceitos:
+    """
+    Motor único de busca de palavras-chave (estilo Aho-Corasick).
+
+    Recebe vários mapas {conceito: [termos]} (ex.: conceitos, aspectos,
+    co-ocorrência), junta todos os termos em um único autômato compilado e
+    percorre cada review apenas uma vez. O resultado por review é a contagem
+    de ocorrências de cada conceito em cada mapa, da qual todas as análises
+    são derivadas.
+    """
+
+    def __init__(self, mapas):
+        self.mapas = {
+            nome: {conceito: [t.lower() for t in termos] for conceito, termos in mapa.items()}
+            for nome, mapa in mapas.items()
+        }
+
+        termos = sorted({t for mapa in self.mapas.values() for ts in mapa.values() for t in ts if t})
+        self.termos = termos
+
+        # Termos que são prefixo de outro casam na mesma posição: a regex só
+        # devolve o mais longo, então guardamos os prefixos implícitos
+        self._implicitos = {
+            t: (t,) + tuple(p for p in termos if p != t and t.startswith(p))
+            for t in termos
+        }
+
+        # Só termos com borda (prefixo == sufixo, ex.: 'aa') podem se sobrepor
+        # a si mesmos; apenas esses precisam de controle de posição
+        self._sobrepoe = {
+            t for t in termos
+            if any(t[:k] == t[-k:] for k in range(1, len(t)))
+        }
+
+        # Lookahead permite casamentos sobrepostos (ex.: 'spatial audio' e 'audio')
+        padrao = _trie_para_regex(_construir_trie(termos))
+        self._regex = re.compile('(?=(' + padrao + '))') if padrao else None
+
+        # Para cada termo, os pares (mapa, conceito) aos quais ele pertence
+        self._destinos = {t: [] for t in termos}
+        for nome, mapa in self.mapas.items():
+            for conceito, ts in mapa.items():
+                for t in set(ts):
+                    self._destinos[t].append((nome, conceito))
+
+    def contar_termos(self, texto):
+        """
+        Conta as ocorrências de cada termo em um texto já em minúsculas.
+        Segue a semântica de str.count: ocorrências do mesmo termo não se sobrepõem.
+        """
+        contagens = Counter()
+        if self._regex is None or not texto:
+            return contagens
+
+        fim_anterior = {}
+        for m in self._regex.finditer(texto):
+            for termo in self._implicitos[m.group(1)]:
+                if termo in self._sobrepoe:
+                    inicio = m.start()
+                    if inicio < fim_anterior.get(termo, 0):
+                        continue
+                    fim_anterior[termo] = inicio + len(termo)
+                contagens[termo] += 1
+        return contagens
+
+    def acertos(self, texto):
+        """
+        Retorna {mapa: {conceito: ocorrências}} para uma review.
+        Conceitos sem ocorrência são omitidos.
+        """
+        resultado = {nome: Counter() for nome in self.mapas}
+        for termo, qtd in self.contar_termos(texto).items():
+            for nome, conceito in self._destinos[termo]:
+                resultado[nome][conceito] += qtd
+        return resultado
+
+    def acertos_em_lote(self, textos):
+        """Aplica `acertos` a uma sequência de reviews (uma passada por review)"""
+        return [
+            self.acertos(texto.lower() if isinstance(texto, str) else '')
+            for texto in textos
+        ]
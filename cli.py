@@ -0,0 +1,100 @@
+"""
+Ponto de entrada único da pipeline, com um subcomando por tarefa.
+
+    python cli.py coletar [--incremental ...]       (ou collect)
+    python cli.py processar [--streaming ...]       (ou process)
+    python cli.py consolidar [--online ...]         (ou consolidate)
+    python cli.py gephi [--termos N ...]            (ou export-gephi)
+    python cli.py pipeline | lote | buscar | duplicatas [...]
+    python cli.py resumo [ARQUIVO]
+    python cli.py relatorio [ARQUIVO]
+
+Os subcomandos de script repassam os argumentos ao script correspondente,
+executado no mesmo processo como se fosse chamado direto (`python cli.py
+processar --help` mostra as opções dele). O script, e com ele pandas, numpy e
+requests, só é importado quando o subcomando roda. `resumo` e `relatorio` usam
+só a biblioteca padrão e abrem quase no tempo do próprio interpretador (ver
+benchmarks/bench_inicializacao.py).
+"""
+import argparse
+import runpy
+import sys
+from typing import List, Optional
+
+# Subcomando: (módulo executado, nomes alternativos, descrição)
+SCRIPTS = {
+    'coletar': ('getAvaliacoes_refactored', ('collect',), 'Coleta as reviews da Steam'),
+    'processar': ('processar_dados', ('process',), 'Processa as reviews e gera dados_processados.json'),
+    'consolidar': ('coletar_multiplataforma', ('consolidate',), 'Consolida os dados de todas as plataformas'),
+    'gephi': ('exportar_gephi', ('export-gephi',), 'Gera os arquivos do Gephi'),
+    'pipeline': ('pipeline', (), 'Executa as etapas desatualizadas pela ordem das dependências'),
+    'lote': ('lote_jogos', (), 'Coleta e processa vários jogos da Steam'),
+    'buscar': ('busca_reviews', ('search',), 'Busca no texto das reviews coletadas'),
+    'duplicatas': ('duplicatas', (), 'Reviews quase duplicadas (MinHash + LSH)'),
+}
+MODULOS = {nome: modulo for comando, (modulo, apelidos, _) in SCRIPTS.items() for nome in (comando, *apelidos)}
+
+# Etapas mais lentas mostradas por script em `relatorio`
+ETAPAS_RELATORIO = 3
+
+
+def executar_script(modulo: str, argumentos: List[str]) -> None:
+    """Roda `python <modulo>.py argumentos` neste processo"""
+    sys.argv = [f'{modulo}.py', *argumentos]
+    # alter_sys: o script vira o __main__ (sys.argv[0], pickle dos workers)
+    runpy.run_module(modulo, run_name='__main__', alter_sys=True)
+
+
+def imprimir_relatorio(execucoes, etapas=ETAPAS_RELATORIO) -> None:
+    """Duração, vazão e etapas mais lentas de cada script do relatório"""
+    for script, relatorio in execucoes.items():
+        situacao = '' if relatorio.get('sucesso', True) else ' (falhou)'
+        vazao = relatorio['contadores'].get('reviews_por_segundo')
+        print(f"{script}: {relatorio['duracao_s']:.2f}s, CPU {relatorio['cpu_s']:.2f}s, "
+              f"em {relatorio['inicio']}{situacao}" + (f"; {vazao:,.0f} reviews/s" if vazao else ''))
+        lentas = sorted(relatorio['etapas'].items(), key=lambda item: -item[1]['segundos'])[:etapas]
+        for nome, medida in lentas:
+            print(f"  - {nome}: {medida['segundos']:.2f}s ({medida['chamadas']}×)")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcomandos = parser.add_subparsers(dest='comando', metavar='COMANDO', required=True)
+    for comando, (modulo, apelidos, descricao) in SCRIPTS.items():
+        # Só documenta: os argumentos dos scripts são repassados em `main`
+        subcomandos.add_parser(comando, aliases=list(apelidos), help=f'{descricao} ({modulo}.py)')
+    resumo = subcomandos.add_parser('resumo', aliases=['summary'], help='Reimprime o resumo do último processamento')
+    resumo.add_argument('arquivo', nargs='?', default='dados_processados.json')
+    relatorio = subcomandos.add_parser('relatorio', aliases=['report'],
+                                       help='Mostra a duração e as etapas mais lentas de cada script')
+    relatorio.add_argument('arquivo', nargs='?', default='relatorio_execucao.json')
+    relatorio.add_argument('--etapas', type=int, default=ETAPAS_RELATORIO, metavar='N',
+                           help='Etapas mais lentas mostradas por script')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in MODULOS:
+        executar_script(MODULOS[argv[0]], argv[1:])
+        return
+
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.comando in ('resumo', 'summary'):
+        from resumo_dados import carregar_dados_processados, imprimir_resumo
+        try:
+            dados = carregar_dados_processados(args.arquivo)
+        except OSError:
+            parser.error(f"'{args.arquivo}' não encontrado; gere-o com `python cli.py processar`")
+        imprimir_resumo(dados)
+    else:
+        from instrumentacao import ler_relatorio
+        execucoes = ler_relatorio(args.arquivo)
+        if not execucoes:
+            parser.error(f"nenhuma execução registrada em '{args.arquivo}'")
+        imprimir_relatorio(execucoes, args.etapas)
+
+
+if __name__ == '__main__':
+    main()
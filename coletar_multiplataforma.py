@@ -1,8 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
-import re
+import os
+
+from armazenamento import APPID_PADRAO
+from busca_reviews import CAMINHO_INDICE, IndiceReviews
+from fontes_plataformas import DIRETORIO_CACHE_PLATAFORMAS, FontePlataforma, coletar_fontes, nota_e_total
+from publicacao import publicar
+from sentimento import MotorSentimento
 
 # Headers para simular um navegador real
 HEADERS = {
@@ -33,69 +37,65 @@ def get_metacritic_data(game_slug="the-vale-shadow-of-the-crown"):
             {
                 "source": "Game Informer",
                 "score": 85,
-                "excerpt": "A unique audio-only adventure that succeeds in creating an immersive world purely through sound design.",
-                "sentiment": "positive"
+                "excerpt": "A unique audio-only adventure that succeeds in creating an immersive world purely through sound design."
             },
             {
                 "source": "IGN",
                 "score": 80,
-                "excerpt": "The Vale proves that accessibility and innovation can go hand in hand to create something truly special.",
-                "sentiment": "positive"
+                "excerpt": "The Vale proves that accessibility and innovation can go hand in hand to create something truly special."
             },
             {
                 "source": "PC Gamer",
                 "score": 78,
-                "excerpt": "An ambitious audio-first RPG that delivers on its promise of inclusive gaming.",
-                "sentiment": "positive"
+                "excerpt": "An ambitious audio-first RPG that delivers on its promise of inclusive gaming."
             },
             {
                 "source": "GameSpot",
                 "score": 82,
-                "excerpt": "A groundbreaking title that sets new standards for audio-based gameplay and accessibility.",
-                "sentiment": "positive"
+                "excerpt": "A groundbreaking title that sets new standards for audio-based gameplay and accessibility."
             },
             {
                 "source": "Destructoid",
                 "score": 85,
-                "excerpt": "The Vale is a triumph of audio design and storytelling.",
-                "sentiment": "positive"
+                "excerpt": "The Vale is a triumph of audio design and storytelling."
             },
             {
                 "source": "Push Square",
                 "score": 75,
-                "excerpt": "While the concept is innovative, the gameplay can feel repetitive at times.",
-                "sentiment": "mixed"
+                "excerpt": "While the concept is innovative, the gameplay can feel repetitive at times."
             }
         ],
         "user_reviews_sample": [
             {
                 "score": 10,
-                "text": "As a visually impaired gamer, this is the first game I could play completely independently. Incredible experience!",
-                "sentiment": "positive"
+                "text": "As a visually impaired gamer, this is the first game I could play completely independently. Incredible experience!"
             },
             {
                 "score": 9,
-                "text": "Amazing audio design and compelling story. The combat system using only sound is revolutionary.",
-                "sentiment": "positive"
+                "text": "Amazing audio design and compelling story. The combat system using only sound is revolutionary."
             },
             {
                 "score": 8,
-                "text": "Great concept and execution. The 3D audio is phenomenal and the story kept me engaged throughout.",
-                "sentiment": "positive"
+                "text": "Great concept and execution. The 3D audio is phenomenal and the story kept me engaged throughout."
             },
             {
                 "score": 7,
-                "text": "Interesting game but a bit short. Would love to see more content like this.",
-                "sentiment": "positive"
+                "text": "Interesting game but a bit short. Would love to see more content like this."
             },
             {
                 "score": 5,
-                "text": "The idea is great but the gameplay becomes repetitive after a few hours.",
-                "sentiment": "mixed"
+                "text": "The idea is great but the gameplay becomes repetitive after a few hours."
             }
         ]
     }
     
+    # Rótulos de sentimento calculados a partir do texto de cada trecho
+    rotulador = MotorSentimento()
+    for review in metacritic_data['critic_reviews']:
+        review['sentiment'] = rotulador.rotular(review['excerpt'])
+    for review in metacritic_data['user_reviews_sample']:
+        review['sentiment'] = rotulador.rotular(review['text'])
+    
     return metacritic_data
 
 
@@ -171,9 +171,129 @@ def get_epic_store_data():
     }
 
 
-def consolidar_dados():
+# Páginas consultadas com --online (sobrescreva com --url plataforma=URL, ex.: fixtures locais).
+# Páginas sem AggregateRating (ex.: a busca da PlayStation Store) caem no snapshot/dados conhecidos.
+URLS_PLATAFORMAS = {
+    'metacritic': 'https://www.metacritic.com/game/the-vale-shadow-of-the-crown/',
+    'xbox': 'https://www.xbox.com/en-US/games/store/the-vale-shadow-of-the-crown',
+    'playstation': 'https://store.playstation.com/en-us/search/the%20vale%20shadow%20of%20the%20crown',
+    'nintendo': 'https://www.nintendo.com/us/store/products/the-vale-shadow-of-the-crown-switch/',
+    'epic': 'https://store.epicgames.com/en-US/p/the-vale-shadow-of-the-crown',
+}
+
+
+def extrair_metacritic(conteudo, dados):
+    """Metascore (PC) e número de críticas do AggregateRating da página"""
+    avaliacao = nota_e_total(conteudo, escala=100)
+    dados['metascore']['pc'] = round(avaliacao['nota'])
+    dados['total_critic_reviews'] = avaliacao['total']
+    return dados
+
+
+def extrair_loja(conteudo, dados):
+    """Nota (de 0 a 5) e número de avaliações de uma loja"""
+    avaliacao = nota_e_total(conteudo, escala=5)
+    dados['rating'] = avaliacao['nota']
+    dados['total_ratings'] = avaliacao['total']
+    return dados
+
+
+def fontes_plataformas(urls=None, timeout=10.0):
+    """Uma FontePlataforma por plataforma, com os dados conhecidos como padrão"""
+    urls = {**URLS_PLATAFORMAS, **(urls or {})}
+    padroes = {
+        'metacritic': (get_metacritic_data, extrair_metacritic),
+        'xbox': (get_xbox_store_data, extrair_loja),
+        'playstation': (get_playstation_store_data, extrair_loja),
+        'nintendo': (get_nintendo_eshop_data, extrair_loja),
+        'epic': (get_epic_store_data, extrair_loja),
+    }
+    return [
+        FontePlataforma(nome, urls[nome], extrair, padrao, timeout=timeout)
+        for nome, (padrao, extrair) in padroes.items()
+    ]
+
+
+# Campos da Steam que o consolidado já repete no nível de cima
+CAMPOS_REPETIDOS_STEAM = ('concepts', 'opinions', 'ngramas', 'coocorrencia', 'tendencias', 'sentimento', 'topicos')
+
+
+def rotulo_geral(percentual, total):
+    """Rótulo da recepção geral na escala da Steam (% positivo e volume de avaliações)"""
+    if percentual >= 80:
+        if percentual >= 95 and total >= 500:
+            return "Overwhelmingly Positive"
+        return "Very Positive" if total >= 50 else "Positive"
+    if percentual >= 70:
+        return "Mostly Positive"
+    if percentual >= 40:
+        return "Mixed"
+    if percentual >= 20:
+        return "Mostly Negative"
+    return "Overwhelmingly Negative" if total >= 500 else "Very Negative" if total >= 50 else "Negative"
+
+
+def amostras_reviews(caminho=CAMINHO_INDICE, por_aspecto=1, appid=APPID_PADRAO):
+    """
+    Reviews reais de exemplo para o dashboard, tiradas do índice de busca
+    (busca_reviews.py --indexar): a mais relevante positiva e negativa de cada
+    aspecto. Só usa as reviews do jogo `appid`: o índice também guarda as dos
+    jogos do lote_jogos.py. Sem índice, o dashboard mantém as amostras fixas.
+    """
+    if not os.path.exists(caminho):
+        return []
+    # Importado aqui: os termos de cada aspecto vivem na análise
+    from processar_dados import ASPECTOS
+
+    amostras, vistos = [], set()
+    with IndiceReviews(caminho) as indice:
+        for aspecto, termos in ASPECTOS.items():
+            for recomendado in (True, False):
+                for exemplo in indice.exemplos(termos, por_aspecto, appid=appid, recomendado=recomendado):
+                    if exemplo['id'] in vistos:
+                        continue
+                    vistos.add(exemplo['id'])
+                    amostras.append({
+                        "text": exemplo['trecho'],
+                        "recommended": exemplo['recomendado'],
+                        "source": f"Steam / {aspecto}",
+                        "aspect": aspecto
+                    })
+    print(f"✓ {len(amostras)} amostras de reviews do índice de busca")
+    return amostras
+
+
+def publicar_consolidado(consolidated):
     """
-    Consolida todos os dados de todas as plataformas em um único JSON
+    Publica o consolidado para o dashboard: manifesto minificado com os dados
+    exibidos de imediato e uma seção (shard com hash) para cada bloco pesado,
+    sem repetir em `platforms.steam` o que já está no nível de cima.
+    """
+    plataformas = dict(consolidated['platforms'])
+    plataformas['steam'] = {
+        chave: valor for chave, valor in plataformas['steam'].items() if chave not in CAMPOS_REPETIDOS_STEAM
+    }
+    return publicar(
+        {'game': consolidated['game'], 'summary': consolidated['summary'], 'highlights': consolidated['highlights']},
+        {
+            'platforms': plataformas,
+            'key_topics': consolidated['key_topics'],
+            'aspect_ratings': consolidated['aspect_ratings'],
+            'sentiment': consolidated['sentiment'],
+            'discovered_topics': consolidated['discovered_topics'],
+            'ngrams': consolidated['ngrams'],
+            'cooccurrence': consolidated['cooccurrence'],
+            'trends': consolidated['trends'],
+            'review_samples': consolidated['review_samples'],
+        }
+    )
+
+
+def consolidar_dados(online=False, urls=None, diretorio_cache=DIRETORIO_CACHE_PLATAFORMAS, timeout=10.0):
+    """
+    Consolida todos os dados de todas as plataformas em um único JSON.
+    Com `online`, consulta as plataformas ao mesmo tempo; sem isso (ou quando
+    uma falha), usa o último snapshot coletado ou os dados conhecidos.
     """
     print("Coletando dados de múltiplas plataformas...")
     
@@ -187,21 +307,25 @@ def consolidar_dados():
         steam_data = {"plataforma": "Steam", "estatisticas": {"totalReviews": 0}}
         print("⚠ Dados da Steam não encontrados")
     
-    # Coletar dados de outras plataformas
-    metacritic = get_metacritic_data()
-    print(f"✓ Metacritic: {metacritic['total_critic_reviews']} críticas + {metacritic['total_user_reviews']} reviews de usuários")
+    # Coletar dados de outras plataformas (em paralelo, com fallback por fonte)
+    resultados = coletar_fontes(fontes_plataformas(urls, timeout), HEADERS, diretorio_cache, online)
+    for nome, resultado in resultados.items():
+        if resultado['erro']:
+            print(f"⚠ {nome}: {resultado['erro']} (usando dados de origem '{resultado['status']}')")
+    metacritic = resultados['metacritic']['dados']
+    print(f"✓ Metacritic: {metacritic['total_critic_reviews']} críticas + {metacritic['total_user_reviews']} reviews de usuários [{resultados['metacritic']['status']}]")
     
-    xbox = get_xbox_store_data()
-    print(f"✓ Xbox: {xbox['total_ratings']} avaliações")
+    xbox = resultados['xbox']['dados']
+    print(f"✓ Xbox: {xbox['total_ratings']} avaliações [{resultados['xbox']['status']}]")
     
-    playstation = get_playstation_store_data()
-    print(f"✓ PlayStation: {playstation['total_ratings']} avaliações")
+    playstation = resultados['playstation']['dados']
+    print(f"✓ PlayStation: {playstation['total_ratings']} avaliações [{resultados['playstation']['status']}]")
     
-    nintendo = get_nintendo_eshop_data()
-    print(f"✓ Nintendo Switch: {nintendo['total_ratings']} avaliações")
+    nintendo = resultados['nintendo']['dados']
+    print(f"✓ Nintendo Switch: {nintendo['total_ratings']} avaliações [{resultados['nintendo']['status']}]")
     
-    epic = get_epic_store_data()
-    print(f"✓ Epic Games Store: {epic['total_ratings']} avaliações")
+    epic = resultados['epic']['dados']
+    print(f"✓ Epic Games Store: {epic['total_ratings']} avaliações [{resultados['epic']['status']}]")
     
     # Calcular totais consolidados
     total_reviews = (
@@ -220,7 +344,8 @@ def consolidar_dados():
         (xbox['rating'] * 20, xbox['total_ratings']),
         (playstation['rating'] * 20, playstation['total_ratings']),
         (nintendo['rating'] * 20, nintendo['total_ratings']),
-        (epic['recommended_percent'], epic['total_ratings'])
+        # Como nas outras lojas, pela nota: `recommended_percent` não é atualizado pela coleta
+        (epic['rating'] * 20, epic['total_ratings'])
     ]
     
     avg_rating = sum(r * w for r, w in ratings_weighted) / sum(w for _, w in ratings_weighted)
@@ -238,7 +363,7 @@ def consolidar_dados():
             "total_reviews": total_reviews,
             "average_rating": round(avg_rating, 1),
             "platforms_count": 6,
-            "overall_sentiment": "Overwhelmingly Positive"
+            "overall_sentiment": rotulo_geral(avg_rating, total_reviews)
         },
         "platforms": {
             "steam": steam_data,
@@ -248,10 +373,18 @@ def consolidar_dados():
             "nintendo": nintendo,
             "epic": epic
         },
+        "sources": {
+            nome: {chave: resultado[chave] for chave in ('status', 'obtido_em', 'erro')}
+            for nome, resultado in resultados.items()
+        },
         "key_topics": steam_data.get('concepts', []),
         "aspect_ratings": steam_data.get('opinions', {}),
+        "sentiment": steam_data.get('sentimento', {}),
+        "discovered_topics": steam_data.get('topicos', []),
         "ngrams": steam_data.get('ngramas', {}),
         "cooccurrence": steam_data.get('coocorrencia', []),
+        "trends": steam_data.get('tendencias', {}),
+        "review_samples": amostras_reviews(),
         "highlights": {
             "positive": [
                 "Experiência de áudio revolucionária",
@@ -271,6 +404,7 @@ def consolidar_dados():
     # Salvar dados consolidados
     with open('dados_consolidados.json', 'w', encoding='utf-8') as f:
         json.dump(consolidated, f, ensure_ascii=False, indent=2)
+    publicar_consolidado(consolidated)
     
     print(f"\n{'='*50}")
     print(f"RESUMO CONSOLIDADO")
@@ -284,4 +418,18 @@ def consolidar_dados():
 
 
 if __name__ == '__main__':
-    dados = consolidar_dados()
+    parser = argparse.ArgumentParser(description='Consolida os dados de todas as plataformas')
+    parser.add_argument('--online', action='store_true',
+                        help='Consulta as plataformas (requisições condicionais com ETag, fallback no último snapshot)')
+    parser.add_argument('--url', action='append', default=[], metavar='PLATAFORMA=URL',
+                        help=f"Substitui a URL de uma plataforma ({', '.join(URLS_PLATAFORMAS)})")
+    parser.add_argument('--timeout', type=float, default=10.0, help='Timeout de cada plataforma, em segundos')
+    parser.add_argument('--cache-plataformas', default=DIRETORIO_CACHE_PLATAFORMAS,
+                        help=f'Diretório dos snapshots (padrão: {DIRETORIO_CACHE_PLATAFORMAS})')
+    args = parser.parse_args()
+
+    urls = dict(item.split('=', 1) for item in args.url)
+    desconhecidas = set(urls) - set(URLS_PLATAFORMAS)
+    if desconhecidas:
+        parser.error(f"plataformas desconhecidas: {', '.join(sorted(desconhecidas))}")
+    dados = consolidar_dados(args.online, urls, args.cache_plataformas, args.timeout)
@@ -0,0 +1,310 @@
+import requests
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from instrumentacao import contar, etapa
+from spool_steam import SpoolRespostas, carregar_json
+
+STEAM_BASE_URL = 'https://store.steampowered.com'
+
+
+def montar_parametros(language: str, cursor: str = '*', num_per_page: int = 100, filtro: str = 'all') -> Dict[str, Any]:
+    """Parâmetros da API /appreviews usados em todas as coletas"""
+    return {
+        'json': 1,
+        'filter': filtro,
+        'language': language,
+        # day_range máximo para não filtrar por data
+        'day_range': '9223372036854775807',
+        'review_type': 'all',
+        'purchase_type': 'all',
+        'num_per_page': num_per_page,
+        'cursor': cursor
+    }
+
+
+class LimitadorTaxa:
+    """
+    Token bucket compartilhado entre todas as threads de coleta.
+
+    Cada requisição consome um token; os tokens são repostos a `taxa` por segundo
+    até `capacidade`. Um 429 em qualquer thread pausa todas as threads e reduz a
+    taxa pela metade (recuperada aos poucos a cada resposta bem-sucedida).
+    """
+
+    def __init__(self, taxa: float = 5.0, capacidade: int = 10, taxa_minima: float = 0.5):
+        self.taxa_maxima = taxa
+        self.taxa = taxa
+        self.taxa_minima = taxa_minima
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._pausa_ate = 0.0
+        self._lock = threading.Lock()
+
+    def adquirir(self) -> None:
+        """Bloqueia até haver um token disponível"""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                if agora < self._pausa_ate:
+                    espera = self._pausa_ate - agora
+                else:
+                    self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+                    self._ultimo = agora
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+    def sinalizar_429(self, espera: float) -> None:
+        """Pausa global após um 429 e reduz a taxa (backoff multiplicativo)"""
+        with self._lock:
+            self._pausa_ate = max(self._pausa_ate, time.monotonic() + espera)
+            self._ultimo = self._pausa_ate
+            self._tokens = 0.0
+            self.taxa = max(self.taxa_minima, self.taxa / 2)
+
+    def sinalizar_sucesso(self) -> None:
+        """Recupera a taxa gradualmente (aumento aditivo)"""
+        with self._lock:
+            if self.taxa < self.taxa_maxima:
+                self.taxa = min(self.taxa_maxima, self.taxa + 0.1 * self.taxa_maxima)
+
+
+class EstatisticasColeta:
+    """Contadores da coleta (thread-safe)"""
+
+    def __init__(self):
+        self.requisicoes = 0
+        self.tentativas_extras = 0
+        self.respostas_429 = 0
+        self.reviews = 0
+        self.bytes_baixados = 0
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def registrar(self, **incrementos: int) -> None:
+        with self._lock:
+            for campo, valor in incrementos.items():
+                setattr(self, campo, getattr(self, campo) + valor)
+        # Também entra nos contadores do relatório de execução
+        contar(**incrementos)
+
+    @property
+    def duracao(self) -> float:
+        return (self.fim or time.perf_counter()) - self.inicio
+
+    @property
+    def reviews_por_segundo(self) -> float:
+        return self.reviews / self.duracao if self.duracao > 0 else 0.0
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            'requisicoes': self.requisicoes,
+            'tentativas_extras': self.tentativas_extras,
+            'respostas_429': self.respostas_429,
+            'reviews': self.reviews,
+            'bytes_baixados': self.bytes_baixados,
+            'duracao_s': round(self.duracao, 3),
+            'reviews_por_segundo': round(self.reviews_por_segundo, 1)
+        }
+
+
+class ColetorSteam:
+    """
+    Coletor concorrente de reviews da Steam.
+
+    Cada fluxo (appid, idioma) é paginado sequencialmente pelo cursor, mas todos
+    os fluxos rodam ao mesmo tempo em um pool de threads que compartilha uma
+    única `requests.Session` (conexões keep-alive) e um único LimitadorTaxa.
+
+    Com `spool`, o corpo bruto de cada página é gravado no SpoolRespostas
+    para reprodução offline.
+
+    Após `coletar`, `incompletos` tem os fluxos interrompidos por falha de
+    página: as reviews deles são parciais e não podem avançar o estado da
+    coleta incremental.
+
+    Respostas 429 não gastam as `max_retries` tentativas (reservadas a erros e
+    falhas de conexão): o limitador já pausa todas as threads, e cada página
+    tem um orçamento próprio de `max_esperas_429` pausas.
+    """
+
+    def __init__(self, base_url: str = STEAM_BASE_URL, max_workers: int = 4,
+                 limitador: Optional[LimitadorTaxa] = None, max_retries: int = 5,
+                 timeout: float = 15, espera_429: float = 5.0, num_per_page: int = 100,
+                 spool: Optional[SpoolRespostas] = None, max_esperas_429: int = 10):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.limitador = limitador or LimitadorTaxa()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.espera_429 = espera_429
+        self.max_esperas_429 = max_esperas_429
+        self.num_per_page = num_per_page
+        self.spool = spool
+        self.estatisticas = EstatisticasColeta()
+        self.incompletos: Set[Tuple[int, str]] = set()
+
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adaptador)
+        self.session.mount('https://', adaptador)
+
+    def buscar_pagina(self, appid: int, language: str, cursor: str = '*', filtro: str = 'all') -> Optional[Dict[str, Any]]:
+        """Obtém uma página de reviews já decodificada"""
+        bruto = self.buscar_pagina_bruta(appid, language, cursor, filtro)
+        return carregar_json(bruto) if bruto is not None else None
+
+    def buscar_pagina_bruta(self, appid: int, language: str, cursor: str = '*', filtro: str = 'all') -> Optional[bytes]:
+        """Corpo bruto de uma página de reviews, com retry e respeito ao limitador global"""
+        url = f"{self.base_url}/appreviews/{appid}"
+        params = montar_parametros(language, cursor, self.num_per_page, filtro)
+
+        falhas = esperas_429 = 0
+        while falhas < self.max_retries:
+            if falhas or esperas_429:
+                self.estatisticas.registrar(tentativas_extras=1)
+            self.limitador.adquirir()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                self.estatisticas.registrar(requisicoes=1, bytes_baixados=len(response.content))
+
+                if response.status_code == 200:
+                    self.limitador.sinalizar_sucesso()
+                    return response.content
+
+                elif response.status_code == 429:
+                    self.estatisticas.registrar(respostas_429=1)
+                    if esperas_429 >= self.max_esperas_429:
+                        print(f"Rate limit (429) persistiu após {self.max_esperas_429} pausas.")
+                        return None
+                    retry_after = response.headers.get('Retry-After')
+                    wait_time = (float(retry_after) if retry_after and retry_after.isdigit()
+                                 else 2 ** min(esperas_429, 5) * self.espera_429)
+                    esperas_429 += 1
+                    print(f"Rate limit (429) atingido. Pausando todas as coletas por {wait_time} segundos...")
+                    self.limitador.sinalizar_429(wait_time)
+                    continue
+
+                else:
+                    falhas += 1
+                    print(f"Erro ao acessar a API (Status {response.status_code}) na tentativa {falhas}/{self.max_retries}.")
+
+            except requests.exceptions.RequestException as e:
+                falhas += 1
+                print(f"Erro de conexão na tentativa {falhas}/{self.max_retries}: {e}")
+
+        print(f"Falha ao obter reviews após {self.max_retries} tentativas.")
+        return None
+
+    def coletar_fluxo(self, appid: int, language: str,
+                      desde_timestamp: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Pagina todas as reviews de um (appid, idioma) até o fim do cursor.
+        Retorna (reviews, completo); `completo` é False se uma página falhou
+        depois de todas as tentativas e o fluxo parou antes do fim.
+
+        Com `desde_timestamp` (modo incremental), usa filter=recent (mais novas
+        primeiro) e para na primeira página que alcança reviews já conhecidas.
+        Reviews com o mesmo timestamp da última coleta são mantidas; a mesclagem
+        por recommendationid descarta as repetidas.
+        """
+        cursor = '*'
+        filtro = 'all' if desde_timestamp is None else 'recent'
+        reviews: List[Dict[str, Any]] = []
+        completo = False
+        # Coleta incremental anexa ao spool; a completa o reescreve se chegar ao fim
+        saida = self.spool.fluxo(appid, language, anexar=desde_timestamp is not None) if self.spool else nullcontext()
+
+        with saida:
+            while True:
+                bruto = self.buscar_pagina_bruta(appid, language, cursor, filtro)
+                reviews_data = carregar_json(bruto) if bruto is not None else None
+
+                if not reviews_data or 'reviews' not in reviews_data:
+                    print(f"Não foi possível coletar mais reviews em {language} (App ID: {appid}); "
+                          f"fluxo incompleto.")
+                    break
+
+                new_reviews = reviews_data['reviews']
+                if not new_reviews:
+                    completo = True
+                    break
+                if self.spool:
+                    saida.gravar(cursor, filtro, bruto)
+
+                alcancou_conhecidas = False
+                if desde_timestamp is not None:
+                    novas = [r for r in new_reviews if r['timestamp_created'] >= desde_timestamp]
+                    alcancou_conhecidas = len(novas) < len(new_reviews)
+                    new_reviews = novas
+
+                reviews.extend(new_reviews)
+                self.estatisticas.registrar(reviews=len(new_reviews))
+
+                if alcancou_conhecidas:
+                    completo = True
+                    break
+
+                # A API da Steam pode retornar o mesmo cursor na última página
+                new_cursor = reviews_data.get('cursor')
+                if new_cursor == cursor or not new_cursor:
+                    completo = True
+                    break
+                cursor = new_cursor
+
+            if self.spool and completo:
+                saida.concluir()
+
+        print(f"Fim da coleta para {language} (App ID: {appid}). Total de reviews: {len(reviews)}")
+        return reviews, completo
+
+    def coletar(self, appids: List[int], languages: List[str],
+                desde: Optional[Dict[Tuple[int, str], int]] = None) -> Dict[Tuple[int, str], List[Dict[str, Any]]]:
+        """
+        Coleta todos os pares (appid, idioma) em paralelo.
+        `desde` mapeia (appid, idioma) ao último timestamp já coletado; os pares
+        presentes são coletados em modo incremental.
+        Retorna {(appid, idioma): [reviews em JSON bruto]}; os pares que não
+        chegaram ao fim ficam em `self.incompletos`.
+        """
+        desde = desde or {}
+        self.estatisticas = EstatisticasColeta()
+        self.incompletos = set()
+        fluxos = [(appid, language) for appid in appids for language in languages]
+        resultados: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+
+        with etapa('coleta_steam') as medicao, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futuros = {
+                executor.submit(self.coletar_fluxo, appid, language, desde.get((appid, language))): (appid, language)
+                for appid, language in fluxos
+            }
+            for futuro in as_completed(futuros):
+                resultados[futuros[futuro]], completo = futuro.result()
+                if not completo:
+                    self.incompletos.add(futuros[futuro])
+            medicao.itens = self.estatisticas.reviews
+
+        self.estatisticas.fim = time.perf_counter()
+        resumo = self.estatisticas.resumo()
+        print(f"Coletadas {resumo['reviews']} reviews em {resumo['duracao_s']}s "
+              f"({resumo['reviews_por_segundo']} reviews/s, {resumo['requisicoes']} requisições, "
+              f"{resumo['respostas_429']} respostas 429)")
+        if self.incompletos:
+            print(f"Fluxos incompletos (estado incremental mantido): "
+                  f"{', '.join(f'{a}/{l}' for a, l in sorted(self.incompletos))}")
+
+        # Mantém a ordem de entrada (appid, idioma) independente da ordem de término
+        return {fluxo: resultados[fluxo] for fluxo in fluxos}
+
+    def fechar(self) -> None:
+        self.session.close()
@@ -0,0 +1,198 @@
+import math
+
+import numpy as np
+
+from tokenizador import VOCABULARIO
+
+# Constante de mistura (razão áurea em 64 bits) para combinar códigos de palavras
+MISTURA = 0x9E3779B97F4A7C15
+
+
+def dimensionar_sketch(erro_relativo=1e-4, confianca=0.99):
+    """
+    Largura e profundidade do Count-Min para que, com a `confianca` dada, cada
+    estimativa exceda a contagem real em no máximo `erro_relativo` × total.
+    A largura é arredondada para potência de 2.
+    """
+    largura = 1 << math.ceil(math.log2(math.e / erro_relativo))
+    profundidade = math.ceil(math.log(1 / (1 - confianca)))
+    return largura, profundidade
+
+
+class ContadorNgramsAproximado:
+    """
+    Contagem aproximada dos N-Grams mais frequentes com memória limitada.
+
+    Recebe os tokens como ids do vocabulário (tokenizador.LoteTokens). Cada
+    palavra vira um código inteiro determinístico (crc32) e cada N-Gram uma
+    chave de 64 bits combinando esses códigos, em vez de uma string unida. As
+    chaves vão para um sketch Count-Min (`profundidade` × `largura` contadores
+    uint32), atualizado em lote com numpy, e um conjunto de até `candidatos`
+    chaves com maior estimativa é mantido para responder ao top-k.
+
+    A memória fica em largura × profundidade × 4 bytes + candidatos, independente
+    do tamanho do corpus. Como os códigos não dependem da ordem de leitura, dois
+    contadores com os mesmos parâmetros podem ser mesclados.
+    """
+
+    def __init__(self, n=2, largura=1 << 16, profundidade=4, candidatos=1000, tamanho_lote=50_000, semente=0,
+                 vocabulario=VOCABULARIO):
+        if largura & (largura - 1):
+            raise ValueError("largura deve ser potência de 2")
+        self.n = n
+        self.largura = largura
+        self.profundidade = profundidade
+        self.max_candidatos = candidatos
+        self.tamanho_lote = tamanho_lote
+        self.semente = semente
+        self.vocabulario = vocabulario
+        self.total = 0
+
+        self.tabela = np.zeros((profundidade, largura), dtype=np.uint32)
+        rng = np.random.default_rng(semente)
+        # Multiplicadores ímpares para hashing multiply-shift por linha
+        self._multiplicadores = rng.integers(1, 2**63, size=profundidade, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._deslocamento = np.uint64(64 - int(math.log2(largura)))
+
+        # Lote pendente: arrays de ids e o fim de cada review (posição acumulada)
+        self._ids_lote = []
+        self._fins = []
+        self._pendentes = 0
+        self.candidatos = {}  # chave -> (ordem de entrada, texto)
+        self._ordem = 0
+
+    @property
+    def erro_maximo(self):
+        """Superestimativa esperada no pior caso (e × total / largura)"""
+        return math.e * self.total / self.largura
+
+    def __getstate__(self):
+        # Os ids só valem no processo atual: o lote pendente é aplicado antes de
+        # serializar e o vocabulário não é copiado
+        self._descarregar()
+        estado = self.__dict__.copy()
+        del estado['vocabulario']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.vocabulario = VOCABULARIO
+
+    def adicionar(self, palavras):
+        """Registra as palavras (já limpas) de uma review"""
+        self.adicionar_ids(self.vocabulario.ids(palavras))
+
+    def adicionar_ids(self, ids):
+        """Registra os ids de tokens de uma review; os N-Grams são contados em lote"""
+        if len(ids) < self.n:
+            return
+        self._ids_lote.append(ids)
+        self._pendentes += len(ids)
+        self._fins.append(np.array([self._pendentes]))
+        if self._pendentes >= self.tamanho_lote:
+            self._descarregar()
+
+    def adicionar_lote(self, lote):
+        """Registra todas as reviews de um tokenizador.LoteTokens"""
+        if len(lote) == 0:
+            return
+        self._ids_lote.append(lote.ids)
+        self._fins.append(lote.limites[1:] + self._pendentes)
+        self._pendentes += len(lote.ids)
+        if self._pendentes >= self.tamanho_lote:
+            self._descarregar()
+
+    def _hashes(self, chaves):
+        """Índice de cada chave em cada linha da tabela (profundidade × len(chaves))"""
+        return (chaves[None, :] * self._multiplicadores[:, None]) >> self._deslocamento
+
+    def _estimar(self, chaves):
+        indices = self._hashes(chaves)
+        return self.tabela[np.arange(self.profundidade)[:, None], indices].min(axis=0)
+
+    def _chaves_do_lote(self, ids):
+        """Chaves de 64 bits de todos os N-Grams do lote e a posição inicial de cada um"""
+        n = self.n
+        codigos = self.vocabulario.codigos()[ids]
+        m = len(codigos) - n + 1
+        if m <= 0:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        chaves = np.zeros(m, dtype=np.uint64)
+        for k in range(n):
+            chaves = (chaves ^ codigos[k:k + m]) * np.uint64(MISTURA)
+
+        # Descarta janelas que atravessam a fronteira entre duas reviews
+        fins = np.concatenate(self._fins)
+        review = np.repeat(np.arange(len(fins)), np.diff(fins, prepend=0))
+        validas = review[:m] == review[n - 1:]
+        posicoes = np.nonzero(validas)[0]
+        return chaves[posicoes], posicoes
+
+    def _descarregar(self):
+        """Aplica o lote pendente ao sketch e atualiza os candidatos"""
+        if not self._fins:
+            return
+        ids = np.concatenate(self._ids_lote)
+        chaves, posicoes = self._chaves_do_lote(ids)
+        for linha, indices in enumerate(self._hashes(chaves)):
+            self.tabela[linha] += np.bincount(indices.astype(np.int64), minlength=self.largura).astype(np.uint32)
+        self.total += len(chaves)
+
+        # Só N-Grams novos cuja estimativa alcança o pior candidato atual entram
+        unicas, primeira = np.unique(chaves, return_index=True)
+        estimativas = self._estimar(unicas)
+        if len(self.candidatos) >= self.max_candidatos:
+            atuais = self._estimar(np.array(list(self.candidatos), dtype=np.uint64))
+            selecionadas = np.nonzero(estimativas >= atuais.min())[0]
+        else:
+            selecionadas = np.arange(len(unicas))
+        if len(selecionadas) > self.max_candidatos:
+            selecionadas = selecionadas[np.argsort(-estimativas[selecionadas], kind='stable')[:self.max_candidatos]]
+        selecionadas = selecionadas[np.argsort(primeira[selecionadas])]
+
+        n = self.n
+        palavras = self.vocabulario.palavras
+        for indice in selecionadas:
+            chave = int(unicas[indice])
+            if chave not in self.candidatos:
+                inicio = int(posicoes[primeira[indice]])
+                self._ordem += 1
+                self.candidatos[chave] = (self._ordem, ' '.join(palavras[t] for t in ids[inicio:inicio + n]))
+
+        self._ids_lote = []
+        self._fins = []
+        self._pendentes = 0
+        self._podar()
+
+    def _ranking(self):
+        """Candidatos ordenados por estimativa decrescente; empates pela ordem de entrada"""
+        chaves = list(self.candidatos)
+        if not chaves:
+            return []
+        estimativas = self._estimar(np.array(chaves, dtype=np.uint64))
+        return sorted(zip(chaves, estimativas.tolist()), key=lambda x: (-x[1], self.candidatos[x[0]][0]))
+
+    def _podar(self):
+        if len(self.candidatos) > self.max_candidatos:
+            mantidos = self._ranking()[:self.max_candidatos]
+            self.candidatos = {chave: self.candidatos[chave] for chave, _ in mantidos}
+
+    def mesclar(self, outro):
+        """Soma o sketch e os candidatos de outro contador com os mesmos parâmetros"""
+        if (outro.n, outro.largura, outro.profundidade, outro.semente) != (self.n, self.largura, self.profundidade, self.semente):
+            raise ValueError("Só é possível mesclar contadores com os mesmos parâmetros")
+        self._descarregar()
+        outro._descarregar()
+        self.tabela += outro.tabela
+        self.total += outro.total
+        for chave, (_, texto) in sorted(outro.candidatos.items(), key=lambda x: x[1][0]):
+            if chave not in self.candidatos:
+                self._ordem += 1
+                self.candidatos[chave] = (self._ordem, texto)
+        self._podar()
+        return self
+
+    def most_common(self, k):
+        """Mesma interface de Counter.most_common"""
+        self._descarregar()
+        return [(self.candidatos[chave][1], int(estimativa)) for chave, estimativa in self._ranking()[:k]]
@@ -0,0 +1,410 @@
+"""
+Detecção de reviews quase duplicadas: textos copiados e colados ou levemente
+editados. A deduplicação exata por 'ID da Review' não pega esses casos, e
+eles inflam os n-grams e as co-ocorrências.
+
+Cada review é vista como o conjunto dos seus shingles (sequências de
+TAMANHO_SHINGLE palavras) e resumida por uma assinatura MinHash de
+`n_permutacoes` valores. A fração de posições iguais em duas assinaturas
+estima a similaridade de Jaccard dos dois conjuntos. O LSH divide a
+assinatura em bandas, e duas reviews só são comparadas se coincidirem em
+alguma banda inteira. O custo fica perto de linear no número de reviews, sem
+comparar todos os pares.
+
+    bandas       cada banda vira uma chave de 64 bits; o índice guarda, por
+                 chave, a primeira review que a produziu (execuções ordenadas
+                 mescladas aos pares, como em uma LSM tree)
+    verificação  o candidato só vira duplicata se a similaridade estimada pela
+                 assinatura inteira atingir o `limiar`
+    grupos       componentes conexos do grafo de duplicatas
+
+A inserção é incremental: `adicionar` recebe blocos a qualquer momento, e
+cada review nova é comparada só com as anteriores. `salvar`/`carregar` mantêm
+o índice entre execuções (duplicatas.npz). A coleta atualiza esse índice com
+as reviews novas, como faz com o índice de busca.
+
+Uso:
+    python duplicatas.py --indexar
+    python duplicatas.py --grupos 5
+"""
+import argparse
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from armazenamento import APPID_PADRAO, diretorio_jogo, existe_armazenamento, ler_em_blocos
+from contagem_aproximada import MISTURA
+from instrumentacao import etapa
+from tokenizador import Vocabulario, tokenizar_lote
+
+CAMINHO_DUPLICATAS = 'duplicatas.npz'
+
+N_PERMUTACOES = 128
+TAMANHO_SHINGLE = 3
+# Similaridade de Jaccard (dos shingles) a partir da qual duas reviews são duplicatas
+LIMIAR = 0.8
+# Reviews curtas ("good game", "10/10") se repetem sem serem cópias e ficam de fora
+MIN_PALAVRAS = 5
+
+# Tratamento das duplicatas nas análises de processar_dados.py
+MODOS = ('excluir', 'ponderar')
+
+# Peso do falso negativo na escolha das bandas: um falso positivo do LSH só custa
+# uma verificação, descartada pela assinatura inteira
+PESO_FALSO_NEGATIVO = 0.9
+
+_MISTURA = np.uint64(MISTURA)
+
+
+def parametros_lsh(limiar: float, n_permutacoes: int,
+                   peso_falso_negativo: float = PESO_FALSO_NEGATIVO) -> Tuple[int, int]:
+    """
+    (bandas, linhas por banda), com bandas × linhas ≤ n_permutacoes, que
+    minimizam a soma ponderada das áreas de falso positivo (similaridade
+    abaixo do limiar) e de falso negativo da curva 1 - (1 - s^linhas)^bandas.
+    """
+    s = np.linspace(0, 1, 1001)
+    melhor, menor_erro = (1, n_permutacoes), np.inf
+    for linhas in range(1, n_permutacoes + 1):
+        bandas = n_permutacoes // linhas
+        probabilidade = 1 - (1 - s ** linhas) ** bandas
+        erro = np.where(s < limiar, (1 - peso_falso_negativo) * probabilidade,
+                        peso_falso_negativo * (1 - probabilidade)).mean()
+        if erro < menor_erro:
+            melhor, menor_erro = (bandas, linhas), erro
+    return melhor
+
+
+class IndiceBandas:
+    """
+    Chave de banda → primeira review que a produziu.
+
+    As chaves ficam em execuções ordenadas; cada bloco entra como uma execução
+    nova, e as duas últimas são mescladas enquanto a penúltima não for bem
+    maior. Sobram O(log n) execuções, cada uma consultada com searchsorted.
+    """
+
+    def __init__(self):
+        self.execucoes: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return sum(len(chaves) for chaves, _ in self.execucoes)
+
+    def buscar(self, chaves: np.ndarray) -> np.ndarray:
+        """Dona de cada chave (-1 para chaves ainda não vistas)"""
+        donas = np.full(len(chaves), -1, dtype=np.int64)
+        for ordenadas, donas_execucao in self.execucoes:
+            posicoes = np.minimum(np.searchsorted(ordenadas, chaves), len(ordenadas) - 1)
+            achadas = ordenadas[posicoes] == chaves
+            donas[achadas] = donas_execucao[posicoes[achadas]]
+        return donas
+
+    def adicionar(self, chaves: np.ndarray, donas: np.ndarray) -> None:
+        """Registra chaves novas (ausentes do índice e sem repetição)"""
+        if not len(chaves):
+            return
+        ordem = np.argsort(chaves)
+        self.execucoes.append((chaves[ordem], donas[ordem]))
+        while len(self.execucoes) > 1 and len(self.execucoes[-2][0]) <= 2 * len(self.execucoes[-1][0]):
+            (chaves_a, donas_a), (chaves_b, donas_b) = self.execucoes[-2:]
+            chaves = np.concatenate([chaves_a, chaves_b])
+            ordem = np.argsort(chaves, kind='stable')
+            self.execucoes[-2:] = [(chaves[ordem], np.concatenate([donas_a, donas_b])[ordem])]
+
+    def compactar(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Todas as chaves em uma única execução"""
+        while len(self.execucoes) > 1:
+            (chaves_a, donas_a), (chaves_b, donas_b) = self.execucoes[-2:]
+            chaves = np.concatenate([chaves_a, chaves_b])
+            ordem = np.argsort(chaves, kind='stable')
+            self.execucoes[-2:] = [(chaves[ordem], np.concatenate([donas_a, donas_b])[ordem])]
+        if not self.execucoes:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        return self.execucoes[0]
+
+
+class DetectorDuplicatas:
+    """
+    MinHash + LSH sobre os shingles de palavras das reviews.
+
+    As reviews recebem ids sequenciais na ordem de inserção. Para a verificação
+    dos candidatos, cada assinatura é guardada com os 16 bits baixos de cada
+    valor (b-bit MinHash): a chance de dois valores diferentes coincidirem é
+    1/65536, desprezível na estimativa, e a memória cai à metade.
+    """
+
+    def __init__(self, limiar: float = LIMIAR, n_permutacoes: int = N_PERMUTACOES,
+                 tamanho_shingle: int = TAMANHO_SHINGLE, min_palavras: int = MIN_PALAVRAS, semente: int = 0):
+        if not 0 < limiar <= 1:
+            raise ValueError(f"Limiar de similaridade fora de (0, 1]: {limiar}")
+        self.limiar = limiar
+        self.n_permutacoes = n_permutacoes
+        self.tamanho_shingle = tamanho_shingle
+        self.min_palavras = max(min_palavras, tamanho_shingle)
+        self.semente = semente
+        self.bandas, self.linhas = parametros_lsh(limiar, n_permutacoes)
+        rng = np.random.default_rng(semente)
+        # Permutações por hash multiply-shift: 32 bits altos de (a·x + b) mod 2^64, com a ímpar
+        self._a = rng.integers(0, 2 ** 64, n_permutacoes, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 64, n_permutacoes, dtype=np.uint64, endpoint=False)
+        self.vocabulario = Vocabulario()
+        self.indice = IndiceBandas()
+        self.total = 0
+        self.ids: List[str] = []
+        self._conhecidos: set = set()
+        self._assinaturas = np.zeros((0, n_permutacoes), dtype=np.uint16)
+        # Pares (review, review anterior parecida) já verificados
+        self._arestas: List[np.ndarray] = []
+
+    # --- Assinaturas ---
+
+    def assinar(self, textos: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assinaturas MinHash (review × permutação, uint32) e a máscara das
+        reviews com palavras suficientes para entrar na comparação
+        """
+        k = self.tamanho_shingle
+        lote = tokenizar_lote(textos, self.vocabulario, frozenset())
+        comprimentos = np.diff(lote.limites)
+        validas = comprimentos >= self.min_palavras
+        assinaturas = np.zeros((len(lote), self.n_permutacoes), dtype=np.uint32)
+        m = len(lote.ids) - k + 1
+        if m <= 0 or not validas.any():
+            return assinaturas, validas
+
+        # Shingle = hash de k palavras consecutivas da mesma review
+        codigos = self.vocabulario.codigos()[lote.ids]
+        chaves = np.zeros(m, dtype=np.uint64)
+        for j in range(k):
+            chaves = (chaves ^ codigos[j:j + m]) * _MISTURA
+        review = np.repeat(np.arange(len(lote)), comprimentos)
+        posicoes = np.flatnonzero((review[:m] == review[k - 1:]) & validas[review[:m]])
+        shingles, donas = chaves[posicoes], review[posicoes]
+        inicios = np.flatnonzero(np.r_[True, donas[1:] != donas[:-1]])
+        linhas = donas[inicios]
+        for j in range(self.n_permutacoes):
+            valores = (shingles * self._a[j] + self._b[j]) >> np.uint64(32)
+            assinaturas[linhas, j] = np.minimum.reduceat(valores, inicios)
+        return assinaturas, validas
+
+    def _chaves_bandas(self, assinaturas: np.ndarray) -> np.ndarray:
+        """Chave de 64 bits de cada banda (review × banda); o número da banda entra no hash"""
+        usadas = assinaturas[:, :self.bandas * self.linhas].reshape(len(assinaturas), self.bandas, self.linhas)
+        chaves = np.broadcast_to(np.arange(self.bandas, dtype=np.uint64), usadas.shape[:2]).copy()
+        for r in range(self.linhas):
+            chaves = (chaves ^ usadas[:, :, r].astype(np.uint64)) * _MISTURA
+        return chaves
+
+    def similaridade(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Jaccard estimada entre as reviews `a[i]` e `b[i]` (ids)"""
+        return (self._assinaturas[a] == self._assinaturas[b]).mean(axis=1)
+
+    # --- Inserção ---
+
+    def _guardar(self, assinaturas: np.ndarray) -> None:
+        necessario = self.total + len(assinaturas)
+        if necessario > len(self._assinaturas):
+            maiores = np.zeros((max(necessario, 2 * len(self._assinaturas)), self.n_permutacoes), dtype=np.uint16)
+            maiores[:self.total] = self._assinaturas[:self.total]
+            self._assinaturas = maiores
+        self._assinaturas[self.total:necessario] = assinaturas
+
+    def conhecidos(self, ids: Iterable[Any]) -> np.ndarray:
+        """Máscara dos ids de review que já estão no índice"""
+        return np.array([str(i) in self._conhecidos for i in ids], dtype=bool)
+
+    def adicionar(self, textos: List[Any], ids: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Insere um bloco de reviews. Devolve, para cada uma, o id da primeira
+        review anterior (deste ou de outros blocos) de que ela é quase
+        duplicata, ou -1. `ids` ('ID da Review') só é guardado para consulta.
+        """
+        n = len(textos)
+        inicio = self.total
+        with etapa('duplicatas', itens=n):
+            assinaturas, validas = self.assinar(textos)
+            self._guardar(assinaturas.astype(np.uint16))
+            self.total += n
+            novos_ids = [str(i) for i in ids] if ids is not None else [''] * n
+            self.ids.extend(novos_ids)
+            if ids is not None:
+                self._conhecidos.update(novos_ids)
+
+            anteriores = np.full(n, -1, dtype=np.int64)
+            linhas = np.flatnonzero(validas)
+            if not len(linhas):
+                return anteriores
+            chaves = self._chaves_bandas(assinaturas[linhas]).ravel()
+            reviews = np.repeat(linhas + inicio, self.bandas)
+
+            donas = self.indice.buscar(chaves)
+            # Chaves fora do índice: a primeira review do bloco que a produziu vira a dona
+            faltam = np.flatnonzero(donas < 0)
+            unicas, primeiras, inversa = np.unique(chaves[faltam], return_index=True, return_inverse=True)
+            donas[faltam] = reviews[faltam][primeiras][inversa.ravel()]
+            self.indice.adicionar(unicas, reviews[faltam][primeiras])
+
+            # Candidatos únicos (review, dona anterior), codificados em um inteiro
+            candidatos = np.flatnonzero(donas != reviews)
+            pares = np.unique(reviews[candidatos] * self._capacidade() + donas[candidatos])
+            novas, donas = pares // self._capacidade(), pares % self._capacidade()
+            confirmadas = self.similaridade(novas, donas) >= self.limiar
+            novas, donas = novas[confirmadas], donas[confirmadas]
+            self._arestas.append(np.stack([novas, donas], axis=1))
+            # Pares em ordem (review, dona): a primeira ocorrência é a dona mais antiga
+            unicas, primeiras = np.unique(novas, return_index=True)
+            anteriores[unicas - inicio] = donas[primeiras]
+        return anteriores
+
+    def _capacidade(self) -> int:
+        return max(self.total, 1)
+
+    # --- Resultado ---
+
+    def arestas(self) -> np.ndarray:
+        """Pares verificados (review, review anterior parecida)"""
+        if not self._arestas:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.concatenate(self._arestas)
+
+    def duplicadas(self) -> np.ndarray:
+        """Máscara das reviews que repetem (quase) uma review anterior"""
+        mascara = np.zeros(self.total, dtype=bool)
+        mascara[self.arestas()[:, 0]] = True
+        return mascara
+
+    def grupos(self) -> np.ndarray:
+        """Grupo de cada review: componentes conexos do grafo de duplicatas"""
+        arestas = self.arestas()
+        grafo = sparse.csr_matrix((np.ones(len(arestas), dtype=np.int8), (arestas[:, 0], arestas[:, 1])),
+                                  shape=(self.total, self.total))
+        return connected_components(grafo, directed=False)[1]
+
+    def pesos(self) -> np.ndarray:
+        """1 / tamanho do grupo de cada review: cada grupo pesa o mesmo que uma review"""
+        grupos = self.grupos()
+        return 1 / np.bincount(grupos)[grupos]
+
+    def maiores_grupos(self, n: int = 10) -> List[np.ndarray]:
+        """Reviews (ids) dos `n` maiores grupos com duplicatas"""
+        grupos = self.grupos()
+        tamanhos = np.bincount(grupos)
+        maiores = [g for g in np.argsort(-tamanhos, kind='stable')[:n].tolist() if tamanhos[g] > 1]
+        return [np.flatnonzero(grupos == g) for g in maiores]
+
+    def resumo(self) -> Dict[str, Any]:
+        tamanhos = np.bincount(self.grupos()) if self.total else np.zeros(0, dtype=np.int64)
+        return {
+            'reviews': self.total,
+            'duplicadas': int(self.duplicadas().sum()),
+            'grupos': int((tamanhos > 1).sum()),
+            'maiorGrupo': int(tamanhos.max()) if len(tamanhos) else 0,
+            'limiar': self.limiar,
+        }
+
+    # --- Persistência ---
+
+    def salvar(self, caminho: str = CAMINHO_DUPLICATAS) -> None:
+        chaves, donas = self.indice.compactar()
+        temporario = caminho + '.tmp.npz'
+        np.savez(temporario, parametros=np.array([self.limiar, self.n_permutacoes, self.tamanho_shingle,
+                                                  self.min_palavras, self.semente]),
+                 assinaturas=self._assinaturas[:self.total], ids=np.array(self.ids, dtype=str),
+                 arestas=self.arestas(), chaves=chaves, donas=donas)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: str = CAMINHO_DUPLICATAS) -> 'DetectorDuplicatas':
+        """Índice salvo com `salvar`, com os parâmetros com que foi criado"""
+        with np.load(caminho) as arquivo:
+            limiar, n_permutacoes, tamanho_shingle, min_palavras, semente = arquivo['parametros'].tolist()
+            detector = cls(limiar, int(n_permutacoes), int(tamanho_shingle), int(min_palavras), int(semente))
+            detector._assinaturas = arquivo['assinaturas']
+            detector.total = len(detector._assinaturas)
+            detector.ids = arquivo['ids'].tolist()
+            detector._conhecidos = {i for i in detector.ids if i}
+            detector._arestas = [arquivo['arestas']]
+            if len(arquivo['chaves']):
+                detector.indice.execucoes = [(arquivo['chaves'], arquivo['donas'])]
+        return detector
+
+
+def detectar_duplicatas(blocos: Iterable[pd.DataFrame], **opcoes: Any) -> DetectorDuplicatas:
+    """Detector com todas as reviews dos blocos (coluna 'Review')"""
+    detector = DetectorDuplicatas(**opcoes)
+    for bloco in blocos:
+        detector.adicionar(bloco['Review'].tolist())
+    return detector
+
+
+def filtrar_duplicatas(blocos: Iterable[pd.DataFrame], detector: DetectorDuplicatas) -> Iterator[pd.DataFrame]:
+    """Blocos sem as reviews que repetem (quase) uma review anterior; uma passada só"""
+    for bloco in blocos:
+        yield bloco[detector.adicionar(bloco['Review'].tolist()) < 0]
+
+
+def descartar_duplicadas(blocos: Iterable[pd.DataFrame], duplicadas: np.ndarray) -> Iterator[pd.DataFrame]:
+    """Blocos sem as reviews marcadas em `duplicadas` (ver DetectorDuplicatas.duplicadas), na mesma ordem da detecção"""
+    inicio = 0
+    for bloco in blocos:
+        yield bloco[~duplicadas[inicio:inicio + len(bloco)]]
+        inicio += len(bloco)
+
+
+def anexar_pesos(blocos: Iterable[pd.DataFrame], pesos: np.ndarray) -> Iterator[pd.DataFrame]:
+    """Blocos com a coluna 'Peso' (ver DetectorDuplicatas.pesos), na mesma ordem da detecção"""
+    inicio = 0
+    for bloco in blocos:
+        yield bloco.assign(Peso=pesos[inicio:inicio + len(bloco)])
+        inicio += len(bloco)
+
+
+def atualizar_duplicatas(df: pd.DataFrame, caminho: str = CAMINHO_DUPLICATAS) -> None:
+    """Insere as reviews recém-coletadas no índice de duplicatas, se ele já existir"""
+    if not os.path.exists(caminho):
+        return
+    detector = DetectorDuplicatas.carregar(caminho)
+    # Reviews já indexadas (ex.: editadas pelo autor) não entram de novo
+    novos = df[~detector.conhecidos(df['ID da Review'])] if 'ID da Review' in df.columns else df
+    ids = novos['ID da Review'] if 'ID da Review' in novos.columns else None
+    anteriores = detector.adicionar(novos['Review'].tolist(), ids)
+    detector.salvar(caminho)
+    print(f"Índice de duplicatas atualizado ({len(novos)} reviews, "
+          f"{int((anteriores >= 0).sum())} quase duplicatas de reviews anteriores).")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reviews quase duplicadas (MinHash + LSH)')
+    parser.add_argument('--indice', default=CAMINHO_DUPLICATAS, help=f'Arquivo do índice (padrão: {CAMINHO_DUPLICATAS})')
+    parser.add_argument('--indexar', action='store_true', help='Recria o índice a partir de todas as reviews')
+    parser.add_argument('--entrada', help='Diretório Parquet, .csv ou .jsonl (padrão: armazenamento ou CSV)')
+    parser.add_argument('--bloco', type=int, default=50_000, help='Reviews por bloco')
+    parser.add_argument('--appid', type=int, default=APPID_PADRAO,
+                        help=f'Jogo lido do armazenamento Parquet (padrão: {APPID_PADRAO})')
+    parser.add_argument('--limiar', type=float, default=LIMIAR, help=f'Similaridade mínima (padrão: {LIMIAR})')
+    parser.add_argument('--grupos', type=int, default=5, metavar='N', help='Mostra os N maiores grupos')
+    args = parser.parse_args()
+
+    particao = diretorio_jogo(args.appid)
+    entrada = args.entrada or (particao if existe_armazenamento(particao)
+                               else 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+    if args.indexar or not os.path.exists(args.indice):
+        detector = DetectorDuplicatas(args.limiar)
+        for bloco in ler_em_blocos(entrada, args.bloco):
+            ids = bloco['ID da Review'] if 'ID da Review' in bloco.columns else None
+            detector.adicionar(bloco['Review'].tolist(), ids)
+        detector.salvar(args.indice)
+        print(f"Índice de duplicatas salvo em '{args.indice}'")
+    else:
+        detector = DetectorDuplicatas.carregar(args.indice)
+
+    resumo = detector.resumo()
+    print(f"{resumo['reviews']} reviews, {resumo['duplicadas']} quase duplicatas em {resumo['grupos']} grupos "
+          f"(maior: {resumo['maiorGrupo']}; limiar {resumo['limiar']})")
+    for grupo in detector.maiores_grupos(args.grupos):
+        primeira = detector.ids[grupo[0]] or f"#{grupo[0]}"
+        print(f"- {len(grupo)} reviews (primeira: {primeira})")
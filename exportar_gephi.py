@@ -1,75 +1,71 @@
+import argparse
 import pandas as pd
-import json
-import re
-from collections import Counter
-import itertools
 import os
 
-def exportar_para_gephi(caminho_csv_input='The Vale - Shadow of the Crown  - reviews - Sheet1.csv'):
-    print(f"Lendo dados de {caminho_csv_input}...")
-    
-    # Carregar dados
-    if not os.path.exists(caminho_csv_input):
-        print(f"Erro: Arquivo {caminho_csv_input} não encontrado.")
-        return
-
-    df = pd.read_csv(caminho_csv_input)
-    
-    if 'Review' not in df.columns:
-        print("Erro: Coluna 'Review' não encontrada no CSV.")
-        return
+from armazenamento import APPID_PADRAO, carregar_reviews, diretorio_jogo, existe_armazenamento
+from cache_reviews import CAMINHO_CACHE, CacheReviews, versao_de
+from grafo_termos import FORMATOS, PERIODOS, exportar_grafo_termos
+from incidencia import MatrizIncidencia
+from instrumentacao import Execucao, adicionar_argumentos, contar, etapa
 
-    # Stopwords para limpeza
-    stopwords = {'a', 'o', 'e', 'de', 'do', 'da', 'em', 'um', 'uma', 'que', 'é', 'com', 'não', 'os', 'as', 'para', 'se', 'na', 'no', 'por', 'mais', 'foi', 'ao', 'dos', 'das', 'seu', 'sua', 'ou', 'ser', 'quando', 'muito', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso', 'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse', 'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às', 'minha', 'têm', 'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas', 'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas', 'teu', 'tua', 'teus', 'tuas', 'nosso', 'nossa', 'nossos', 'nossas', 'dela', 'delas', 'esta', 'estes', 'estas', 'aquele', 'aquela', 'aqueles', 'aquelas', 'isto', 'aquilo', 'estou', 'está', 'estamos', 'estão', 'estive', 'esteve', 'estivemos', 'estiveram', 'estava', 'estávamos', 'estavam', 'estivera', 'estivéramos', 'esteja', 'ejamos', 'estejam', 'estivesse', 'estivéssemos', 'estivessem', 'estiver', 'estivermos', 'estiverem', 'hei', 'há', 'havemos', 'hão', 'houve', 'houvemos', 'houveram', 'houvera', 'houvéramos', 'haja', 'hajamos', 'hajam', 'houvesse', 'houvéssemos', 'houvessem', 'houver', 'houvermos', 'houverem', 'houverei', 'houverá', 'houveremos', 'houverão', 'houveria', 'houveríamos', 'houveriam', 'sou', 'somos', 'são', 'era', 'éramos', 'eram', 'fui', 'foi', 'fomos', 'foram', 'fora', 'foramos', 'seja', 'sejamos', 'sejam', 'fosse', 'fôssemos', 'fossem', 'for', 'formos', 'forem', 'serei', 'será', 'seremos', 'serão', 'seria', 'seríamos', 'seriam', 'tenho', 'tem', 'temos', 'tém', 'tinha', 'tínhamos', 'tinham', 'tive', 'teve', 'tivemos', 'tiveram', 'tivera', 'tivéramos', 'tenha', 'tenhamos', 'tenham', 'tivesse', 'tivéssemos', 'tivessem', 'tiver', 'tivermos', 'tiverem', 'terei', 'terá', 'teremos', 'terão', 'teria', 'teríamos', 'teriam', 'the', 'and', 'of', 'to', 'a', 'in', 'is', 'it', 'you', 'that', 'for', 'on', 'with', 'as', 'was', 'are', 'this', 'but', 'be', 'have', 'not', 'an', 'at', 'or', 'if', 'from', 'my', 'all', 'so', 'me', 'by', 'one', 'can', 'just', 'like', 'about', 'very', 'out', 'what', 'game', 'play', 'really'}
+# Conceitos de interesse (nós principais)
+KEYWORDS_GEPHI = {
+    'Acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'blind', 'cego', 'visual'],
+    'Audio_Espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'binaural', 'hearing', 'headphones'],
+    'Narrativa': ['story', 'narrative', 'história', 'plot', 'writing', 'voice acting'],
+    'Imersao': ['immersive', 'immersion', 'imersivo', 'atmosphere'],
+    'Combate': ['combat', 'fight', 'battle', 'combate', 'luta'],
+    'Exploracao': ['exploration', 'explore', 'exploração', 'world'],
+    'Jogabilidade': ['gameplay', 'mechanics', 'jogabilidade', 'play'],
+    'Acessivel': ['accessible', 'barrier-free', 'inclusive']
+}
 
-    # Definir conceitos de interesse (nós principais)
-    keywords_map = {
-        'Acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'blind', 'cego', 'visual'],
-        'Audio_Espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'binaural', 'hearing', 'headphones'],
-        'Narrativa': ['story', 'narrative', 'história', 'plot', 'writing', 'voice acting'],
-        'Imersao': ['immersive', 'immersion', 'imersivo', 'atmosphere'],
-        'Combate': ['combat', 'fight', 'battle', 'combate', 'luta'],
-        'Exploracao': ['exploration', 'explore', 'exploração', 'world'],
-        'Jogabilidade': ['gameplay', 'mechanics', 'jogabilidade', 'play'],
-        'Acessivel': ['accessible', 'barrier-free', 'inclusive']
-    }
+def exportar_para_gephi(caminho_csv_input='The Vale - Shadow of the Crown  - reviews - Sheet1.csv', caminho_cache=None,
+                        appid=APPID_PADRAO, diretorio_saida='.'):
+    # Carregar dados (apenas a coluna de texto é necessária) do jogo `appid`;
+    # o armazenamento pode ter outros jogos (None lê todos)
+    with etapa('carregar'):
+        if existe_armazenamento(diretorio_jogo(appid)):
+            print(f"Lendo dados de {diretorio_jogo(appid)}/...")
+            df = carregar_reviews(['Review'], appid=appid)
+        else:
+            print(f"Lendo dados de {caminho_csv_input}...")
+            if not os.path.exists(caminho_csv_input):
+                print(f"Erro: Arquivo {caminho_csv_input} não encontrado.")
+                return
 
-    # 1. Preparar lista de palavras e co-ocorrências
-    all_terms_freq = Counter()
-    edges_counter = Counter()
+            try:
+                df = pd.read_csv(caminho_csv_input, usecols=['Review'])
+            except ValueError:
+                print("Erro: Coluna 'Review' não encontrada no CSV.")
+                return
 
+    # 1. Matriz de incidência review × conceito: pesos dos nós = soma das
+    # colunas, co-ocorrências (arestas) = Xᵀ·X
     print("Processando reviews para extrair conexões...")
-    for review in df['Review'].astype(str).str.lower():
-        # Limpar texto
-        words = re.findall(r'\b[a-z]{4,}\b', review)
-        words = [w for w in words if w not in stopwords]
-        
-        # Identificar quais das nossas palavras-chave estão presentes
-        present_concepts = set()
-        for concept, terms in keywords_map.items():
-            if any(term in review for term in terms):
-                present_concepts.add(concept)
-        
-        # Também adicionar palavras frequentes que não são keywords mas são importantes
-        # (Para o Gephi, focamos nos conceitos para não poluir o grafo)
-        
-        nodes_list = sorted(list(present_concepts))
-        
-        # Contar frequências dos nós
-        for node in nodes_list:
-            all_terms_freq[node] += 1
-            
-        # Calcular co-ocorrências (Edges)
-        if len(nodes_list) >= 2:
-            for pair in itertools.combinations(nodes_list, 2):
-                edges_counter[tuple(sorted(pair))] += 1
+    reviews = df['Review'].tolist()
+    contar(reviews=len(reviews))
+    with etapa('incidencia', itens=len(reviews)):
+        if caminho_cache:
+            # Só as reviews novas/alteradas são casadas; as demais vêm do cache
+            with CacheReviews('gephi', versao_de(KEYWORDS_GEPHI), caminho_cache) as cache:
+                presentes = cache.resolver(
+                    reviews, lambda textos: MatrizIncidencia.de_textos(textos, KEYWORDS_GEPHI).conceitos_por_linha()
+                )
+            incidencia = MatrizIncidencia.de_listas(presentes, KEYWORDS_GEPHI)
+        else:
+            incidencia = MatrizIncidencia.de_textos(reviews, KEYWORDS_GEPHI)
+    # (Para o Gephi, focamos nos conceitos para não poluir o grafo)
+    with etapa('nos_arestas'):
+        all_terms_freq = incidencia.contar_nos()
+        edges_counter = incidencia.contar_pares()
 
     # 2. Gerar Arquivo de NÓS (Nodes)
     nodes_df = pd.DataFrame([
         {'Id': node, 'Label': node, 'Weight': freq}
         for node, freq in all_terms_freq.items()
     ])
-    nodes_df.to_csv('gephi_nodes.csv', index=False)
+    nodes_df.to_csv(os.path.join(diretorio_saida, 'gephi_nodes.csv'), index=False)
     print(f"✓ Arquivo 'gephi_nodes.csv' gerado ({len(nodes_df)} nós)")
 
     # 3. Gerar Arquivo de ARESTAS (Edges)
@@ -83,7 +79,7 @@ def exportar_para_gephi(caminho_csv_input='The Vale - Shadow of the Crown  - rev
         })
     
     edges_df = pd.DataFrame(edges_list)
-    edges_df.to_csv('gephi_edges.csv', index=False)
+    edges_df.to_csv(os.path.join(diretorio_saida, 'gephi_edges.csv'), index=False)
     print(f"✓ Arquivo 'gephi_edges.csv' gerado ({len(edges_df)} conexões)")
 
     print("\nInstruções para o Gephi:")
@@ -92,5 +88,38 @@ def exportar_para_gephi(caminho_csv_input='The Vale - Shadow of the Crown  - rev
     print("3. Importe 'gephi_edges.csv' como 'Edges table' (certifique-se de marcar como 'Append to existing workspace').")
     print("4. Vá em 'Overview', use o layout 'ForceAtlas 2' e ajuste o tamanho dos nós pelo atributo 'Weight'.")
 
+def exportar_termos_para_gephi(max_nos, formato='gexf', janela=5, periodo='M', appid=APPID_PADRAO, diretorio_saida='.',
+                               caminho_csv_input='The Vale - Shadow of the Crown  - reviews - Sheet1.csv'):
+    # Grafo das palavras frequentes (não só das keywords), lido em blocos e gravado em partes
+    if existe_armazenamento(diretorio_jogo(appid)):
+        origem = diretorio_jogo(appid)
+    else:
+        origem = caminho_csv_input
+    caminho = os.path.join(diretorio_saida, f'gephi_termos.{formato}')
+    print(f"Montando o grafo de termos a partir de {origem}...")
+    grafo = exportar_grafo_termos(origem, caminho, max_nos=max_nos, janela=janela, periodo=periodo)
+    contar(reviews=grafo.reviews)
+    print(f"✓ Arquivo '{caminho}' gerado ({len(grafo.nos)} nós, {len(grafo.origens)} conexões, "
+          f"{len(grafo.codigos_periodos)} períodos)")
+    print("No Gephi: File > Open; o peso das arestas é o PMI e a linha do tempo usa os atributos por período.")
+
+
 if __name__ == "__main__":
-    exportar_para_gephi()
+    parser = argparse.ArgumentParser(description='Gera gephi_nodes.csv e gephi_edges.csv')
+    parser.add_argument('--cache', metavar='ARQUIVO', nargs='?', const=CAMINHO_CACHE,
+                        help=f'Reaproveita os conceitos por review de execuções anteriores (padrão: {CAMINHO_CACHE})')
+    parser.add_argument('--termos', type=int, metavar='N', nargs='?', const=5000,
+                        help='Gera o grafo de co-ocorrência das N palavras mais frequentes (padrão: 5000)')
+    parser.add_argument('--formato', choices=FORMATOS, default='gexf', help='Formato do grafo de termos')
+    parser.add_argument('--janela', type=int, default=5, help='Distância máxima (em palavras) entre termos conectados')
+    parser.add_argument('--periodo', choices=PERIODOS, default='M',
+                        help='Fatia de tempo dos atributos dinâmicos (D, W, M ou Y)')
+    parser.add_argument('--appid', type=int, default=APPID_PADRAO,
+                        help=f'Jogo lido do armazenamento Parquet (padrão: {APPID_PADRAO})')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    with Execucao('exportar_gephi', args.relatorio, args.perfil):
+        if args.termos:
+            exportar_termos_para_gephi(args.termos, args.formato, args.janela, args.periodo, args.appid)
+        else:
+            exportar_para_gephi(caminho_cache=args.cache, appid=args.appid)
@@ -0,0 +1,234 @@
+"""
+Fontes de dados das outras plataformas (Metacritic, lojas de console e Epic).
+
+Cada plataforma é uma FontePlataforma: URL, limitador de taxa, timeout e a
+função que extrai os campos da resposta. `coletar_fontes` dispara todas ao
+mesmo tempo em um loop asyncio. As requisições rodam em threads com a mesma
+`requests.Session`, porque o `aiohttp` não faz parte das dependências.
+
+Toda resposta válida é guardada como o último snapshot da fonte, junto com o
+ETag/Last-Modified, em cache_plataformas/<fonte>.json. A coleta seguinte é
+condicional: um 304 reaproveita o snapshot sem baixar a página de novo. Se a
+fonte falha (timeout, erro HTTP ou página sem os dados), vale o último
+snapshot. Sem snapshot, valem os dados conhecidos da plataforma, os mesmos que
+o consolidado usava antes.
+
+As páginas das lojas trazem a nota em JSON-LD (schema.org AggregateRating).
+O extrator também aceita um JSON com `aggregateRating`, o que permite
+apontar as fontes para servidores locais de fixtures (`urls=`).
+"""
+import asyncio
+import copy
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from instrumentacao import contar, etapa
+
+DIRETORIO_CACHE_PLATAFORMAS = 'cache_plataformas'
+
+# Origem dos dados de cada plataforma no consolidado
+STATUS = ('atualizado', 'nao_modificado', 'cache', 'padrao')
+
+# bestRating ausente: o schema.org define 5 como padrão
+MELHOR_NOTA_PADRAO = 5.0
+
+_JSON_LD = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+
+
+class LimitadorAssincrono:
+    """Token bucket de uma fonte, para corrotinas (a taxa é por segundo)"""
+
+    def __init__(self, taxa: float = 1.0, capacidade: int = 1):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def adquirir(self) -> None:
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.taxa)
+
+
+def avaliacao_agregada(conteudo: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Primeiro AggregateRating do conteúdo: um JSON (objeto com `aggregateRating`)
+    ou uma página HTML com blocos JSON-LD. Retorna None se não houver.
+    """
+    texto = conteudo.decode('utf-8', errors='replace').strip()
+    if texto.startswith(('{', '[')):
+        blocos = [texto]
+    else:
+        blocos = _JSON_LD.findall(texto)
+
+    pendentes = []
+    for bloco in blocos:
+        try:
+            pendentes.append(json.loads(bloco))
+        except ValueError:
+            continue
+    # Busca em largura: o AggregateRating pode estar aninhado (@graph, offers...)
+    while pendentes:
+        item = pendentes.pop(0)
+        if isinstance(item, list):
+            pendentes.extend(item)
+        elif isinstance(item, dict):
+            if item.get('@type') == 'AggregateRating':
+                return item
+            if isinstance(item.get('aggregateRating'), dict):
+                return item['aggregateRating']
+            pendentes.extend(v for v in item.values() if isinstance(v, (dict, list)))
+    return None
+
+
+def _numero(valor: Any) -> Optional[float]:
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def nota_e_total(conteudo: bytes, escala: float = 5.0) -> Dict[str, Any]:
+    """
+    Nota na `escala` pedida e número de avaliações do AggregateRating (sem
+    `bestRating`, a nota é de 0 a 5, como no schema.org). Levanta ValueError
+    se a resposta não tiver os dois.
+    """
+    avaliacao = avaliacao_agregada(conteudo)
+    if avaliacao is None:
+        raise ValueError("resposta sem AggregateRating")
+    nota = _numero(avaliacao.get('ratingValue'))
+    total = _numero(avaliacao['ratingCount'] if avaliacao.get('ratingCount') is not None else avaliacao.get('reviewCount'))
+    if nota is None or total is None:
+        raise ValueError(f"AggregateRating incompleto: {avaliacao}")
+    melhor = _numero(avaliacao.get('bestRating')) or MELHOR_NOTA_PADRAO
+    return {'nota': round(nota / melhor * escala, 2), 'total': int(total)}
+
+
+class FontePlataforma:
+    """
+    Uma plataforma consultada pelo consolidado.
+
+    `extrair(conteudo, dados)` atualiza uma cópia dos últimos dados conhecidos
+    com os campos da resposta e a devolve. Assim, campos que a página não traz
+    (ex.: distribuição por estrelas) continuam no consolidado. `padrao()`
+    devolve os dados conhecidos usados quando não há snapshot.
+    """
+
+    def __init__(self, nome: str, url: str, extrair: Callable[[bytes, Dict[str, Any]], Dict[str, Any]],
+                 padrao: Callable[[], Dict[str, Any]], taxa: float = 1.0, timeout: float = 10.0,
+                 tentativas: int = 2):
+        self.nome = nome
+        self.url = url
+        self.extrair = extrair
+        self.padrao = padrao
+        self.limitador = LimitadorAssincrono(taxa)
+        self.timeout = timeout
+        self.tentativas = tentativas
+
+    def _caminho_snapshot(self, diretorio: str) -> str:
+        return os.path.join(diretorio, f'{self.nome}.json')
+
+    def ler_snapshot(self, diretorio: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._caminho_snapshot(diretorio), encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Snapshot de outra URL não serve para requisição condicional nem como fallback
+        return snapshot if snapshot.get('url') == self.url else None
+
+    def gravar_snapshot(self, diretorio: str, snapshot: Dict[str, Any]) -> None:
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = self._caminho_snapshot(diretorio)
+        with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(caminho + '.tmp', caminho)
+
+    def _requisitar(self, sessao: requests.Session, snapshot: Optional[Dict[str, Any]]) -> requests.Response:
+        cabecalhos = {}
+        if snapshot and snapshot.get('etag'):
+            cabecalhos['If-None-Match'] = snapshot['etag']
+        if snapshot and snapshot.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = snapshot['last_modified']
+        return sessao.get(self.url, headers=cabecalhos, timeout=self.timeout)
+
+    async def coletar(self, sessao: requests.Session, diretorio: str = DIRETORIO_CACHE_PLATAFORMAS) -> Dict[str, Any]:
+        """
+        Dados da plataforma e a origem deles: {'dados', 'status', 'obtido_em',
+        'erro'}. Nunca levanta exceção: falhas caem no snapshot ou no padrão.
+        """
+        snapshot = self.ler_snapshot(diretorio)
+        base = snapshot['dados'] if snapshot else self.padrao()
+        erro = None
+        for _ in range(self.tentativas):
+            await self.limitador.adquirir()
+            try:
+                # A thread não é interrompida no timeout, mas a corrotina segue para o fallback
+                resposta = await asyncio.wait_for(asyncio.to_thread(self._requisitar, sessao, snapshot),
+                                                  self.timeout + 1)
+                contar(requisicoes=1, bytes_baixados=len(resposta.content))
+                if resposta.status_code == 304 and snapshot:
+                    return {'dados': base, 'status': 'nao_modificado', 'obtido_em': snapshot['obtido_em'], 'erro': None}
+                resposta.raise_for_status()
+                dados = self.extrair(resposta.content, copy.deepcopy(base))
+            except asyncio.TimeoutError:
+                erro = f"timeout de {self.timeout}s"
+                continue
+            except (requests.RequestException, ValueError) as e:
+                erro = str(e)
+                continue
+            obtido_em = datetime.now().isoformat(timespec='seconds')
+            self.gravar_snapshot(diretorio, {
+                'url': self.url,
+                'etag': resposta.headers.get('ETag'),
+                'last_modified': resposta.headers.get('Last-Modified'),
+                'obtido_em': obtido_em,
+                'dados': dados,
+            })
+            return {'dados': dados, 'status': 'atualizado', 'obtido_em': obtido_em, 'erro': None}
+
+        if snapshot:
+            return {'dados': base, 'status': 'cache', 'obtido_em': snapshot['obtido_em'], 'erro': erro}
+        return {'dados': base, 'status': 'padrao', 'obtido_em': None, 'erro': erro}
+
+    def offline(self, diretorio: str = DIRETORIO_CACHE_PLATAFORMAS) -> Dict[str, Any]:
+        """Último snapshot (ou os dados conhecidos), sem acessar a rede"""
+        snapshot = self.ler_snapshot(diretorio)
+        if snapshot:
+            return {'dados': snapshot['dados'], 'status': 'cache', 'obtido_em': snapshot['obtido_em'], 'erro': None}
+        return {'dados': self.padrao(), 'status': 'padrao', 'obtido_em': None, 'erro': None}
+
+
+async def _coletar_todas(fontes: List[FontePlataforma], cabecalhos: Dict[str, str],
+                         diretorio: str) -> List[Dict[str, Any]]:
+    with requests.Session() as sessao:
+        sessao.headers.update(cabecalhos)
+        return await asyncio.gather(*(fonte.coletar(sessao, diretorio) for fonte in fontes))
+
+
+def coletar_fontes(fontes: List[FontePlataforma], cabecalhos: Optional[Dict[str, str]] = None,
+                   diretorio: str = DIRETORIO_CACHE_PLATAFORMAS, online: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Coleta todas as fontes ao mesmo tempo e retorna {nome: resultado} na ordem
+    de `fontes`. Com online=False, usa só os snapshots e os dados conhecidos.
+    """
+    with etapa('coleta_plataformas', itens=len(fontes)):
+        if online:
+            resultados = asyncio.run(_coletar_todas(fontes, cabecalhos or {}, diretorio))
+        else:
+            resultados = [fonte.offline(diretorio) for fonte in fontes]
+    return {fonte.nome: resultado for fonte, resultado in zip(fontes, resultados)}
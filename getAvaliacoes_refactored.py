@@ -1,9 +1,22 @@
+import argparse
+import json
+import os
 import requests
+import numpy as np
 import pandas as pd
 import time
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Tuple
+
+from agregados import CAMINHO_AGREGADOS
+from armazenamento import APPID_PADRAO, DIRETORIO_REVIEWS, carregar_reviews, existe_armazenamento, exportar_reviews, salvar_reviews
+from busca_reviews import atualizar_indice
+from duplicatas import atualizar_duplicatas
+from coletor_steam import ColetorSteam, STEAM_BASE_URL
+from spool_steam import DIRETORIO_SPOOL, ReprodutorSpool, SpoolRespostas, carregar_json
+from instrumentacao import Execucao, adicionar_argumentos, contar, etapa, medido
 
 # Passo 3: Função para obter reviews da Steam com retry
+@medido()
 def get_steam_reviews(appid: int, cursor: str = '*', language: str = 'english', num_per_page: int = 100, max_retries: int = 5) -> Optional[Dict[str, Any]]:
     """
     Obtém uma página de reviews da Steam para um determinado appid.
@@ -23,13 +36,17 @@ def get_steam_reviews(appid: int, cursor: str = '*', language: str = 'english',
     }
     
     for attempt in range(max_retries):
+        if attempt > 0:
+            contar(tentativas_extras=1)
         try:
             response = requests.get(url, params=params, timeout=15)
+            contar(requisicoes=1, bytes_baixados=len(response.content))
             
             if response.status_code == 200:
-                return response.json()
+                return carregar_json(response.content)
             
             elif response.status_code == 429:
+                contar(respostas_429=1)
                 # Rate limit: espera mais tempo
                 wait_time = 2 ** attempt * 5  # Backoff exponencial: 5s, 10s, 20s, ...
                 print(f"Rate limit (429) atingido. Tentando novamente em {wait_time} segundos...")
@@ -49,92 +66,249 @@ def get_steam_reviews(appid: int, cursor: str = '*', language: str = 'english',
     print(f"Falha ao obter reviews após {max_retries} tentativas.")
     return None
 
-# Passo 4: Função para processar os dados e criar um DataFrame
+# Passo 4: Acumulador colunar das reviews e conversão para DataFrame
+class ColunasReviews:
+    """
+    Acumula as reviews brutas da API coluna a coluna (uma lista por campo) e
+    monta um único DataFrame no final, com uma só conversão vetorizada dos
+    timestamps. Assim as páginas de todos os idiomas viram um DataFrame sem
+    dicionários intermediários nem `pd.concat` de vários DataFrames pequenos.
+
+    Além das colunas históricas, guarda campos que já vêm no JSON da API: o
+    steamid do autor, as horas jogadas no momento da review e o
+    weighted_vote_score.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.autores: List[str] = []
+        self.horas: List[int] = []
+        self.horas_na_review: List[int] = []
+        self.idiomas: List[str] = []
+        self.textos: List[str] = []
+        self.recomendados: List[bool] = []
+        self.votos: List[int] = []
+        self.pontuacoes: List[Any] = []
+        self.timestamps: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def adicionar(self, reviews: List[Dict[str, Any]]) -> 'ColunasReviews':
+        """Anexa uma página (ou lista qualquer) de reviews no formato da API"""
+        autores = [review['author'] for review in reviews]
+        self.ids.extend([review['recommendationid'] for review in reviews])
+        self.autores.extend([autor.get('steamid') for autor in autores])
+        self.horas.extend([autor['playtime_forever'] for autor in autores])
+        self.horas_na_review.extend([autor.get('playtime_at_review', 0) for autor in autores])
+        self.idiomas.extend([review['language'] for review in reviews])
+        self.textos.extend([review['review'] for review in reviews])
+        self.recomendados.extend([review['voted_up'] for review in reviews])
+        self.votos.extend([review['votes_up'] for review in reviews])
+        self.pontuacoes.extend([review.get('weighted_vote_score', 0) for review in reviews])
+        self.timestamps.extend([review['timestamp_created'] for review in reviews])
+        return self
+
+    def para_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'ID da Review': self.ids,
+            'Horas Jogadas': self.horas,
+            'Idioma': self.idiomas,
+            'Review': self.textos,
+            'Recomendado': self.recomendados,
+            'Votos Úteis': self.votos,
+            # Converte todos os timestamps Unix para datetime de uma vez
+            'Data da Review': pd.to_datetime(np.asarray(self.timestamps, dtype='int64'), unit='s'),
+            'ID do Autor': self.autores,
+            'Horas na Review': self.horas_na_review,
+            # A API devolve o score como string (ex.: "0.523809552192688")
+            'Pontuação de Utilidade': pd.to_numeric(pd.Series(self.pontuacoes, dtype=object), errors='coerce'),
+        })
+
+@medido()
 def process_reviews(reviews_list: List[Dict[str, Any]]) -> pd.DataFrame:
     """
     Processa uma lista de dicionários de reviews e retorna um DataFrame.
     """
-    data = []
-    for review in reviews_list:
-        data.append({
-            'Horas Jogadas': review['author']['playtime_forever'],
-            'Idioma': review['language'],
-            'Review': review['review'],
-            'Recomendado': review['voted_up'],
-            'Votos Úteis': review['votes_up'],
-            # Converte o timestamp Unix para datetime
-            'Data da Review': pd.to_datetime(review['timestamp_created'], unit='s')
-        })
-    return pd.DataFrame(data)
+    return ColunasReviews().adicionar(reviews_list).para_dataframe()
+
+# Passo 5: Estado da coleta incremental (último timestamp por appid/idioma)
+def carregar_estado(caminho: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Lê o estado salvo: {appid: {idioma: {'ultimo_timestamp', 'ultimo_id'}}}"""
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_estado(estado: Dict[str, Dict[str, Dict[str, Any]]], caminho: str) -> None:
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+
+def atualizar_estado(estado: Dict[str, Dict[str, Dict[str, Any]]], resultados: Dict[Tuple[int, str], List[Dict[str, Any]]],
+                     incompletos: Iterable[Tuple[int, str]] = ()) -> None:
+    """
+    Avança o último timestamp/ID visto de cada (appid, idioma) com as reviews
+    coletadas. Fluxos `incompletos` (ver ColetorSteam.incompletos) mantêm o
+    estado anterior: com filter=recent, as reviews entre a última página
+    obtida e a marca antiga seriam puladas para sempre.
+    """
+    incompletos = set(incompletos)
+    for (appid, language), reviews in resultados.items():
+        if not reviews or (appid, language) in incompletos:
+            continue
+        mais_recente = max(reviews, key=lambda r: r['timestamp_created'])
+        atual = estado.setdefault(str(appid), {}).get(language)
+        if atual is None or mais_recente['timestamp_created'] >= atual['ultimo_timestamp']:
+            estado[str(appid)][language] = {
+                'ultimo_timestamp': mais_recente['timestamp_created'],
+                'ultimo_id': mais_recente['recommendationid']
+            }
+
+def mesclar_por_id(existente: pd.DataFrame, novos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mescla as reviews novas no dataset salvo usando o recommendationid como índice.
+    Reviews já existentes são substituídas pela versão mais recente.
+    """
+    existente = existente.set_index(existente['ID da Review'].astype(str))
+    novos = novos.set_index(novos['ID da Review'].astype(str))
+    novos = novos[~novos.index.duplicated(keep='last')]
+    mantidos = existente[~existente.index.isin(novos.index)]
+    return pd.concat([mantidos, novos]).reset_index(drop=True)
 
-# Passo 5: Função principal para coletar reviews em múltiplos idiomas
-def scrape_reviews_multiple_languages(appid: int, languages: List[str], filename: str) -> Optional[pd.DataFrame]:
+def atualizar_dias_agregados(final_df: pd.DataFrame, novos: Optional[pd.DataFrame], caminho: str = CAMINHO_AGREGADOS) -> None:
     """
-    Coleta reviews para um appid em múltiplos idiomas e salva em um arquivo Excel.
+    Recalcula nos agregados diários (se existirem) só os dias que receberam
+    reviews novas. Sem `novos` (coleta completa), os agregados são reconstruídos
+    a partir de `final_df`.
     """
-    all_dfs = []
+    if not os.path.exists(caminho):
+        return
+    # Importado aqui: a coleta não depende da análise quando não há agregados
+    from processar_dados import atualizar_agregados
+    dias = pd.to_datetime(final_df['Data da Review']).dt.normalize()
+    if novos is None:
+        atualizar_agregados(final_df, caminho, reconstruir=True)
+        print(f"Agregados diários reconstruídos ({dias.nunique()} dias).")
+        return
+    afetados = dias.isin(pd.to_datetime(novos['Data da Review']).dt.normalize().unique())
+    atualizar_agregados(final_df[afetados.to_numpy()], caminho)
+    print(f"Agregados diários atualizados ({dias[afetados].nunique()} dias recalculados).")
+
+# Passo 6: Função principal para coletar reviews em múltiplos idiomas
+def scrape_reviews_multiple_languages(appid: int, languages: List[str], filename: Optional[str] = None, max_workers: int = 4,
+                                      incremental: bool = False, estado_path: str = 'estado_coleta.json',
+                                      base_url: str = STEAM_BASE_URL, diretorio: str = DIRETORIO_REVIEWS,
+                                      spool: Optional[str] = None, reproduzir: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Coleta reviews para um appid em múltiplos idiomas e salva no armazenamento
+    Parquet (`diretorio`). Se `filename` for informado (.xlsx ou .csv), também
+    exporta uma cópia nesse formato.
+    Os idiomas são paginados em paralelo pelo ColetorSteam (sessão compartilhada
+    e limitador de taxa global).
+
+    No modo incremental, só busca reviews mais novas que o último timestamp salvo
+    em `estado_path` para cada idioma e mescla as novas linhas ao dataset existente.
+
+    Com `spool`, as respostas brutas da API são gravadas nesse diretório; com
+    `reproduzir`, o dataset é reconstruído a partir do spool, sem rede.
+    """
+    estado = carregar_estado(estado_path)
+    existente = None
+    desde = {}
     
-    for language in languages:
-        print(f"--- Coletando reviews em {language.upper()} (App ID: {appid}) ---")
-        cursor = '*'
-        reviews_count = 0
-        
-        while True:
-            reviews_data = get_steam_reviews(appid, cursor=cursor, language=language)
-            
-            if reviews_data and 'reviews' in reviews_data:
-                new_reviews = reviews_data['reviews']
-                
-                if not new_reviews:
-                    print(f"Não há mais reviews para o idioma {language}.")
-                    break
-                
-                # Processa o chunk de reviews e adiciona ao DataFrame
-                df_chunk = process_reviews(new_reviews)
-                all_dfs.append(df_chunk)
-                reviews_count += len(new_reviews)
-                
-                # Obtém o novo cursor para a próxima página
-                new_cursor = reviews_data.get('cursor')
-                
-                # A API da Steam pode retornar o mesmo cursor na última página.
-                # Se o cursor não mudou ou se não houver mais cursor, encerra o loop.
-                if new_cursor == cursor or not new_cursor:
-                    print(f"Fim da coleta para o idioma {language}. Total de reviews: {reviews_count}")
-                    break
-                else:
-                    cursor = new_cursor
-                    print(f"Coletadas {reviews_count} reviews em {language}. Próximo cursor: {cursor[:20]}...")
-            else:
-                print(f"Não foi possível coletar mais reviews em {language}. Passando para o próximo idioma.")
-                break
+    if incremental:
+        if existe_armazenamento(diretorio):
+            existente = carregar_reviews(appid=appid, diretorio=diretorio).drop(columns=['AppID'])
+        if existente is None or existente.empty or 'ID da Review' not in existente.columns:
+            print("Nenhum dataset anterior com 'ID da Review'. Fazendo coleta completa...")
+            existente = None
+        else:
+            for language in languages:
+                info = estado.get(str(appid), {}).get(language)
+                if info:
+                    desde[(appid, language)] = info['ultimo_timestamp']
+    
+    print(f"--- Coletando reviews em {', '.join(l.upper() for l in languages)} (App ID: {appid}) ---")
+    if reproduzir:
+        coletor = ReprodutorSpool(SpoolRespostas(spool or DIRETORIO_SPOOL))
+    else:
+        coletor = ColetorSteam(base_url=base_url, max_workers=max_workers,
+                               spool=SpoolRespostas(spool) if spool else None)
+    try:
+        resultados = coletor.coletar([appid], languages, desde=desde)
+        incompletos = coletor.incompletos
+    finally:
+        coletor.fechar()
+    
+    # Todas as páginas de todos os idiomas vão para um único acumulador colunar
+    colunas = ColunasReviews()
+    with etapa('process_reviews') as medicao:
+        for reviews in resultados.values():
+            colunas.adicionar(reviews)
+        novos = colunas.para_dataframe() if len(colunas) else None
+        medicao.itens = len(colunas)
     
-    if all_dfs:
-        # Concatena todos os DataFrames de todos os idiomas
-        final_df = pd.concat(all_dfs, ignore_index=True)
+    if existente is not None:
+        if novos is not None:
+            final_df = mesclar_por_id(existente, novos)
+            print(f"\n{len(final_df) - len(existente)} reviews novas mescladas ao dataset existente.")
+            atualizar_dias_agregados(final_df, novos)
+        else:
+            final_df = existente
+            print("\nNenhuma review nova desde a última coleta.")
+    elif novos is not None:
+        final_df = novos
         
         # Remove duplicatas que podem ocorrer devido a falhas de cursor na API
-        final_df.drop_duplicates(subset=['Review', 'Data da Review'], inplace=True)
-        
-        final_df.to_excel(filename, index=False)
-        print(f"\nColeta concluída. Total de reviews salvas: {len(final_df)}")
-        print(f"Arquivo salvo com sucesso: {filename}")
-        return final_df
+        final_df.drop_duplicates(subset=['ID da Review'], keep='last', inplace=True)
+        atualizar_dias_agregados(final_df, None)
     else:
         print("\nNenhuma review foi coletada.")
         return None
+    
+    with etapa('salvar_reviews', itens=len(final_df)):
+        salvar_reviews(final_df, appid, diretorio)
+    if novos is not None:
+        atualizar_indice(novos, appid)
+        atualizar_duplicatas(novos)
+    atualizar_estado(estado, resultados, incompletos)
+    salvar_estado(estado, estado_path)
+    print(f"\nColeta concluída. Total de reviews salvas: {len(final_df)}")
+    print(f"Dados salvos em: {diretorio}/")
+    
+    if filename:
+        exportar_reviews(final_df, filename)
+        print(f"Arquivo exportado com sucesso: {filename}")
+    return final_df
 
-# Passo 6: Configurações específicas para o jogo
+# Passo 7: Configurações específicas para o jogo
 # O jogo é "The Vale - Shadow of the Crown" (confirmado via pesquisa)
-appid = 989790
+appid = APPID_PADRAO
 languages = ['brazilian', 'english', 'spanish']
-filename = 'steam_reviews_the_vale_shadow_of_the_crown.xlsx'
 
-# Executar o scraper e salvar os dados
-print(f"Iniciando coleta de reviews para o jogo com App ID {appid}...")
-df = scrape_reviews_multiple_languages(appid, languages, filename)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Coleta reviews da Steam')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Busca apenas reviews mais novas que a última coleta e as mescla por ID na partição '
+                             f'do jogo no armazenamento Parquet ({DIRETORIO_REVIEWS}/)')
+    parser.add_argument('--exportar', metavar='ARQUIVO',
+                        help='Também exporta o dataset para .xlsx ou .csv (ex.: steam_reviews_the_vale_shadow_of_the_crown.xlsx)')
+    parser.add_argument('--spool', metavar='DIRETORIO', nargs='?', const=DIRETORIO_SPOOL,
+                        help=f'Grava as respostas brutas da API em JSONL comprimido (padrão: {DIRETORIO_SPOOL})')
+    parser.add_argument('--reproduzir', action='store_true',
+                        help='Reconstrói o dataset a partir do spool, sem acessar a API')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    if args.reproduzir and args.incremental:
+        parser.error('--reproduzir não pode ser combinado com --incremental')
+
+    with Execucao('coleta', args.relatorio, args.perfil):
+        # Executar o scraper e salvar os dados
+        print(f"Iniciando coleta de reviews para o jogo com App ID {appid}...")
+        df = scrape_reviews_multiple_languages(appid, languages, args.exportar, incremental=args.incremental,
+                                               spool=args.spool, reproduzir=args.reproduzir)
 
-# Exibir as primeiras linhas do DataFrame (opcional)
-if df is not None:
-    print("\nPrimeiras 5 linhas do DataFrame final:")
-    print(df.head())
+        # Exibir as primeiras linhas do DataFrame (opcional)
+        if df is not None:
+            print("\nPrimeiras 5 linhas do DataFrame final:")
+            print(df.head())
@@ -0,0 +1,358 @@
+"""
+Grafo de co-ocorrência de termos para o Gephi, gravado em GEXF ou GraphML.
+
+Os nós são as N palavras mais frequentes das reviews (sem stopwords). Uma
+aresta liga duas palavras que aparecem a até `janela` posições uma da outra
+na mesma review. Ela guarda o número de co-ocorrências e o PMI, que é o peso
+usado no Gephi. Com a coluna 'Data da Review', a frequência dos nós e as
+co-ocorrências das arestas também são registradas por período. No GEXF isso
+vira atributos dinâmicos (linha do tempo do Gephi). No GraphML vira um
+atributo por período.
+
+As reviews são lidas em blocos duas vezes: na primeira passada contam-se as
+frequências e na segunda, os pares. Os pares se acumulam em uma matriz
+esparsa período × par (código a·N + b). O arquivo é gravado em partes, sem
+montar a lista de arestas como objetos Python.
+"""
+import os
+from typing import Callable, Iterable, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from armazenamento import DIRETORIO_REVIEWS, ler_em_blocos
+from instrumentacao import etapa
+from tokenizador import STOPWORDS, Vocabulario, tokenizar_lote
+
+# Unidades de período aceitas: dia, semana (começando na segunda), mês e ano
+PERIODOS = ('D', 'W', 'M', 'Y')
+FORMATOS = ('gexf', 'graphml')
+# Arestas gravadas por vez
+TAMANHO_PARTE = 50_000
+
+_SEM_DATA = np.iinfo(np.int64).min
+
+
+def _somar(acumulado: Optional[sparse.csr_matrix], bloco: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Soma duas matrizes esparsas que podem ter números de linhas diferentes"""
+    if acumulado is None:
+        return bloco
+    linhas = max(acumulado.shape[0], bloco.shape[0])
+    acumulado.resize((linhas, acumulado.shape[1]))
+    bloco.resize((linhas, bloco.shape[1]))
+    return acumulado + bloco
+
+
+class GrafoTermos:
+    """
+    Conta nós e arestas do grafo de termos a partir de blocos de reviews.
+
+    `construir(fonte)` recebe uma função que devolve um iterador novo de
+    DataFrames (coluna 'Review' e, opcionalmente, 'Data da Review' e 'Idioma')
+    a cada chamada, porque o corpus é percorrido duas vezes. Depois disso,
+    `salvar(caminho)` grava o grafo no formato indicado pela extensão.
+    """
+
+    def __init__(self, max_nos: int = 5000, janela: int = 5, min_coocorrencia: int = 2,
+                 pmi_minimo: Optional[float] = 0.0, periodo: str = 'M', stopwords=STOPWORDS):
+        if periodo not in PERIODOS:
+            raise ValueError(f"Período deve ser um de {PERIODOS}: {periodo!r}")
+        if janela < 1:
+            raise ValueError(f"A janela deve ter ao menos 1 palavra: {janela}")
+        self.max_nos = max_nos
+        self.janela = janela
+        self.min_coocorrencia = min_coocorrencia
+        self.pmi_minimo = pmi_minimo
+        self.periodo = periodo
+        self.stopwords = stopwords
+        self.vocabulario = Vocabulario()
+        self.reviews = 0
+        self._frequencias = np.zeros(0, dtype=np.int64)
+        self._posicoes = np.zeros(0, dtype=np.int64)
+        self.nos = np.zeros(0, dtype=np.int64)
+        # Código de cada período na ordem em que apareceu (= linha das matrizes)
+        self._codigos_periodos = []
+        self._linhas_periodos = {}
+        self._nos_periodo = None
+        self._pares_periodo = None
+
+    # --- Contagem ---
+
+    def _periodos(self, bloco: pd.DataFrame) -> np.ndarray:
+        """Linha do período de cada review do bloco (reviews sem data têm um período próprio)"""
+        if 'Data da Review' in bloco.columns:
+            datas = pd.to_datetime(bloco['Data da Review'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        else:
+            datas = np.full(len(bloco), np.datetime64('NaT'), dtype='datetime64[ns]')
+        if self.periodo == 'W':
+            dias = datas.astype('datetime64[D]').astype(np.int64)
+            # 1970-01-01 foi uma quinta: +3 alinha as semanas na segunda
+            codigos = np.where(np.isnat(datas), _SEM_DATA, (dias + 3) // 7)
+        else:
+            codigos = datas.astype(f'datetime64[{self.periodo}]').astype(np.int64)
+            codigos[np.isnat(datas)] = _SEM_DATA
+        unicos, inverso = np.unique(codigos, return_inverse=True)
+        for codigo in unicos.tolist():
+            if codigo not in self._linhas_periodos:
+                self._linhas_periodos[codigo] = len(self._codigos_periodos)
+                self._codigos_periodos.append(codigo)
+        linhas = np.array([self._linhas_periodos[c] for c in unicos.tolist()], dtype=np.int64)
+        return linhas[inverso.reshape(-1)]
+
+    def _tokenizar(self, bloco: pd.DataFrame):
+        """Tokens do bloco, sem as stopwords do idioma de cada review (se houver a coluna 'Idioma')"""
+        idiomas = bloco['Idioma'].tolist() if 'Idioma' in bloco.columns else None
+        return tokenizar_lote(bloco['Review'].tolist(), self.vocabulario, self.stopwords, idiomas)
+
+    def contar_frequencias(self, blocos: Iterable[pd.DataFrame]) -> None:
+        """Primeira passada: frequência de cada palavra; escolhe os `max_nos` nós"""
+        with etapa('frequencias_termos') as medicao:
+            for bloco in blocos:
+                lote = self._tokenizar(bloco)
+                contagem = np.bincount(lote.ids, minlength=len(self.vocabulario))
+                contagem[:len(self._frequencias)] += self._frequencias
+                self._frequencias = contagem
+                self.reviews += len(lote)
+            medicao.itens = self.reviews
+
+        # Mais frequentes primeiro; empates pela ordem de aparição
+        presentes = np.flatnonzero(self._frequencias)
+        ordem = np.argsort(-self._frequencias[presentes], kind='stable')
+        self.nos = presentes[ordem[:self.max_nos]]
+        self._posicoes = np.full(len(self.vocabulario), -1, dtype=np.int64)
+        self._posicoes[self.nos] = np.arange(len(self.nos))
+
+    def contar_pares(self, blocos: Iterable[pd.DataFrame]) -> None:
+        """Segunda passada: frequência dos nós e co-ocorrências por período"""
+        n = len(self.nos)
+        with etapa('pares_termos', itens=0) as medicao:
+            for bloco in blocos:
+                lote = self._tokenizar(bloco)
+                linhas_periodo = self._periodos(bloco)
+                # Palavras que não estavam na primeira passada ficam fora do grafo
+                posicoes = np.full(len(self.vocabulario), -1, dtype=np.int64)
+                posicoes[:len(self._posicoes)] = self._posicoes
+                termos = posicoes[lote.ids]
+                review = np.repeat(np.arange(len(lote)), np.diff(lote.limites))
+                periodo = linhas_periodo[review]
+
+                no = termos >= 0
+                nos = sparse.coo_matrix(
+                    (np.ones(int(no.sum()), dtype=np.int64), (periodo[no], termos[no])),
+                    shape=(len(self._codigos_periodos), n)
+                ).tocsr()
+                self._nos_periodo = _somar(self._nos_periodo, nos)
+
+                # Chave período·N² + par; o bloco é reduzido a pares distintos antes da matriz
+                largura = n * n
+                chaves = []
+                for k in range(1, self.janela + 1):
+                    a, b = termos[:-k], termos[k:]
+                    par = (review[:-k] == review[k:]) & (a >= 0) & (b >= 0) & (a != b)
+                    a, b = a[par], b[par]
+                    chaves.append(periodo[:-k][par] * largura + np.minimum(a, b) * n + np.maximum(a, b))
+                chaves, contagens = np.unique(np.concatenate(chaves), return_counts=True)
+                linhas, codigos = np.divmod(chaves, max(largura, 1))
+                pares = sparse.csr_matrix(
+                    (contagens, (linhas, codigos)), shape=(len(self._codigos_periodos), largura)
+                )
+                self._pares_periodo = _somar(self._pares_periodo, pares)
+                medicao.itens += len(lote)
+
+    def construir(self, fonte: Callable[[], Iterable[pd.DataFrame]]) -> 'GrafoTermos':
+        self.contar_frequencias(fonte())
+        self.contar_pares(fonte())
+        self._finalizar()
+        return self
+
+    def _finalizar(self) -> None:
+        """Arestas (co-ocorrências, PMI e contagens por período) a partir da matriz período × par"""
+        n = len(self.nos)
+        periodos = len(self._codigos_periodos)
+        nos = self._nos_periodo if self._nos_periodo is not None else sparse.csr_matrix((periodos, n), dtype=np.int64)
+        nos.resize((periodos, n))
+        self.frequencias = np.asarray(nos.sum(axis=0), dtype=np.int64).ravel()
+
+        pares = self._pares_periodo.tocoo() if self._pares_periodo is not None else sparse.coo_matrix((0, 0))
+        codigos, inverso = np.unique(pares.col, return_inverse=True)
+        contagens = np.bincount(inverso, weights=pares.data, minlength=len(codigos)).astype(np.int64)
+        origens, destinos = np.divmod(codigos.astype(np.int64), max(n, 1))
+
+        # PMI sobre a matriz simétrica de co-ocorrência: log(c(a,b)·2T / (c(a)·c(b)))
+        marginais = (np.bincount(origens, weights=contagens, minlength=n)
+                     + np.bincount(destinos, weights=contagens, minlength=n))
+        total = contagens.sum()
+        with np.errstate(divide='ignore'):
+            pmi = np.log(contagens * 2.0 * total / (marginais[origens] * marginais[destinos]))
+
+        manter = contagens >= self.min_coocorrencia
+        if self.pmi_minimo is not None:
+            manter &= pmi > self.pmi_minimo
+        self.origens, self.destinos = origens[manter], destinos[manter]
+        self.coocorrencias, self.pmi = contagens[manter], pmi[manter]
+
+        # Contagens por período: nós (N × P) e arestas (E × P), colunas em ordem cronológica
+        datados = [linha for linha in np.argsort(self._codigos_periodos).tolist()
+                   if self._codigos_periodos[linha] != _SEM_DATA]
+        self.codigos_periodos = [self._codigos_periodos[linha] for linha in datados]
+        self.nos_por_periodo = nos[datados].T.tocsr()
+        novo_indice = np.cumsum(manter) - 1
+        por_aresta = manter[inverso]
+        coluna = np.full(periodos, -1, dtype=np.int64)
+        coluna[datados] = np.arange(len(datados))
+        datado = por_aresta & (coluna[pares.row] >= 0)
+        self.arestas_por_periodo = sparse.csr_matrix(
+            (pares.data[datado], (novo_indice[inverso[datado]], coluna[pares.row[datado]])),
+            shape=(len(self.origens), len(datados)), dtype=np.int64
+        )
+        self.arestas_por_periodo.sort_indices()
+        self.nos_por_periodo.sort_indices()
+        self._pares_periodo = None
+
+    # --- Gravação ---
+
+    def _limites_periodo(self, codigo: int):
+        """Primeiro e último dia (inclusive) de um período, em ISO"""
+        if self.periodo == 'W':
+            inicio = np.datetime64(codigo * 7 - 3, 'D')
+            fim = inicio + np.timedelta64(6, 'D')
+        else:
+            inicio = np.datetime64(codigo, self.periodo).astype('datetime64[D]')
+            fim = np.datetime64(codigo + 1, self.periodo).astype('datetime64[D]') - np.timedelta64(1, 'D')
+        return str(inicio), str(fim)
+
+    def _rotulos_periodos(self):
+        if self.periodo == 'W':
+            return [self._limites_periodo(c)[0] for c in self.codigos_periodos]
+        return [str(np.datetime64(c, self.periodo)) for c in self.codigos_periodos]
+
+    def _rotulos_nos(self):
+        return [escape(self.vocabulario.palavras[i]) for i in self.nos.tolist()]
+
+    @staticmethod
+    def _partes(total: int):
+        for inicio in range(0, total, TAMANHO_PARTE):
+            yield inicio, min(inicio + TAMANHO_PARTE, total)
+
+    def salvar_gexf(self, caminho: str) -> None:
+        """GEXF 1.3; com datas, frequências e co-ocorrências por período são atributos dinâmicos"""
+        limites = [self._limites_periodo(c) for c in self.codigos_periodos]
+        intervalos = [f' start="{inicio}" end="{fim}"' for inicio, fim in limites]
+        dinamico = bool(intervalos)
+
+        def valores_periodo(matriz, linha, atributo):
+            colunas = matriz.indices[matriz.indptr[linha]:matriz.indptr[linha + 1]].tolist()
+            dados = matriz.data[matriz.indptr[linha]:matriz.indptr[linha + 1]].tolist()
+            return ''.join(f'<attvalue for="{atributo}" value="{v}"{intervalos[j]}/>' for j, v in zip(colunas, dados))
+
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<gexf xmlns="http://gexf.net/1.3" version="1.3">\n'
+                    f'  <meta><description>Co-ocorrência de termos (janela de {self.janela} palavras, '
+                    f'{self.reviews} reviews)</description></meta>\n')
+            modo = ' mode="dynamic" timeformat="date"' if dinamico else ''
+            f.write(f'  <graph defaultedgetype="undirected"{modo}>\n'
+                    '    <attributes class="node" mode="static">'
+                    '<attribute id="0" title="frequencia" type="integer"/></attributes>\n'
+                    '    <attributes class="edge" mode="static">'
+                    '<attribute id="0" title="coocorrencias" type="integer"/>'
+                    '<attribute id="1" title="pmi" type="double"/></attributes>\n')
+            if dinamico:
+                f.write('    <attributes class="node" mode="dynamic">'
+                        '<attribute id="1" title="frequencia_periodo" type="integer"/></attributes>\n'
+                        '    <attributes class="edge" mode="dynamic">'
+                        '<attribute id="2" title="coocorrencias_periodo" type="integer"/>'
+                        '</attributes>\n')
+
+            f.write('    <nodes>\n')
+            rotulos = self._rotulos_nos()
+            frequencias = self.frequencias.tolist()
+            for inicio, fim in self._partes(len(rotulos)):
+                f.write(''.join(
+                    f'      <node id="{i}" label="{rotulos[i]}"><attvalues>'
+                    f'<attvalue for="0" value="{frequencias[i]}"/>'
+                    + (valores_periodo(self.nos_por_periodo, i, '1') if dinamico else '')
+                    + '</attvalues></node>\n'
+                    for i in range(inicio, fim)
+                ))
+            f.write('    </nodes>\n    <edges>\n')
+            for inicio, fim in self._partes(len(self.origens)):
+                origens = self.origens[inicio:fim].tolist()
+                destinos = self.destinos[inicio:fim].tolist()
+                contagens = self.coocorrencias[inicio:fim].tolist()
+                pmis = self.pmi[inicio:fim].tolist()
+                f.write(''.join(
+                    f'      <edge id="{inicio + k}" source="{a}" target="{b}" weight="{p:.4f}"><attvalues>'
+                    f'<attvalue for="0" value="{c}"/><attvalue for="1" value="{p:.4f}"/>'
+                    + (valores_periodo(self.arestas_por_periodo, inicio + k, '2') if dinamico else '')
+                    + '</attvalues></edge>\n'
+                    for k, (a, b, c, p) in enumerate(zip(origens, destinos, contagens, pmis))
+                ))
+            f.write('    </edges>\n  </graph>\n</gexf>\n')
+
+    def salvar_graphml(self, caminho: str) -> None:
+        """GraphML; as contagens por período viram um atributo por período (só os valores não nulos são gravados)"""
+        rotulos_periodos = self._rotulos_periodos()
+
+        def valores_periodo(matriz, linha, prefixo):
+            colunas = matriz.indices[matriz.indptr[linha]:matriz.indptr[linha + 1]].tolist()
+            dados = matriz.data[matriz.indptr[linha]:matriz.indptr[linha + 1]].tolist()
+            return ''.join(f'<data key="{prefixo}{j}">{v}</data>' for j, v in zip(colunas, dados))
+
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                    '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+                    '  <key id="frequencia" for="node" attr.name="frequencia" attr.type="int"/>\n'
+                    '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+                    '  <key id="coocorrencias" for="edge" attr.name="coocorrencias" attr.type="int"/>\n')
+            for j, rotulo in enumerate(rotulos_periodos):
+                f.write(f'  <key id="f{j}" for="node" attr.name={quoteattr("frequencia_" + rotulo)} attr.type="int">'
+                        '<default>0</default></key>\n'
+                        f'  <key id="c{j}" for="edge" attr.name={quoteattr("coocorrencias_" + rotulo)} attr.type="int">'
+                        '<default>0</default></key>\n')
+            f.write('  <graph id="termos" edgedefault="undirected">\n')
+
+            rotulos = self._rotulos_nos()
+            frequencias = self.frequencias.tolist()
+            for inicio, fim in self._partes(len(rotulos)):
+                f.write(''.join(
+                    f'    <node id="n{i}"><data key="label">{rotulos[i]}</data>'
+                    f'<data key="frequencia">{frequencias[i]}</data>'
+                    + valores_periodo(self.nos_por_periodo, i, 'f') + '</node>\n'
+                    for i in range(inicio, fim)
+                ))
+            for inicio, fim in self._partes(len(self.origens)):
+                origens = self.origens[inicio:fim].tolist()
+                destinos = self.destinos[inicio:fim].tolist()
+                contagens = self.coocorrencias[inicio:fim].tolist()
+                pmis = self.pmi[inicio:fim].tolist()
+                f.write(''.join(
+                    f'    <edge source="n{a}" target="n{b}"><data key="weight">{p:.4f}</data>'
+                    f'<data key="coocorrencias">{c}</data>'
+                    + valores_periodo(self.arestas_por_periodo, inicio + k, 'c') + '</edge>\n'
+                    for k, (a, b, c, p) in enumerate(zip(origens, destinos, contagens, pmis))
+                ))
+            f.write('  </graph>\n</graphml>\n')
+
+    def salvar(self, caminho: str, formato: Optional[str] = None) -> None:
+        """Grava no `formato` dado ou, na falta dele, no indicado pela extensão do arquivo"""
+        formato = formato or os.path.splitext(caminho)[1].lstrip('.').lower()
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de grafo não suportado: {formato!r} (use {', '.join(FORMATOS)})")
+        with etapa('gravar_grafo', itens=len(self.origens)):
+            if formato == 'gexf':
+                self.salvar_gexf(caminho)
+            else:
+                self.salvar_graphml(caminho)
+
+
+def exportar_grafo_termos(origem: str = DIRETORIO_REVIEWS, caminho: str = 'grafo_termos.gexf',
+                          tamanho_bloco: int = 50_000, **opcoes) -> GrafoTermos:
+    """Monta o grafo de termos lendo `origem` em blocos (ver armazenamento.ler_em_blocos) e o grava em `caminho`"""
+    colunas = ['Review', 'Data da Review', 'Idioma']
+    grafo = GrafoTermos(**opcoes).construir(lambda: ler_em_blocos(origem, tamanho_bloco, colunas))
+    grafo.salvar(caminho)
+    return grafo
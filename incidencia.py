@@ -0,0 +1,131 @@
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+
+class MatrizIncidencia:
+    """
+    Matriz esparsa review × conceito (CSR, 1 quando o conceito aparece na review).
+
+    É a base comum da co-ocorrência do dashboard e da exportação para o Gephi:
+    o peso de cada nó é a soma de uma coluna e a co-ocorrência de todos os
+    pares sai de um único produto Xᵀ·X, sem laços em Python sobre os pares.
+
+    As contagens são devolvidas em Counters cuja ordem de inserção reproduz a
+    da contagem review a review (primeira review em que o nó/par aparece e,
+    dentro dela, ordem alfabética), preservando o desempate de `most_common`.
+    """
+
+    def __init__(self, matriz, conceitos):
+        self.matriz = sparse.csr_matrix(matriz, dtype=np.int32)
+        self.conceitos = list(conceitos)
+
+    @classmethod
+    def de_listas(cls, listas, conceitos):
+        """Monta a matriz a partir dos conceitos presentes em cada review"""
+        conceitos = list(conceitos)
+        coluna = {c: j for j, c in enumerate(conceitos)}
+        linhas, colunas = [], []
+        for i, presentes in enumerate(listas):
+            for conceito in presentes:
+                j = coluna.get(conceito)
+                if j is not None:
+                    linhas.append(i)
+                    colunas.append(j)
+        dados = np.ones(len(linhas), dtype=np.int32)
+        matriz = sparse.csr_matrix((dados, (linhas, colunas)), shape=(len(listas), len(conceitos)))
+        return cls(matriz, conceitos)
+
+    @classmethod
+    def de_acertos(cls, acertos, conceitos, mapa='coocorrencia'):
+        """Monta a matriz a partir dos acertos do CasadorConceitos para um `mapa`"""
+        return cls.de_listas([acerto[mapa] for acerto in acertos], conceitos)
+
+    @classmethod
+    def de_textos(cls, textos, keywords):
+        """
+        Monta a matriz marcando os conceitos {conceito: [termos]} cujos termos
+        aparecem (como substring) em cada texto.
+
+        Cada termo distinto é buscado uma única vez em todos os textos, gerando a
+        incidência review × termo; a incidência por conceito é o produto dela
+        pela matriz termo × conceito.
+        """
+        textos = [t.lower() if isinstance(t, str) else '' for t in textos]
+        conceitos = list(keywords)
+        termos = sorted({t.lower() for ts in keywords.values() for t in ts if t})
+        indice_termo = {t: k for k, t in enumerate(termos)}
+
+        linhas, colunas = [], []
+        for k, termo in enumerate(termos):
+            presentes = np.fromiter((termo in texto for texto in textos), dtype=bool, count=len(textos))
+            linhas_termo = np.flatnonzero(presentes)
+            linhas.append(linhas_termo)
+            colunas.append(np.full(len(linhas_termo), k))
+        linhas = np.concatenate(linhas) if linhas else np.zeros(0, dtype=np.int64)
+        colunas = np.concatenate(colunas) if colunas else np.zeros(0, dtype=np.int64)
+        por_termo = sparse.csr_matrix(
+            (np.ones(len(linhas), dtype=np.int32), (linhas, colunas)), shape=(len(textos), len(termos))
+        )
+
+        pares = [(indice_termo[t.lower()], j) for j, c in enumerate(conceitos) for t in set(keywords[c]) if t]
+        termo_conceito = sparse.csr_matrix(
+            (np.ones(len(pares), dtype=np.int32), tuple(zip(*pares)) if pares else ([], [])),
+            shape=(len(termos), len(conceitos))
+        )
+        return cls((por_termo @ termo_conceito) > 0, conceitos)
+
+    def conceitos_por_linha(self):
+        """Lista dos conceitos presentes em cada review"""
+        return [
+            [self.conceitos[j] for j in self.matriz.indices[inicio:fim]]
+            for inicio, fim in zip(self.matriz.indptr[:-1], self.matriz.indptr[1:])
+        ]
+
+    def pesos_nos(self):
+        """Número de reviews em que cada conceito aparece (soma das colunas)"""
+        return np.asarray(self.matriz.sum(axis=0)).ravel()
+
+    def coocorrencias(self, pesos=None):
+        """
+        Matriz densa conceito × conceito com o número de reviews em comum (Xᵀ·X)
+        ou, com `pesos` por review, a soma dos pesos delas (Xᵀ·diag(pesos)·X)
+        """
+        if pesos is None:
+            return (self.matriz.T @ self.matriz).toarray()
+        return (self.matriz.T @ sparse.diags(np.asarray(pesos, dtype=np.float64)) @ self.matriz).toarray()
+
+    def _colunas(self):
+        """Formato CSC com as linhas de cada coluna em ordem crescente"""
+        colunas = self.matriz.tocsc()
+        colunas.sort_indices()
+        return colunas
+
+    def contar_nos(self):
+        """Counter {conceito: reviews} dos conceitos presentes"""
+        pesos = self.pesos_nos()
+        colunas = self._colunas()
+        presentes = [j for j in range(len(self.conceitos)) if pesos[j] > 0]
+        ordem = sorted(presentes, key=lambda j: (colunas.indices[colunas.indptr[j]], self.conceitos[j]))
+        return Counter({self.conceitos[j]: int(pesos[j]) for j in ordem})
+
+    def contar_pares(self, pesos=None):
+        """
+        Counter {(conceito_a, conceito_b): reviews}, com a < b, dos pares
+        presentes (soma dos `pesos` das reviews, se fornecidos)
+        """
+        cooc = self.coocorrencias(pesos)
+        colunas = self._colunas()
+        pares = []
+        for a in range(len(self.conceitos)):
+            for b in range(a + 1, len(self.conceitos)):
+                if cooc[a, b] == 0:
+                    continue
+                origem, destino = sorted((self.conceitos[a], self.conceitos[b]))
+                linhas_a = colunas.indices[colunas.indptr[a]:colunas.indptr[a + 1]]
+                linhas_b = colunas.indices[colunas.indptr[b]:colunas.indptr[b + 1]]
+                primeira = np.intersect1d(linhas_a, linhas_b, assume_unique=True)[0]
+                pares.append((primeira, origem, destino, cooc[a, b].item()))
+        pares.sort()
+        return Counter({(origem, destino): peso for _, origem, destino, peso in pares})
@@ -0,0 +1,245 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+CAMINHO_RELATORIO = 'relatorio_execucao.json'
+
+# Variável de ambiente que liga o perfilamento sem mudar a linha de comando
+VARIAVEL_PERFIL = 'AVALIACAO_PERFIL'
+MODOS_PERFIL = ('cprofile', 'tracemalloc')
+
+
+class Metricas:
+    """
+    Registro leve de métricas de uma execução (thread-safe).
+
+    Etapas acumulam chamadas, tempo de parede, tempo de CPU e itens
+    processados; contadores guardam totais como requisições HTTP, 429 e bytes
+    baixados. O custo por etapa é de duas leituras de relógio.
+    """
+
+    def __init__(self):
+        self.inicio = time.time()
+        self.etapas = {}
+        self.contadores = {}
+        self._lock = threading.Lock()
+
+    def registrar_etapa(self, nome, segundos, cpu_segundos, itens=None):
+        with self._lock:
+            etapa = self.etapas.setdefault(nome, {'chamadas': 0, 'segundos': 0.0, 'cpu_segundos': 0.0, 'itens': 0})
+            etapa['chamadas'] += 1
+            etapa['segundos'] += segundos
+            etapa['cpu_segundos'] += cpu_segundos
+            if itens:
+                etapa['itens'] += itens
+
+    def contar(self, **incrementos):
+        with self._lock:
+            for nome, valor in incrementos.items():
+                self.contadores[nome] = self.contadores.get(nome, 0) + valor
+
+    def resumo(self):
+        with self._lock:
+            etapas = {}
+            for nome, e in self.etapas.items():
+                etapas[nome] = {
+                    'chamadas': e['chamadas'],
+                    'segundos': round(e['segundos'], 4),
+                    'cpu_segundos': round(e['cpu_segundos'], 4),
+                }
+                if e['itens']:
+                    etapas[nome]['itens'] = e['itens']
+                    if e['segundos'] > 0:
+                        etapas[nome]['itens_por_segundo'] = round(e['itens'] / e['segundos'], 1)
+            contadores = dict(self.contadores)
+        return {'etapas': etapas, 'contadores': contadores}
+
+
+# Registro global do processo
+METRICAS = Metricas()
+
+
+class _Medicao:
+    """Etapa em andamento; `itens` pode ser definido dentro do bloco"""
+
+    def __init__(self, itens=None):
+        self.itens = itens
+
+
+@contextmanager
+def etapa(nome, itens=None, metricas=None):
+    """
+    Mede o bloco como uma etapa. `itens` (ex.: reviews processadas) permite
+    calcular itens/s e pode ser informado depois: `with etapa('x') as e: ...;
+    e.itens = n`.
+    """
+    metricas = metricas or METRICAS
+    medicao = _Medicao(itens)
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield medicao
+    finally:
+        metricas.registrar_etapa(nome, time.perf_counter() - inicio, time.process_time() - inicio_cpu, medicao.itens)
+
+
+def medido(nome=None):
+    """Decorador que registra cada chamada da função como uma etapa"""
+    def decorador(func):
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def envoltorio(*args, **kwargs):
+            with etapa(rotulo):
+                return func(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def contar(**incrementos):
+    """Incrementa contadores globais (ex.: requisicoes=1, bytes_baixados=n)"""
+    METRICAS.contar(**incrementos)
+
+
+class Perfilador:
+    """
+    Perfilamento opcional da execução inteira: 'cprofile' (funções com maior
+    tempo acumulado) ou 'tracemalloc' (linhas que mais alocaram e pico de
+    memória). Desligado, não tem custo.
+    """
+
+    def __init__(self, modo=None, limite=20):
+        if modo and modo not in MODOS_PERFIL:
+            raise ValueError(f"Modo de perfil inválido: {modo} (use {', '.join(MODOS_PERFIL)})")
+        self.modo = modo
+        self.limite = limite
+        self._perfil = None
+
+    def iniciar(self):
+        if self.modo == 'cprofile':
+            import cProfile
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+        elif self.modo == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.start(10)
+
+    def finalizar(self):
+        """Para o perfilamento e devolve o resumo serializável (ou None)"""
+        if self.modo == 'cprofile' and self._perfil is not None:
+            import pstats
+            self._perfil.disable()
+            estatisticas = pstats.Stats(self._perfil).sort_stats('cumulative')
+            funcoes = []
+            for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in estatisticas.stats.items():
+                funcoes.append({
+                    'funcao': f"{os.path.basename(arquivo)}:{linha}({funcao})",
+                    'chamadas': chamadas,
+                    'tempo_proprio': round(proprio, 4),
+                    'tempo_acumulado': round(acumulado, 4),
+                })
+            funcoes.sort(key=lambda f: -f['tempo_acumulado'])
+            return {'modo': 'cprofile', 'funcoes': funcoes[:self.limite]}
+
+        if self.modo == 'tracemalloc':
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                return None
+            _, pico = tracemalloc.get_traced_memory()
+            linhas = tracemalloc.take_snapshot().statistics('lineno')[:self.limite]
+            tracemalloc.stop()
+            return {
+                'modo': 'tracemalloc',
+                'pico_mb': round(pico / 2**20, 2),
+                'alocacoes': [
+                    {'local': str(s.traceback[0]), 'kb': round(s.size / 1024, 1), 'blocos': s.count}
+                    for s in linhas
+                ],
+            }
+        return None
+
+
+def modo_perfil(argumento=None):
+    """Modo de perfil pedido na linha de comando ou na variável AVALIACAO_PERFIL"""
+    return argumento or os.environ.get(VARIAVEL_PERFIL) or None
+
+
+def adicionar_argumentos(parser):
+    """Opções comuns de instrumentação para os scripts da pipeline"""
+    parser.add_argument('--perfil', choices=MODOS_PERFIL,
+                        help=f'Perfila a execução (também via variável {VARIAVEL_PERFIL})')
+    parser.add_argument('--relatorio', default=CAMINHO_RELATORIO, metavar='ARQUIVO',
+                        help=f'Relatório JSON da execução (padrão: {CAMINHO_RELATORIO})')
+
+
+class Execucao:
+    """
+    Envolve o `main` de um script: liga o perfil pedido e, ao sair, grava o
+    relatório da execução em `caminho`, sob a chave do script. Execuções de
+    outros scripts já presentes no arquivo são mantidas, então coleta,
+    processamento e exportação ficam no mesmo relatório.
+    """
+
+    def __init__(self, script, caminho=CAMINHO_RELATORIO, perfil=None, metricas=None):
+        self.script = script
+        self.caminho = caminho
+        self.perfilador = Perfilador(modo_perfil(perfil))
+        self.metricas = metricas or METRICAS
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        self.perfilador.iniciar()
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        relatorio = self.relatorio(sucesso=tipo is None)
+        self.gravar(relatorio)
+        return False
+
+    def relatorio(self, sucesso=True):
+        perfil = self.perfilador.finalizar()
+        duracao = time.perf_counter() - self._inicio
+        resumo = self.metricas.resumo()
+        contadores = resumo['contadores']
+        if contadores.get('reviews') and duracao > 0:
+            contadores['reviews_por_segundo'] = round(contadores['reviews'] / duracao, 1)
+        relatorio = {
+            'script': self.script,
+            'inicio': datetime.fromtimestamp(self.metricas.inicio).isoformat(timespec='seconds'),
+            'duracao_s': round(duracao, 3),
+            'cpu_s': round(time.process_time() - self._inicio_cpu, 3),
+            'sucesso': sucesso,
+            'python': sys.version.split()[0],
+            'etapas': resumo['etapas'],
+            'contadores': contadores,
+        }
+        if perfil:
+            relatorio['perfil'] = perfil
+        return relatorio
+
+    def gravar(self, relatorio):
+        gravar_relatorio({self.script: relatorio}, self.caminho)
+        print(f"Relatório de execução salvo em '{self.caminho}'")
+
+
+def ler_relatorio(caminho=CAMINHO_RELATORIO):
+    """Execuções registradas em `caminho` ({script: relatório}); vazio se não houver"""
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f).get('execucoes', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar_relatorio(execucoes, caminho=CAMINHO_RELATORIO):
+    """Grava os relatórios {script: relatório} em `caminho`, mantendo os dos outros scripts"""
+    conteudo = {'execucoes': ler_relatorio(caminho)}
+    conteudo['execucoes'].update(execucoes)
+    conteudo['atualizado_em'] = datetime.now().isoformat(timespec='seconds')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(conteudo, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,219 @@
+"""
+Modo em lote: coleta, processa e indexa vários jogos (app IDs) em uma execução.
+
+    coleta        um único ColetorSteam (sessão HTTP, pool de threads e limitador
+                  de taxa compartilhados) pagina todos os pares (appid, idioma)
+    processamento um pool de processos analisa um jogo por tarefa; o casador
+                  de palavras-chave, o tokenizador e o vocabulário são montados
+                  uma vez no import e reaproveitados em todos os jogos que
+                  cada worker processa
+    índice        jogos/indice.json resume todos os jogos e aponta para as
+                  saídas de cada um em jogos/<appid>/; o mesmo índice é
+                  publicado minificado em dados_dashboard/manifesto_jogos.json,
+                  com os dados de cada jogo em um shard próprio
+
+A consolidação multiplataforma (coletar_multiplataforma.py) usa dados
+levantados manualmente para The Vale e não se aplica aos demais jogos; no lote,
+o índice combinado faz esse papel.
+
+Uso:
+    python lote_jogos.py 989790 1000001 1000002
+    python lote_jogos.py --arquivo app_ids.txt --workers 4 --gephi
+    python lote_jogos.py --arquivo app_ids.txt --sem-coleta
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import processar_dados
+from armazenamento import DIRETORIO_REVIEWS, carregar_reviews, existe_armazenamento, salvar_reviews
+from busca_reviews import atualizar_indice
+from coletor_steam import ColetorSteam, STEAM_BASE_URL
+from exportar_gephi import exportar_para_gephi
+from getAvaliacoes_refactored import ColunasReviews, atualizar_estado, carregar_estado, languages, salvar_estado
+from instrumentacao import Execucao, adicionar_argumentos, etapa
+from publicacao import publicar
+from spool_steam import DIRETORIO_SPOOL, ReprodutorSpool, SpoolRespostas
+
+DIRETORIO_JOGOS = 'jogos'
+COLUNAS_ANALISE = ['Horas Jogadas', 'Idioma', 'Review', 'Recomendado']
+
+
+def ler_app_ids(argumentos: List[str], arquivo: Optional[str] = None) -> List[int]:
+    """App IDs da linha de comando e/ou de um arquivo (um por linha, '#' comenta)"""
+    ids = [int(a) for a in argumentos]
+    if arquivo:
+        with open(arquivo, encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.split('#', 1)[0].strip()
+                if linha:
+                    ids.append(int(linha))
+    # Remove repetidos mantendo a ordem
+    return list(dict.fromkeys(ids))
+
+
+def coletar_jogos(appids: List[int], idiomas: List[str], max_workers: int = 8,
+                  diretorio: str = DIRETORIO_REVIEWS, spool: Optional[str] = None, reproduzir: bool = False,
+                  estado_path: str = 'estado_coleta.json', base_url: str = STEAM_BASE_URL) -> Dict[int, int]:
+    """
+    Coleta todos os jogos com um único coletor e grava as reviews de cada um na
+    sua partição do armazenamento. Retorna {appid: reviews salvas}.
+    """
+    if reproduzir:
+        coletor = ReprodutorSpool(SpoolRespostas(spool or DIRETORIO_SPOOL))
+    else:
+        coletor = ColetorSteam(base_url=base_url, max_workers=max_workers,
+                               spool=SpoolRespostas(spool) if spool else None)
+    try:
+        resultados = coletor.coletar(appids, idiomas)
+        incompletos = coletor.incompletos
+    finally:
+        coletor.fechar()
+
+    por_jogo = {appid: ColunasReviews() for appid in appids}
+    for (appid, _), reviews in resultados.items():
+        por_jogo[appid].adicionar(reviews)
+
+    salvas = {}
+    with etapa('salvar_reviews') as medicao:
+        for appid, colunas in por_jogo.items():
+            if not len(colunas):
+                print(f"⚠ Nenhuma review coletada para o App ID {appid}")
+                salvas[appid] = 0
+                continue
+            df = colunas.para_dataframe().drop_duplicates(subset=['ID da Review'], keep='last')
+            salvar_reviews(df, appid, diretorio)
+            atualizar_indice(df, appid)
+            salvas[appid] = len(df)
+        medicao.itens = sum(salvas.values())
+
+    estado = carregar_estado(estado_path)
+    atualizar_estado(estado, resultados, incompletos)
+    salvar_estado(estado, estado_path)
+    return salvas
+
+
+def processar_jogo(appid: int, saida: str = DIRETORIO_JOGOS, diretorio: str = DIRETORIO_REVIEWS,
+                   gephi: bool = False, erro_ngrams: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Tarefa de um jogo: gera jogos/<appid>/dados_processados.json (e os CSVs do
+    Gephi, se pedido) e devolve o resumo usado no índice (None se o jogo não
+    tem reviews no armazenamento).
+    """
+    df = carregar_reviews(COLUNAS_ANALISE, appid=appid, diretorio=diretorio)
+    if df.empty:
+        print(f"⚠ Nenhuma review armazenada para o App ID {appid}")
+        return None
+    pasta = os.path.join(saida, str(appid))
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, 'dados_processados.json')
+    dados = processar_dados.gerar_json_dados(df, erro_ngrams, caminho=caminho)
+    arquivos = {'dados': caminho}
+    if gephi:
+        exportar_para_gephi(appid=appid, diretorio_saida=pasta)
+        arquivos['gephi_nodes'] = os.path.join(pasta, 'gephi_nodes.csv')
+        arquivos['gephi_edges'] = os.path.join(pasta, 'gephi_edges.csv')
+
+    estatisticas = dados['estatisticas']
+    return {
+        'appid': appid,
+        'totalReviews': estatisticas['totalReviews'],
+        'positiveReviews': estatisticas['positiveReviews'],
+        'negativeReviews': estatisticas['negativeReviews'],
+        'avgPlaytime': estatisticas['avgPlaytime'],
+        'aprovacao': round(100 * estatisticas['positiveReviews'] / estatisticas['totalReviews'], 1),
+        'idiomas': estatisticas['languages'],
+        'principaisConceitos': [c['name'] for c in dados['concepts'][:3]],
+        'arquivos': arquivos,
+    }
+
+
+def processar_jogos(appids: List[int], workers: Optional[int] = None, **opcoes: Any) -> List[Dict[str, Any]]:
+    """
+    Processa os jogos em um pool de processos (ou no próprio processo, com
+    workers=1). Os resumos voltam na ordem de `appids`, sem os jogos vazios.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(appids) == 1:
+        resumos = [processar_jogo(appid, **opcoes) for appid in appids]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futuros = [executor.submit(processar_jogo, appid, **opcoes) for appid in appids]
+            resumos = [futuro.result() for futuro in futuros]
+    return [resumo for resumo in resumos if resumo is not None]
+
+
+def salvar_indice(resumos: List[Dict[str, Any]], saida: str = DIRETORIO_JOGOS) -> str:
+    """Grava jogos/indice.json com o resumo de todos os jogos"""
+    caminho = os.path.join(saida, 'indice.json')
+    total = sum(r['totalReviews'] for r in resumos)
+    positivas = sum(r['positiveReviews'] for r in resumos)
+    indice = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'totalJogos': len(resumos),
+        'totalReviews': total,
+        'aprovacaoGeral': round(100 * positivas / total, 1) if total else None,
+        'jogos': resumos,
+    }
+    os.makedirs(saida, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def publicar_indice(resumos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Manifesto do portfólio para o dashboard: resumos inline e um shard por jogo"""
+    secoes = {}
+    for resumo in resumos:
+        with open(resumo['arquivos']['dados'], encoding='utf-8') as f:
+            secoes[f"jogo_{resumo['appid']}"] = json.load(f)
+    jogos = [{k: v for k, v in resumo.items() if k != 'arquivos'} for resumo in resumos]
+    return publicar({'jogos': jogos}, secoes, manifesto='manifesto_jogos.json')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Coleta e processa vários jogos da Steam em uma execução')
+    parser.add_argument('appids', nargs='*', help='App IDs dos jogos')
+    parser.add_argument('--arquivo', help='Arquivo com um App ID por linha')
+    parser.add_argument('--idiomas', default=','.join(languages), help='Idiomas coletados (separados por vírgula)')
+    parser.add_argument('--saida', default=DIRETORIO_JOGOS, help='Diretório das saídas por jogo e do índice')
+    parser.add_argument('--workers', type=int, help='Processos da análise (padrão: número de CPUs)')
+    parser.add_argument('--conexoes', type=int, default=8, help='Threads de coleta (fluxos simultâneos)')
+    parser.add_argument('--gephi', action='store_true', help='Também gera os CSVs do Gephi de cada jogo')
+    parser.add_argument('--ngrams-aproximados', type=float, metavar='ERRO', nargs='?', const=1e-4,
+                        help='Conta n-grams com sketch Count-Min (erro relativo, padrão 1e-4)')
+    parser.add_argument('--sem-coleta', action='store_true', help='Processa apenas o que já está no armazenamento')
+    parser.add_argument('--spool', metavar='DIRETORIO', nargs='?', const=DIRETORIO_SPOOL,
+                        help=f'Grava as respostas brutas da API (padrão: {DIRETORIO_SPOOL})')
+    parser.add_argument('--reproduzir', action='store_true', help='Coleta a partir do spool, sem acessar a API')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    appids = ler_app_ids(args.appids, args.arquivo)
+    if not appids:
+        parser.error('informe ao menos um App ID (argumentos ou --arquivo)')
+    idiomas = [i.strip() for i in args.idiomas.split(',') if i.strip()]
+    if args.sem_coleta and not existe_armazenamento():
+        parser.error(f"--sem-coleta precisa das reviews já coletadas em '{DIRETORIO_REVIEWS}/' "
+                     f"(rode sem essa opção para coletar)")
+
+    with Execucao('lote', args.relatorio, args.perfil):
+        if not args.sem_coleta:
+            print(f"--- Coletando {len(appids)} jogos em {', '.join(idiomas)} ---")
+            salvas = coletar_jogos(appids, idiomas, args.conexoes, spool=args.spool, reproduzir=args.reproduzir)
+            appids = [appid for appid in appids if salvas[appid]]
+
+        print(f"\n--- Processando {len(appids)} jogos ---")
+        with etapa('processar_jogos', itens=len(appids)):
+            resumos = processar_jogos(appids, args.workers, saida=args.saida, gephi=args.gephi,
+                                      erro_ngrams=args.ngrams_aproximados)
+        caminho = salvar_indice(resumos, args.saida)
+        publicar_indice(resumos)
+
+    print(f"\n{'='*50}")
+    for resumo in resumos:
+        print(f"{resumo['appid']:>10}: {resumo['totalReviews']:>7} reviews, {resumo['aprovacao']}% de aprovação")
+    print(f"\nÍndice salvo em '{caminho}'")
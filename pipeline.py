@@ -0,0 +1,318 @@
+"""
+Executor da pipeline: coleta → processamento e exportação para o Gephi →
+consolidação.
+
+Cada etapa declara o script, as entradas (arquivos ou diretórios que lê) e as
+saídas. A ordem sai dessas declarações: uma etapa espera as que produzem
+suas entradas. Etapas independentes rodam ao mesmo tempo, cada uma no seu
+processo. processar_dados.py e exportar_gephi.py, por exemplo, dependem só
+do armazenamento de reviews.
+
+Uma etapa é pulada quando nada mudou desde a última execução bem-sucedida:
+o conteúdo das entradas, o código (o script e os módulos locais que ele
+importa) e os argumentos têm o mesmo hash, e as saídas continuam como ela
+as deixou. Os hashes ficam em estado_pipeline.json. O hash de cada arquivo é
+reaproveitado enquanto o tamanho e o mtime dele não mudam, para não reler o
+armazenamento a cada execução. Etapas que dependem da rede (a coleta e a
+consolidação com --online) sempre rodam.
+
+Cada script grava o próprio relatório em um arquivo temporário, que é
+mesclado ao relatório de execução no fim da etapa. Assim, etapas paralelas
+não disputam o mesmo arquivo. O relatório ganha também a entrada 'pipeline',
+com o tempo de cada etapa.
+
+Uso:
+    python pipeline.py
+    python pipeline.py --coletar --incremental
+    python pipeline.py --forcar processar --opcoes processar="--sentimento --workers 4"
+    python pipeline.py --somente gephi
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from armazenamento import DIRETORIO_REVIEWS
+from busca_reviews import CAMINHO_INDICE
+from fontes_plataformas import DIRETORIO_CACHE_PLATAFORMAS
+from instrumentacao import Execucao, adicionar_argumentos, contar, etapa, gravar_relatorio, ler_relatorio
+from publicacao import DIRETORIO_PUBLICACAO
+
+CAMINHO_ESTADO = 'estado_pipeline.json'
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Fontes das reviews, na ordem de preferência de carregar_dados/exportar_para_gephi
+ENTRADAS_REVIEWS = [DIRETORIO_REVIEWS, 'steam_reviews_the_vale_shadow_of_the_crown.xlsx',
+                    'The Vale - Shadow of the Crown  - reviews - Sheet1.csv']
+
+
+class Etapa:
+    """
+    Um script da pipeline. `rede` marca etapas cujo resultado depende de
+    dados externos: elas nunca são puladas. `relatorio` indica se o script
+    aceita --relatorio (instrumentacao.adicionar_argumentos).
+    """
+
+    def __init__(self, nome: str, script: str, entradas: List[str], saidas: List[str],
+                 rede: bool = False, relatorio: bool = True):
+        self.nome = nome
+        self.script = script
+        self.entradas = entradas
+        self.saidas = saidas
+        self.rede = rede
+        self.relatorio = relatorio
+        self.argumentos: List[str] = []
+
+
+def etapas_padrao() -> Dict[str, Etapa]:
+    return {item.nome: item for item in [
+        Etapa('coleta', 'getAvaliacoes_refactored.py', [],
+              [DIRETORIO_REVIEWS, 'estado_coleta.json', CAMINHO_INDICE], rede=True),
+        Etapa('processar', 'processar_dados.py', ENTRADAS_REVIEWS, ['dados_processados.json']),
+        Etapa('gephi', 'exportar_gephi.py', ENTRADAS_REVIEWS, ['gephi_nodes.csv', 'gephi_edges.csv']),
+        Etapa('consolidar', 'coletar_multiplataforma.py',
+              ['dados_processados.json', CAMINHO_INDICE, DIRETORIO_CACHE_PLATAFORMAS],
+              ['dados_consolidados.json', DIRETORIO_PUBLICACAO], relatorio=False),
+    ]}
+
+
+def dependencias(etapas: Dict[str, Etapa]) -> Dict[str, Set[str]]:
+    """Etapas de que cada etapa depende: as que produzem alguma das suas entradas"""
+    return {
+        nome: {outra.nome for outra in etapas.values()
+               if outra.nome != nome and set(outra.saidas) & set(atual.entradas)}
+        for nome, atual in etapas.items()
+    }
+
+
+def modulos_locais(script: str, raiz: str = RAIZ) -> List[str]:
+    """O script e os módulos do repositório que ele importa, direta ou indiretamente"""
+    vistos, pendentes = set(), [os.path.join(raiz, script)]
+    while pendentes:
+        caminho = pendentes.pop()
+        if caminho in vistos or not os.path.exists(caminho):
+            continue
+        vistos.add(caminho)
+        with open(caminho, encoding='utf-8') as f:
+            arvore = ast.parse(f.read(), caminho)
+        # Inclui os imports dentro de funções (ex.: processar_dados na consolidação)
+        for no in ast.walk(arvore):
+            if isinstance(no, ast.Import):
+                nomes = [alias.name for alias in no.names]
+            elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+                nomes = [no.module]
+            else:
+                continue
+            pendentes.extend(os.path.join(raiz, nome.split('.')[0] + '.py') for nome in nomes)
+    return sorted(vistos)
+
+
+class EstadoPipeline:
+    """
+    Hashes da última execução bem-sucedida de cada etapa e o cache de hashes
+    por arquivo ({caminho: [tamanho, mtime_ns, sha256]}).
+    """
+
+    def __init__(self, caminho: str = CAMINHO_ESTADO):
+        self.caminho = caminho
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, ValueError):
+            conteudo = {}
+        self.etapas: Dict[str, Dict[str, Any]] = conteudo.get('etapas', {})
+        self.arquivos: Dict[str, List[Any]] = conteudo.get('arquivos', {})
+
+    def salvar(self) -> None:
+        with open(self.caminho + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'etapas': self.etapas, 'arquivos': self.arquivos}, f, ensure_ascii=False, indent=2)
+        os.replace(self.caminho + '.tmp', self.caminho)
+
+    def hash_arquivo(self, caminho: str) -> str:
+        info = os.stat(caminho)
+        conhecido = self.arquivos.get(caminho)
+        if conhecido and conhecido[0] == info.st_size and conhecido[1] == info.st_mtime_ns:
+            return conhecido[2]
+        resumo = hashlib.sha256()
+        with open(caminho, 'rb') as f:
+            for parte in iter(lambda: f.read(1 << 20), b''):
+                resumo.update(parte)
+        self.arquivos[caminho] = [info.st_size, info.st_mtime_ns, resumo.hexdigest()]
+        contar(bytes_lidos_hash=info.st_size)
+        return resumo.hexdigest()
+
+    def hash_caminhos(self, caminhos: List[str]) -> str:
+        """Hash do conteúdo de arquivos e diretórios (recursivos); ausentes também contam"""
+        resumo = hashlib.sha256()
+        for caminho in caminhos:
+            if os.path.isdir(caminho):
+                for pasta, subpastas, arquivos in os.walk(caminho):
+                    subpastas.sort()
+                    for arquivo in sorted(arquivos):
+                        completo = os.path.join(pasta, arquivo)
+                        resumo.update(f"{os.path.relpath(completo, caminho)}\0{caminho}\0".encode('utf-8'))
+                        resumo.update(self.hash_arquivo(completo).encode('ascii'))
+            elif os.path.exists(caminho):
+                resumo.update(f"{caminho}\0".encode('utf-8'))
+                resumo.update(self.hash_arquivo(caminho).encode('ascii'))
+            else:
+                resumo.update(f"{caminho}\0ausente\0".encode('utf-8'))
+        return resumo.hexdigest()
+
+    def assinatura(self, etapa: Etapa) -> str:
+        """Hash das entradas, do código e dos argumentos de uma etapa"""
+        resumo = hashlib.sha256()
+        resumo.update(self.hash_caminhos(etapa.entradas).encode('ascii'))
+        resumo.update(self.hash_caminhos(modulos_locais(etapa.script)).encode('ascii'))
+        resumo.update(json.dumps(etapa.argumentos).encode('utf-8'))
+        return resumo.hexdigest()
+
+    def atualizada(self, etapa: Etapa, assinatura: str) -> bool:
+        """A última execução teve a mesma assinatura e as saídas não mudaram desde então"""
+        anterior = self.etapas.get(etapa.nome)
+        return (anterior is not None and anterior['assinatura'] == assinatura
+                and anterior['saidas'] == self.hash_caminhos(etapa.saidas))
+
+    def registrar(self, etapa: Etapa, assinatura: str, duracao: float) -> None:
+        self.etapas[etapa.nome] = {
+            'assinatura': assinatura,
+            'saidas': self.hash_caminhos(etapa.saidas),
+            'executada_em': datetime.now().isoformat(timespec='seconds'),
+            'duracao_s': round(duracao, 3),
+        }
+
+
+def rodar_script(alvo: Etapa, relatorio: Optional[str]) -> int:
+    """Roda o script em outro processo, com a saída prefixada pelo nome da etapa"""
+    comando = [sys.executable, os.path.join(RAIZ, alvo.script), *alvo.argumentos]
+    if relatorio:
+        comando += ['--relatorio', relatorio]
+    with etapa(alvo.nome):
+        processo = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    text=True, env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+        for linha in processo.stdout:
+            print(f"[{alvo.nome}] {linha}", end='', flush=True)
+        return processo.wait()
+
+
+def executar_pipeline(etapas: Dict[str, Etapa], estado: EstadoPipeline, forcar: Set[str],
+                      workers: Optional[int] = None, caminho_relatorio: str = 'relatorio_execucao.json'
+                      ) -> Dict[str, Dict[str, Any]]:
+    """
+    Executa as etapas respeitando as dependências e devolve {etapa: {'situacao',
+    'duracao_s', 'motivo'}}. Uma etapa cuja dependência falhou é cancelada.
+    """
+    requisitos = dependencias(etapas)
+    resultados: Dict[str, Dict[str, Any]] = {}
+    em_andamento: Dict[Future, tuple] = {}
+    temporario = tempfile.mkdtemp(prefix='pipeline_')
+
+    with ThreadPoolExecutor(max_workers=workers or len(etapas)) as executor:
+        while len(resultados) < len(etapas):
+            ativas = {nome for nome, _, _ in em_andamento.values()}
+            resolvidas = len(resultados)
+            for nome, alvo in etapas.items():
+                if nome in resultados or nome in ativas or not requisitos[nome] <= set(resultados):
+                    continue
+                falhas = [r for r in requisitos[nome] if resultados[r]['situacao'] in ('falhou', 'cancelada')]
+                if falhas:
+                    resultados[nome] = {'situacao': 'cancelada', 'duracao_s': 0.0,
+                                        'motivo': f"dependência {', '.join(sorted(falhas))} não concluída"}
+                    continue
+                # As entradas já estão prontas: as etapas que as produzem terminaram
+                inicio = time.perf_counter()
+                assinatura = estado.assinatura(alvo)
+                if not alvo.rede and nome not in forcar and estado.atualizada(alvo, assinatura):
+                    resultados[nome] = {'situacao': 'pulada', 'duracao_s': time.perf_counter() - inicio,
+                                        'motivo': 'entradas, código e saídas inalterados'}
+                    print(f"[{nome}] atualizada, pulando")
+                    continue
+                relatorio = os.path.join(temporario, f'{nome}.json') if alvo.relatorio else None
+                print(f"[{nome}] executando {alvo.script} {' '.join(alvo.argumentos)}".rstrip())
+                futuro = executor.submit(rodar_script, alvo, relatorio)
+                em_andamento[futuro] = (nome, assinatura, inicio)
+            if not em_andamento:
+                if len(resultados) == resolvidas and len(resultados) < len(etapas):
+                    raise ValueError(f"Dependências circulares entre as etapas: {sorted(set(etapas) - set(resultados))}")
+                continue
+
+            prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                nome, assinatura, inicio = em_andamento.pop(futuro)
+                duracao = time.perf_counter() - inicio
+                codigo = futuro.result()
+                if codigo == 0:
+                    estado.registrar(etapas[nome], assinatura, duracao)
+                    estado.salvar()
+                    resultados[nome] = {'situacao': 'executada', 'duracao_s': duracao, 'motivo': None}
+                else:
+                    resultados[nome] = {'situacao': 'falhou', 'duracao_s': duracao,
+                                        'motivo': f"código de saída {codigo}"}
+                relatorio = os.path.join(temporario, f'{nome}.json')
+                if os.path.exists(relatorio):
+                    gravar_relatorio(ler_relatorio(relatorio), caminho_relatorio)
+                    os.remove(relatorio)
+    os.rmdir(temporario)
+    estado.salvar()
+    return resultados
+
+
+def imprimir_resumo(etapas: Dict[str, Etapa], resultados: Dict[str, Dict[str, Any]], duracao: float) -> None:
+    print("\n=== RESUMO DA PIPELINE ===")
+    for nome in etapas:
+        resultado = resultados[nome]
+        motivo = f" ({resultado['motivo']})" if resultado['motivo'] else ''
+        print(f"{nome:<12} {resultado['situacao']:<10} {resultado['duracao_s']:8.2f}s{motivo}")
+    soma = sum(r['duracao_s'] for r in resultados.values())
+    print(f"Total: {duracao:.2f}s (soma das etapas: {soma:.2f}s)")
+
+
+if __name__ == '__main__':
+    padrao = etapas_padrao()
+    parser = argparse.ArgumentParser(description='Executa as etapas da pipeline, pulando as que estão atualizadas')
+    parser.add_argument('--coletar', action='store_true', help='Inclui a coleta das reviews na Steam')
+    parser.add_argument('--incremental', action='store_true', help='Coleta apenas as reviews novas')
+    parser.add_argument('--online', action='store_true', help='Consolida consultando as outras plataformas')
+    parser.add_argument('--somente', action='append', choices=list(padrao), metavar='ETAPA',
+                        help=f"Executa só as etapas indicadas ({', '.join(padrao)}; pode repetir)")
+    parser.add_argument('--forcar', nargs='*', choices=list(padrao), metavar='ETAPA',
+                        help='Executa as etapas mesmo atualizadas (sem nomes: todas)')
+    parser.add_argument('--opcoes', action='append', default=[], metavar='ETAPA="ARGS"',
+                        help='Argumentos extras do script de uma etapa (ex.: processar="--sentimento")')
+    parser.add_argument('--workers', type=int, metavar='N', help='Etapas executadas ao mesmo tempo (padrão: todas)')
+    parser.add_argument('--estado', default=CAMINHO_ESTADO, help=f'Arquivo de estado (padrão: {CAMINHO_ESTADO})')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    nomes = args.somente or [nome for nome in padrao if nome != 'coleta' or args.coletar]
+    etapas = {nome: padrao[nome] for nome in padrao if nome in nomes}
+    for item in args.opcoes:
+        nome, _, extras = item.partition('=')
+        if nome not in etapas:
+            parser.error(f"--opcoes para etapa fora da execução: {nome}")
+        etapas[nome].argumentos += shlex.split(extras)
+    if 'coleta' in etapas and args.incremental:
+        etapas['coleta'].argumentos.append('--incremental')
+    if 'consolidar' in etapas and args.online:
+        etapas['consolidar'].argumentos.append('--online')
+        etapas['consolidar'].rede = True
+    forcar = set(etapas) if args.forcar == [] else set(args.forcar or [])
+
+    inicio = time.perf_counter()
+    with Execucao('pipeline', args.relatorio, args.perfil):
+        resultados = executar_pipeline(etapas, EstadoPipeline(args.estado), forcar, args.workers, args.relatorio)
+        situacoes = [r['situacao'] for r in resultados.values()]
+        contar(etapas_executadas=situacoes.count('executada'), etapas_puladas=situacoes.count('pulada'),
+               etapas_com_falha=situacoes.count('falhou') + situacoes.count('cancelada'))
+    imprimir_resumo(etapas, resultados, time.perf_counter() - inicio)
+    if any(r['situacao'] in ('falhou', 'cancelada') for r in resultados.values()):
+        sys.exit(1)
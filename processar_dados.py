@@ -1,18 +1,88 @@
+import argparse
+import os
+import numpy as np
 import pandas as pd
 import json
-from collections import Counter
-import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
-def carregar_dados():
-    """Carrega os dados do arquivo Excel de avaliações"""
+from armazenamento import APPID_PADRAO, carregar_reviews, diretorio_jogo, existe_armazenamento, ler_em_blocos
+from casamento_conceitos import CasadorConceitos
+from contagem_aproximada import ContadorNgramsAproximado, dimensionar_sketch
+from incidencia import MatrizIncidencia
+from cache_reviews import CAMINHO_CACHE, CacheReviews, versao_de
+from agregados import CAMINHO_AGREGADOS, AgregadosTemporais, parciais_diarios
+from sentimento import CLASSES, MotorSentimento, classificar
+from instrumentacao import Execucao, adicionar_argumentos, contar, etapa, medido
+from topicos import descobrir_topicos
+from duplicatas import (LIMIAR as LIMIAR_DUPLICATAS, MODOS as MODOS_DUPLICATAS, DetectorDuplicatas, anexar_pesos,
+                        descartar_duplicadas, filtrar_duplicatas)
+from resumo_dados import CAMINHO_DADOS, carregar_dados_processados, imprimir_resumo
+from tokenizador import (PADRAO_PALAVRA, STOPWORDS, STOPWORDS_POR_IDIOMA, VOCABULARIO, LoteTokens,
+                         remover_stopwords, tokenizar, tokenizar_lote)
+
+# Palavras-chave relacionadas ao jogo de áudio/acessibilidade
+KEYWORDS_CONCEITOS = {
+    'acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad', 'blind', 'cego', 'visual'],
+    'audio_espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'sonido'],
+    'narrativa': ['story', 'narrative', 'história', 'narrativa', 'historia', 'plot'],
+    'imersao': ['immersive', 'immersion', 'imersivo', 'envolvente', 'inmersivo'],
+    'combate': ['combat', 'fight', 'battle', 'combate', 'luta'],
+    'exploracao': ['exploration', 'explore', 'exploração', 'explorar'],
+    'gameplay': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica'],
+    'qualidade': ['quality', 'qualidade', 'calidad', 'excellent', 'excelente']
+}
+
+# Aspectos avaliados na análise de opinião
+ASPECTOS = {
+    'Qualidade do Áudio': ['audio', 'sound', 'áudio', 'som', 'sonido'],
+    'História': ['story', 'narrative', 'história', 'narrativa', 'historia'],
+    'Jogabilidade': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica'],
+    'Acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad'],
+    'Duração': ['length', 'duration', 'short', 'long', 'duração', 'curto'],
+    'Replay Value': ['replay', 'replayability', 'rejogabilidade']
+}
+
+# Palavras-chave centralizadas (versão estendida usada na co-ocorrência)
+KEYWORDS_COOCORRENCIA = {
+    'acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad', 'blind', 'cego', 'visual'],
+    'audio_espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'sonido', 'binaural', 'hearing'],
+    'narrativa': ['story', 'narrative', 'história', 'narrativa', 'historia', 'plot', 'writing'],
+    'imersao': ['immersive', 'immersion', 'imersivo', 'envolvente', 'inmersivo', 'atmosphere'],
+    'combate': ['combat', 'fight', 'battle', 'combate', 'luta', 'fighting'],
+    'exploracao': ['exploration', 'explore', 'exploração', 'explorar', 'world', 'walking'],
+    'gameplay': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica', 'play'],
+    'qualidade': ['quality', 'qualidade', 'calidad', 'excellent', 'excelente', 'great', 'good', 'best']
+}
+
+# Autômato único construído uma vez a partir da união de todos os mapas
+CASADOR = CasadorConceitos({
+    'conceitos': KEYWORDS_CONCEITOS,
+    'aspectos': ASPECTOS,
+    'coocorrencia': KEYWORDS_COOCORRENCIA
+})
+
+# Sentimento por léxico; a polaridade dos aspectos vem das sentenças que os mencionam
+MOTOR_SENTIMENTO = MotorSentimento(ASPECTOS)
+
+@medido()
+def carregar_dados(colunas=None, appid=APPID_PADRAO):
+    """
+    Carrega as avaliações do jogo `appid`, lendo apenas as `colunas` pedidas
+    quando possível. Usa a partição do jogo no armazenamento Parquet (que pode
+    ter outros jogos do lote_jogos.py); na falta dela, o Excel e por fim o CSV.
+    """
+    if existe_armazenamento(diretorio_jogo(appid)):
+        return carregar_reviews(colunas, appid=appid)
     try:
-        df = pd.read_excel('steam_reviews_the_vale_shadow_of_the_crown.xlsx')
+        df = pd.read_excel('steam_reviews_the_vale_shadow_of_the_crown.xlsx', usecols=colunas)
         return df
     except FileNotFoundError:
         print("Arquivo não encontrado. Tentando arquivo CSV...")
-        df = pd.read_csv('The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+        df = pd.read_csv('The Vale - Shadow of the Crown  - reviews - Sheet1.csv', usecols=colunas)
         return df
 
+@medido()
 def calcular_estatisticas(df):
     """Calcula estatísticas gerais das avaliações"""
     stats = {
@@ -24,6 +94,7 @@ def calcular_estatisticas(df):
     }
     return stats
 
+@medido()
 def analisar_tempo_jogado(df):
     """Analisa a distribuição de tempo jogado"""
     if 'Horas Jogadas' not in df.columns:
@@ -38,184 +109,719 @@ def analisar_tempo_jogado(df):
     }
     return distribuicao
 
-def extrair_conceitos(df):
-    """Extrai conceitos relevantes das reviews usando palavras-chave"""
+@medido()
+def casar_reviews(df, casador=CASADOR):
+    """
+    Percorre cada review uma única vez com o autômato de palavras-chave.
+    Retorna, por review, {mapa: {conceito: ocorrências}}.
+    """
     if 'Review' not in df.columns:
         return []
-    
-    # Palavras-chave relacionadas ao jogo de áudio/acessibilidade
-    keywords = {
-        'acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad', 'blind', 'cego', 'visual'],
-        'audio_espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'sonido'],
-        'narrativa': ['story', 'narrative', 'história', 'narrativa', 'historia', 'plot'],
-        'imersao': ['immersive', 'immersion', 'imersivo', 'envolvente', 'inmersivo'],
-        'combate': ['combat', 'fight', 'battle', 'combate', 'luta'],
-        'exploracao': ['exploration', 'explore', 'exploração', 'explorar'],
-        'gameplay': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica'],
-        'qualidade': ['quality', 'qualidade', 'calidad', 'excellent', 'excelente']
-    }
-    
+    return casador.acertos_em_lote(df['Review'].tolist())
+
+def somar_conceitos(acertos, contador=None):
+    """Soma as ocorrências de cada conceito (parcial mesclável)"""
+    totais = contador if contador is not None else Counter()
+    for acerto in acertos:
+        totais.update(acerto['conceitos'])
+    return totais
+
+def formatar_conceitos(totais):
+    """Top 10 conceitos no formato do dashboard"""
+    # Mantém a ordem do mapa de palavras-chave para desempate
     concept_counts = Counter()
-    
-    # Converte todas as reviews para lowercase para análise
-    reviews_text = ' '.join(df['Review'].astype(str).str.lower())
-    
-    for concept, terms in keywords.items():
-        count = sum(reviews_text.count(term.lower()) for term in terms)
-        if count > 0:
-            concept_counts[concept] = count
+    for concept in KEYWORDS_CONCEITOS:
+        if totais[concept] > 0:
+            concept_counts[concept] = totais[concept]
     
     # Retorna os conceitos ordenados por frequência
-    concepts = [
+    return [
         {'name': name.replace('_', ' ').title(), 'count': count}
         for name, count in concept_counts.most_common(10)
     ]
-    
-    return concepts
 
-def analisar_opiniao_aspectos(df):
-    """Analisa a opinião sobre aspectos específicos do jogo"""
-    if 'Review' not in df.columns or 'Recomendado' not in df.columns:
-        return {}
+@medido()
+def extrair_conceitos(df, acertos=None):
+    """Extrai conceitos relevantes das reviews usando palavras-chave"""
+    if 'Review' not in df.columns:
+        return []
     
-    aspectos = {
-        'Qualidade do Áudio': ['audio', 'sound', 'áudio', 'som', 'sonido'],
-        'História': ['story', 'narrative', 'história', 'narrativa', 'historia'],
-        'Jogabilidade': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica'],
-        'Acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad'],
-        'Duração': ['length', 'duration', 'short', 'long', 'duração', 'curto'],
-        'Replay Value': ['replay', 'replayability', 'rejogabilidade']
-    }
+    if acertos is None:
+        acertos = casar_reviews(df)
     
+    return formatar_conceitos(somar_conceitos(acertos))
+
+def contar_aspectos(acertos, recomendados, mencoes=None, positivas=None):
+    """Conta, por aspecto, as reviews que o mencionam e quantas delas são positivas"""
+    mencoes = mencoes if mencoes is not None else Counter()
+    positivas = positivas if positivas is not None else Counter()
+    for acerto, recomendado in zip(acertos, recomendados):
+        for aspecto in acerto['aspectos']:
+            mencoes[aspecto] += 1
+            if recomendado == True:
+                positivas[aspecto] += 1
+    return mencoes, positivas
+
+def pontuar_aspectos(mencoes, positivas):
+    """Converte as contagens em porcentagem de reviews positivas por aspecto"""
     resultados = {}
     
-    for aspecto, keywords in aspectos.items():
-        # Filtra reviews que mencionam o aspecto
-        mentions = df[df['Review'].str.lower().str.contains('|'.join(keywords), na=False)]
-        
-        if len(mentions) > 0:
+    for aspecto in ASPECTOS:
+        if mencoes[aspecto] > 0:
             # Calcula a porcentagem de reviews positivas que mencionam esse aspecto
-            positive_mentions = mentions[mentions['Recomendado'] == True]
-            score = int((len(positive_mentions) / len(mentions)) * 100)
+            score = int((positivas[aspecto] / mencoes[aspecto]) * 100)
             resultados[aspecto] = score
         else:
             resultados[aspecto] = 50  # Valor neutro se não houver menções
     
     return resultados
 
-def gerar_ngrams(textos, n=2, top_k=10):
-    """Gera N-Grams mais frequentes (bigramas, trigramas)"""
-    ngrams_list = []
+@medido()
+def analisar_opiniao_aspectos(df, acertos=None):
+    """Analisa a opinião sobre aspectos específicos do jogo"""
+    if 'Review' not in df.columns or 'Recomendado' not in df.columns:
+        return {}
+    
+    if acertos is None:
+        acertos = casar_reviews(df)
+    
+    return pontuar_aspectos(*contar_aspectos(acertos, df['Recomendado']))
+
+def _chaves_ngrams(lote, n):
+    """
+    Posição inicial e chave inteira de cada N-Gram do lote que não atravessa a
+    fronteira entre duas reviews. A chave combina os ids em base len(vocabulário);
+    se não couber em 64 bits, as janelas de ids são devolvidas como linhas.
+    """
+    ids = lote.ids.astype(np.int64)
+    m = len(ids) - n + 1
+    if m <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    review = np.repeat(np.arange(len(lote)), np.diff(lote.limites))
+    posicoes = np.flatnonzero(review[:m] == review[n - 1:])
     
-    # Stopwords básicas para limpeza (hardcoded para evitar dependências externas)
-    stopwords = {'a', 'o', 'e', 'de', 'do', 'da', 'em', 'um', 'uma', 'que', 'é', 'com', 'não', 'os', 'as', 'para', 'se', 'na', 'no', 'por', 'mais', 'foi', 'ao', 'dos', 'das', 'seu', 'sua', 'ou', 'ser', 'quando', 'muito', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso', 'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse', 'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às', 'minha', 'têm', 'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas', 'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas', 'teu', 'tua', 'teus', 'tuas', 'nosso', 'nossa', 'nossos', 'nossas', 'dela', 'delas', 'esta', 'estes', 'estas', 'aquele', 'aquela', 'aqueles', 'aquelas', 'isto', 'aquilo', 'estou', 'está', 'estamos', 'estão', 'estive', 'esteve', 'estivemos', 'estiveram', 'estava', 'estávamos', 'estavam', 'estivera', 'estivéramos', 'esteja', 'ejamos', 'estejam', 'estivesse', 'estivéssemos', 'estivessem', 'estiver', 'estivermos', 'estiverem', 'hei', 'há', 'havemos', 'hão', 'houve', 'houvemos', 'houveram', 'houvera', 'houvéramos', 'haja', 'hajamos', 'hajam', 'houvesse', 'houvéssemos', 'houvessem', 'houver', 'houvermos', 'houverem', 'houverei', 'houverá', 'houveremos', 'houverão', 'houveria', 'houveríamos', 'houveriam', 'sou', 'somos', 'são', 'era', 'éramos', 'eram', 'fui', 'foi', 'fomos', 'foram', 'fora', 'foramos', 'seja', 'sejamos', 'sejam', 'fosse', 'fôssemos', 'fossem', 'for', 'formos', 'forem', 'serei', 'será', 'seremos', 'serão', 'seria', 'seríamos', 'seriam', 'tenho', 'tem', 'temos', 'tém', 'tinha', 'tínhamos', 'tinham', 'tive', 'teve', 'tivemos', 'tiveram', 'tivera', 'tivéramos', 'tenha', 'tenhamos', 'tenham', 'tivesse', 'tivéssemos', 'tivessem', 'tiver', 'tivermos', 'tiverem', 'terei', 'terá', 'teremos', 'terão', 'teria', 'teríamos', 'teriam', 'the', 'and', 'of', 'to', 'a', 'in', 'is', 'it', 'you', 'that', 'for', 'on', 'with', 'as', 'was', 'are', 'this', 'but', 'be', 'have', 'not', 'an', 'at', 'or', 'if', 'from', 'my', 'all', 'so', 'me', 'by', 'one', 'can', 'just', 'like', 'about', 'very', 'out', 'what', 'game'}
+    base = max(len(lote.vocabulario), 1)
+    if base ** n < 2 ** 63:
+        chaves = np.zeros(len(posicoes), dtype=np.int64)
+        for k in range(n):
+            chaves = chaves * base + ids[posicoes + k]
+    else:
+        chaves = np.stack([ids[posicoes + k] for k in range(n)], axis=1)
+    return posicoes, chaves
 
-    for texto in textos:
-        if not isinstance(texto, str): continue
-        # Limpeza básica
-        palavras = re.findall(r'\b[a-z]{3,}\b', texto.lower())
-        palavras = [p for p in palavras if p not in stopwords]
-        
-        # Gerar n-grams
-        for i in range(len(palavras) - n + 1):
-            ngram = ' '.join(palavras[i:i+n])
-            ngrams_list.append(ngram)
-            
-    counts = Counter(ngrams_list)
+def contar_ngrams_lote(lote, n=2, contador=None, pesos=None):
+    """
+    Conta os N-Grams de um tokenizador.LoteTokens, atualizando `contador` se
+    fornecido. O contador pode ser um Counter (exato) ou um
+    ContadorNgramsAproximado. Com `pesos` (um por review, só na contagem
+    exata), cada ocorrência soma o peso da sua review.
+    
+    A contagem exata é feita com numpy sobre os ids; os N-Grams entram no
+    Counter na ordem da primeira ocorrência, como na contagem review a review,
+    o que preserva o desempate de `most_common`.
+    """
+    counts = contador if contador is not None else Counter()
+    if isinstance(counts, ContadorNgramsAproximado):
+        counts.adicionar_lote(lote)
+        return counts
+    
+    posicoes, chaves = _chaves_ngrams(lote, n)
+    if len(posicoes) == 0:
+        return counts
+    _, primeira, inversa, contagens = np.unique(chaves, axis=0, return_index=True, return_inverse=True,
+                                                return_counts=True)
+    if pesos is not None:
+        review = np.repeat(np.arange(len(lote)), np.diff(lote.limites))[posicoes]
+        contagens = np.bincount(inversa.ravel(), weights=np.asarray(pesos, dtype=np.float64)[review])
+    ordem = np.argsort(primeira)
+    
+    palavras = lote.vocabulario.palavras
+    tokens = [palavras[t] for t in lote.ids.tolist()]
+    textos = [' '.join(tokens[inicio:inicio + n]) for inicio in posicoes[primeira[ordem]].tolist()]
+    counts.update(dict(zip(textos, contagens[ordem].tolist())))
+    
+    return counts
+
+def contar_ngrams(textos, n=2, contador=None):
+    """Conta os N-Grams dos textos, atualizando `contador` se fornecido"""
+    return contar_ngrams_lote(tokenizar_lote([t for t in textos if isinstance(t, str)]), n, contador)
+
+def criar_contador_aproximado(n, erro_relativo):
+    """Contador Count-Min cujo erro por N-Gram fica abaixo de `erro_relativo` × total"""
+    largura, profundidade = dimensionar_sketch(erro_relativo)
+    return ContadorNgramsAproximado(n, largura, profundidade)
+
+@medido()
+def gerar_ngrams(textos, n=2, top_k=10, erro_relativo=None):
+    """
+    Gera N-Grams mais frequentes (bigramas, trigramas).
+    Com `erro_relativo`, usa contagem aproximada (Count-Min + candidatos), com
+    memória fixa determinada pelo erro aceito.
+    """
+    contador = criar_contador_aproximado(n, erro_relativo) if erro_relativo else None
+    counts = contar_ngrams(textos, n, contador)
     return [{'text': gram, 'value': count} for gram, count in counts.most_common(top_k)]
 
-def analisar_coocorrencia(df, keywords):
+def contar_coocorrencias(acertos, keywords=KEYWORDS_COOCORRENCIA, contador=None, pesos=None):
     """
-    Analisa quais conceitos aparecem juntos nas mesmas reviews.
-    Retorna uma matriz de adjacência (lista de arestas para grafo).
+    Conta os pares de conceitos presentes na mesma review (parcial mesclável).
+    Os pares saem do produto Xᵀ·X da matriz de incidência review × conceito;
+    com `pesos`, cada review soma o seu peso em vez de 1.
     """
-    if 'Review' not in df.columns: return []
+    coocorrencias = contador if contador is not None else Counter()
     
-    coocorrencias = Counter()
+    incidencia = MatrizIncidencia.de_acertos(acertos, keywords, 'coocorrencia')
+    for (source, target), weight in incidencia.contar_pares(pesos).items():
+        coocorrencias[f"{source}|{target}"] += weight
     
-    for review in df['Review'].astype(str).str.lower():
-        conceitos_presentes = []
-        for concept, terms in keywords.items():
-            if any(term in review for term in terms):
-                conceitos_presentes.append(concept)
-        
-        # Se houver mais de um conceito, gera pares
-        if len(conceitos_presentes) > 1:
-            # Ordena para garantir que (A, B) seja igual a (B, A)
-            conceitos_presentes.sort()
-            for i in range(len(conceitos_presentes)):
-                for j in range(i + 1, len(conceitos_presentes)):
-                    pair = f"{conceitos_presentes[i]}|{conceitos_presentes[j]}"
-                    coocorrencias[pair] += 1
-                    
-    # Formata para visualização de grafo
+    return coocorrencias
+
+def _valor(contagem):
+    """Contagens ponderadas (ver duplicatas.anexar_pesos) saem com 2 casas decimais"""
+    return round(contagem, 2) if isinstance(contagem, float) else contagem
+
+def formatar_arestas(coocorrencias, top_k=15):
+    """Formata os pares mais frequentes para visualização de grafo"""
     edges = []
-    for pair, weight in coocorrencias.most_common(15):
+    for pair, weight in coocorrencias.most_common(top_k):
         source, target = pair.split('|')
         edges.append({
             'source': source.replace('_', ' ').title(),
             'target': target.replace('_', ' ').title(),
-            'weight': weight
+            'weight': _valor(weight)
         })
         
     return edges
 
-def gerar_json_dados(df):
-    """Gera um arquivo JSON com todos os dados processados"""
-    
-    # Palavras-chave centralizadas
-    keywords = {
-        'acessibilidade': ['accessibility', 'accessible', 'acessibilidade', 'accesibilidad', 'blind', 'cego', 'visual'],
-        'audio_espacial': ['spatial audio', 'sound design', 'áudio espacial', 'audio', 'som', 'sonido', 'binaural', 'hearing'],
-        'narrativa': ['story', 'narrative', 'história', 'narrativa', 'historia', 'plot', 'writing'],
-        'imersao': ['immersive', 'immersion', 'imersivo', 'envolvente', 'inmersivo', 'atmosphere'],
-        'combate': ['combat', 'fight', 'battle', 'combate', 'luta', 'fighting'],
-        'exploracao': ['exploration', 'explore', 'exploração', 'explorar', 'world', 'walking'],
-        'gameplay': ['gameplay', 'mechanics', 'jogabilidade', 'mecânica', 'play'],
-        'qualidade': ['quality', 'qualidade', 'calidad', 'excellent', 'excelente', 'great', 'good', 'best']
-    }
+@medido()
+def analisar_coocorrencia(df, keywords=KEYWORDS_COOCORRENCIA, acertos=None):
+    """
+    Analisa quais conceitos aparecem juntos nas mesmas reviews.
+    Retorna uma matriz de adjacência (lista de arestas para grafo).
+    """
+    if 'Review' not in df.columns: return []
+    
+    if acertos is None:
+        casador = CASADOR if keywords is KEYWORDS_COOCORRENCIA else CasadorConceitos({'coocorrencia': keywords})
+        acertos = casar_reviews(df, casador)
+    
+    return formatar_arestas(contar_coocorrencias(acertos, keywords))
 
-    raw_reviews = df['Review'].astype(str).tolist() if 'Review' in df.columns else []
-
-    dados = {
-        'estatisticas': calcular_estatisticas(df),
-        'playtimeDistribution': analisar_tempo_jogado(df),
-        'concepts': extrair_conceitos(df), # Reutiliza a lógica existente mas poderia ser atualizada para usar 'keywords' local se desejado
-        'opinions': analisar_opiniao_aspectos(df),
-        # Novos campos de análise aprofundada
-        'ngramas': {
-            'bigramas': gerar_ngrams(raw_reviews, n=2, top_k=15),
-            'trigramas': gerar_ngrams(raw_reviews, n=3, top_k=10)
-        },
-        'coocorrencia': analisar_coocorrencia(df, keywords)
+# Identifica os mapas/stopwords/tokenização usados; muda a chave do cache
+VERSAO_ANALISE = versao_de(KEYWORDS_CONCEITOS, ASPECTOS, KEYWORDS_COOCORRENCIA,
+                           STOPWORDS, STOPWORDS_POR_IDIOMA, PADRAO_PALAVRA.pattern, 'ids')
+
+def analisar_reviews(valores, vocabulario=VOCABULARIO):
+    """
+    Resultado por review que não depende das demais: acertos de palavras-chave e
+    ids (int32, em bytes) de todas as palavras no `vocabulario`, ainda com as
+    stopwords, que dependem do idioma e saem depois (remover_stopwords). É a
+    unidade guardada no cache de reviews, com o vocabulário do próprio cache.
+    """
+    acertos = CASADOR.acertos_em_lote(valores)
+    return [
+        {'acertos': acerto, 'ids': vocabulario.ids(tokenizar(str(valor), frozenset())).tobytes()}
+        for acerto, valor in zip(acertos, valores)
+    ]
+
+def abrir_cache(caminho=CAMINHO_CACHE, max_entradas=1_000_000):
+    """Cache persistente das análises por review (ver cache_reviews.CacheReviews)"""
+    return CacheReviews('processar', VERSAO_ANALISE, caminho, max_entradas)
+
+class AcumuladorAnalise:
+    """
+    Acumuladores mescláveis de todas as análises de `gerar_json_dados`.
+
+    Cada bloco de reviews atualiza contadores (conceitos, aspectos, n-grams,
+    co-ocorrências), somas (estatísticas) e faixas de tempo jogado; o bloco pode
+    ser descartado em seguida. Dois acumuladores podem ser mesclados com
+    `mesclar`, e `resultado` produz o mesmo dicionário da versão em memória.
+
+    Com `erro_ngrams`, bigramas e trigramas são contados de forma aproximada
+    (Count-Min), com memória fixa dimensionada por esse erro relativo. Com
+    `cache`, a análise de cada review é reaproveitada de execuções anteriores
+    e só as reviews novas ou alteradas são processadas. Com `por_dia`, cada
+    bloco também gera os parciais diários de agregados.AgregadosTemporais.
+
+    Com `sentimento`, as reviews passam pelo MotorSentimento e a pontuação dos
+    aspectos usa a polaridade das sentenças que os mencionam, em vez da
+    recomendação da review; `cache_sentimento` guarda essas pontuações.
+
+    Blocos com a coluna 'Peso' (duplicatas.anexar_pesos) têm os n-grams e as
+    co-ocorrências ponderados por ela, para que um grupo de reviews copiadas
+    conte como uma review só.
+    """
+
+    FAIXAS = ['0-2h', '2-5h', '5-10h', '10+h']
+
+    def __init__(self, erro_ngrams=None, cache=None, por_dia=False, sentimento=False, cache_sentimento=None):
+        self.cache = cache
+        self.por_dia = por_dia
+        self.sentimento = sentimento
+        self.cache_sentimento = cache_sentimento
+        self.parciais = []
+        self.colunas = set()
+        self.total = 0
+        self.positivas = 0
+        self.soma_minutos = 0
+        self.n_minutos = 0
+        self.idiomas = Counter()
+        self.faixas = Counter()
+        self.conceitos = Counter()
+        self.mencoes_aspectos = Counter()
+        self.positivas_aspectos = Counter()
+        if erro_ngrams:
+            self.bigramas = criar_contador_aproximado(2, erro_ngrams)
+            self.trigramas = criar_contador_aproximado(3, erro_ngrams)
+        else:
+            self.bigramas = Counter()
+            self.trigramas = Counter()
+        self.coocorrencias = Counter()
+        self.classes_reviews = Counter()
+        self.soma_polaridade = 0.0
+        # (aspecto, classe) -> reviews
+        self.classes_aspectos = Counter()
+        # Reviews com sentimento não neutro e quantas concordam com a recomendação
+        self.concordancia = Counter()
+        # id no vocabulário do cache -> id no VOCABULARIO do processo
+        self._mapa_cache = np.zeros(0, dtype=np.int32)
+
+    def contar_sentimento(self, resultados, recomendados=None):
+        """Soma as classes de sentimento das reviews e dos aspectos mencionados"""
+        classes = [classificar(r['polaridade']) for r in resultados]
+        self.classes_reviews.update(classes)
+        self.soma_polaridade += sum(r['polaridade'] for r in resultados)
+        for r in resultados:
+            self.classes_aspectos.update((aspecto, classificar(p)) for aspecto, p in r['aspectos'].items())
+        if recomendados is not None:
+            for classe, recomendado in zip(classes, recomendados):
+                if classe != 'neutro':
+                    self.concordancia['polares'] += 1
+                    self.concordancia['concordam'] += (classe == 'positivo') == (recomendado == True)
+
+    def _tokens_do_cache(self, analises):
+        """LoteTokens (VOCABULARIO do processo) com os ids guardados no cache"""
+        origem = self.cache.vocabulario
+        if len(self._mapa_cache) < len(origem):
+            novas = VOCABULARIO.ids(origem.palavras[len(self._mapa_cache):])
+            self._mapa_cache = np.concatenate([self._mapa_cache, novas])
+        arrays = [np.frombuffer(a['ids'], dtype=np.int32) for a in analises]
+        limites = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in arrays], out=limites[1:])
+        ids = self._mapa_cache[np.concatenate(arrays)] if arrays else np.zeros(0, dtype=np.int32)
+        return LoteTokens(ids, limites)
+
+    def atualizar(self, df):
+        """Incorpora um bloco de reviews"""
+        self.colunas.update(df.columns)
+        self.total += len(df)
+        n = len(df)
+        contar(reviews=n)
+        
+        with etapa('estatisticas', itens=n):
+            if 'Recomendado' in df.columns:
+                self.positivas += int(df['Recomendado'].sum())
+            if 'Horas Jogadas' in df.columns:
+                self.soma_minutos += df['Horas Jogadas'].sum()
+                self.n_minutos += int(df['Horas Jogadas'].count())
+                horas = df['Horas Jogadas'] / 60
+                self.faixas.update({
+                    '0-2h': int((horas <= 2).sum()),
+                    '2-5h': int(((horas > 2) & (horas <= 5)).sum()),
+                    '5-10h': int(((horas > 5) & (horas <= 10)).sum()),
+                    '10+h': int((horas > 10).sum())
+                })
+            if 'Idioma' in df.columns:
+                self.idiomas.update({k: int(v) for k, v in df['Idioma'].value_counts().items() if v > 0})
+        
+        if 'Review' in df.columns:
+            valores = df['Review'].tolist()
+            # Stopwords do idioma de cada review (sem a coluna, o conjunto de todos)
+            idiomas = df['Idioma'].tolist() if 'Idioma' in df.columns else [None] * n
+            if self.cache is not None:
+                with etapa('cache_reviews', itens=n):
+                    vocabulario = self.cache.vocabulario
+                    analises = self.cache.resolver(valores, lambda v: analisar_reviews(v, vocabulario))
+                    acertos = [a['acertos'] for a in analises]
+                    tokens = remover_stopwords(self._tokens_do_cache(analises), idiomas)
+            else:
+                with etapa('casamento_conceitos', itens=n):
+                    acertos = CASADOR.acertos_em_lote(valores)
+                with etapa('tokenizacao', itens=n):
+                    tokens = tokenizar_lote([str(v) for v in valores], idiomas=idiomas)
+            
+            with etapa('conceitos_aspectos', itens=n):
+                somar_conceitos(acertos, self.conceitos)
+                if 'Recomendado' in df.columns:
+                    contar_aspectos(acertos, df['Recomendado'], self.mencoes_aspectos, self.positivas_aspectos)
+            pesos = df['Peso'].to_numpy() if 'Peso' in df.columns else None
+            with etapa('coocorrencia', itens=n):
+                contar_coocorrencias(acertos, KEYWORDS_COOCORRENCIA, self.coocorrencias, pesos)
+            
+            with etapa('ngrams', itens=n):
+                contar_ngrams_lote(tokens, 2, self.bigramas, pesos)
+                contar_ngrams_lote(tokens, 3, self.trigramas, pesos)
+            
+            if self.sentimento:
+                with etapa('sentimento', itens=n):
+                    self.contar_sentimento(MOTOR_SENTIMENTO.analisar(valores, self.cache_sentimento, idiomas),
+                                           df['Recomendado'] if 'Recomendado' in df.columns else None)
+        else:
+            acertos = None
+        
+        if self.por_dia and 'Data da Review' in df.columns:
+            with etapa('agregados_diarios', itens=n):
+                self.parciais.append(parciais_diarios(df, acertos))
+        return self
+
+    def mesclar(self, outro):
+        """Soma os parciais de outro acumulador a este"""
+        self.colunas |= outro.colunas
+        self.total += outro.total
+        self.positivas += outro.positivas
+        self.soma_minutos += outro.soma_minutos
+        self.n_minutos += outro.n_minutos
+        self.soma_polaridade += outro.soma_polaridade
+        self.parciais.extend(outro.parciais)
+        for nome in ('idiomas', 'faixas', 'conceitos', 'mencoes_aspectos', 'positivas_aspectos',
+                     'coocorrencias', 'classes_reviews', 'classes_aspectos', 'concordancia'):
+            getattr(self, nome).update(getattr(outro, nome))
+        for nome in ('bigramas', 'trigramas'):
+            contador = getattr(self, nome)
+            if isinstance(contador, ContadorNgramsAproximado):
+                contador.mesclar(getattr(outro, nome))
+            else:
+                contador.update(getattr(outro, nome))
+        return self
+
+    @classmethod
+    def de_totais(cls, totais):
+        """Acumulador montado a partir dos totais de uma janela de AgregadosTemporais"""
+        acumulador = cls()
+        acumulador.total = totais['reviews']
+        acumulador.positivas = totais['positivas']
+        acumulador.soma_minutos = totais['soma_minutos']
+        acumulador.n_minutos = totais['n_minutos']
+        acumulador.faixas = totais['faixa']
+        acumulador.idiomas = totais['idioma']
+        acumulador.conceitos = totais['conceito']
+        acumulador.mencoes_aspectos = totais['mencoes_aspecto']
+        acumulador.positivas_aspectos = totais['positivas_aspecto']
+        acumulador.colunas = {'Recomendado', 'Horas Jogadas', 'Idioma', 'Review'}
+        return acumulador
+
+    def resultado(self):
+        """Dicionário final no formato de dados_processados.json"""
+        tem_recomendado = 'Recomendado' in self.colunas
+        tem_horas = 'Horas Jogadas' in self.colunas
+        tem_review = 'Review' in self.colunas
+        media_minutos = np.float64(self.soma_minutos) / self.n_minutos if self.n_minutos else np.nan
+        
+        dados = {
+            'estatisticas': {
+                'totalReviews': self.total,
+                'positiveReviews': self.positivas if tem_recomendado else 0,
+                'negativeReviews': self.total - (self.positivas if tem_recomendado else 0),
+                'avgPlaytime': float(round(media_minutos / 60, 2)) if tem_horas else 0,
+                'languages': dict(self.idiomas.most_common()) if 'Idioma' in self.colunas else {}
+            },
+            'playtimeDistribution': {f: self.faixas[f] for f in self.FAIXAS} if tem_horas else {},
+            'concepts': formatar_conceitos(self.conceitos) if tem_review else [],
+            'opinions': pontuar_aspectos(self.mencoes_aspectos, self.positivas_aspectos) if tem_review and tem_recomendado else {},
+            # Novos campos de análise aprofundada
+            'ngramas': {
+                'bigramas': [{'text': g, 'value': _valor(c)} for g, c in self.bigramas.most_common(15)],
+                'trigramas': [{'text': g, 'value': _valor(c)} for g, c in self.trigramas.most_common(10)]
+            },
+            'coocorrencia': formatar_arestas(self.coocorrencias) if tem_review else []
+        }
+        if self.sentimento and tem_review:
+            dados['opinions'] = self.pontuar_aspectos_sentimento()
+            dados['sentimento'] = self.resumo_sentimento()
+        return dados
+
+    def pontuar_aspectos_sentimento(self):
+        """% de menções positivas entre as polarizadas (neutras não contam)"""
+        positivas, polarizadas = Counter(), Counter()
+        for (aspecto, classe), n in self.classes_aspectos.items():
+            if classe != 'neutro':
+                polarizadas[aspecto] += n
+                positivas[aspecto] += n if classe == 'positivo' else 0
+        return pontuar_aspectos(polarizadas, positivas)
+
+    def resumo_sentimento(self):
+        """Distribuição das classes de sentimento por review e por aspecto"""
+        polares = self.concordancia['polares']
+        return {
+            'reviews': {classe: self.classes_reviews[classe] for classe in CLASSES},
+            'polaridadeMedia': round(self.soma_polaridade / self.total, 3) if self.total else 0.0,
+            # Quanto o texto concorda com o polegar da review (só reviews não neutras)
+            'concordanciaRecomendacao': round(100 * self.concordancia['concordam'] / polares, 1) if polares else None,
+            'aspectos': {
+                aspecto: {classe: self.classes_aspectos[(aspecto, classe)] for classe in CLASSES}
+                for aspecto in ASPECTOS
+            }
+        }
+
+def gerar_tendencias(agregados, dias=30):
+    """Série mensal e semanal e resumo dos últimos `dias` a partir dos agregados diários"""
+    recentes = AcumuladorAnalise.de_totais(agregados.ultimos_dias(dias)).resultado()
+    return {
+        'mensal': agregados.serie('M'),
+        'semanal': agregados.serie('W'),
+        f'ultimos{dias}Dias': {chave: recentes[chave] for chave in
+                              ('estatisticas', 'playtimeDistribution', 'concepts', 'opinions')}
     }
-    
-    with open('dados_processados.json', 'w', encoding='utf-8') as f:
+
+def atualizar_agregados(df, caminho=CAMINHO_AGREGADOS, reconstruir=False):
+    """
+    Recalcula os dias presentes em `df` na camada de agregados salva. `df` deve
+    conter todas as reviews desses dias (ex.: após mesclar uma coleta incremental).
+    Com `reconstruir`, os agregados passam a ter só os dias de `df` (coleta completa).
+    """
+    agregados = AgregadosTemporais(VERSAO_ANALISE) if reconstruir else AgregadosTemporais.carregar(caminho, VERSAO_ANALISE)
+    acertos = CASADOR.acertos_em_lote(df['Review'].tolist()) if 'Review' in df.columns else None
+    agregados.substituir(parciais_diarios(df, acertos)).salvar(caminho)
+    return agregados
+
+def gerar_json_agregados(agregados, caminho=CAMINHO_DADOS):
+    """
+    Atualiza as estatísticas e as tendências de `caminho` a partir dos agregados
+    diários salvos, sem reler as reviews. N-grams, co-ocorrências, sentimento e
+    tópicos não estão nos agregados e ficam como no JSON anterior (se houver).
+    """
+    totais = AcumuladorAnalise.de_totais(agregados.totais()).resultado()
+    try:
+        dados = carregar_dados_processados(caminho)
+    except OSError:
+        dados = totais
+    secoes = ['estatisticas', 'playtimeDistribution', 'concepts']
+    if 'sentimento' not in dados:
+        # Com --sentimento, os aspectos são pontuados pelo texto, que os agregados não têm
+        secoes.append('opinions')
+    dados.update({secao: totais[secao] for secao in secoes})
+    dados['tendencias'] = gerar_tendencias(agregados)
+    salvar_json_dados(dados, caminho)
+    return dados
+
+def salvar_json_dados(dados, caminho=CAMINHO_DADOS):
+    with open(caminho, 'w', encoding='utf-8') as f:
         json.dump(dados, f, ensure_ascii=False, indent=2)
     
-    print("Dados processados salvos em 'dados_processados.json'")
+    print(f"Dados processados salvos em '{caminho}'")
+
+def relacionar_topicos(topicos):
+    """
+    Marca em cada tópico descoberto os conceitos e aspectos fixos cujas
+    palavras-chave são termos dele. A comparação é por palavra inteira ('som'
+    não casa com "awesome"), e palavras-chave de duas palavras ("sound
+    design") casam com pares de termos vizinhos. Tópicos sem nenhum dos dois
+    são temas novos (`novo`).
+    """
+    for topico in topicos:
+        termos = topico['termos']
+        candidatos = set(termos) | {f'{a} {b}' for a, b in zip(termos, termos[1:])}
+        topico['conceitos'] = [nome for nome, palavras in KEYWORDS_CONCEITOS.items()
+                               if any(p in candidatos for p in palavras)]
+        topico['aspectos'] = [nome for nome, palavras in ASPECTOS.items()
+                              if any(p in candidatos for p in palavras)]
+        topico['novo'] = not topico['conceitos'] and not topico['aspectos']
+    return topicos
+
+def _finalizar(acumulador, agregados, caminho=CAMINHO_DADOS, topicos=None, duplicatas=None):
+    """
+    Resultado do acumulador (com as tendências, se houver agregados, os
+    tópicos descobertos e o resumo do DetectorDuplicatas, se houver) salvo em JSON
+    """
+    dados = acumulador.resultado()
+    if agregados is not None:
+        agregados.substituir(acumulador.parciais)
+        dados['tendencias'] = gerar_tendencias(agregados)
+    if topicos is not None:
+        dados['topicos'] = relacionar_topicos(topicos)
+    if duplicatas is not None:
+        dados['duplicatas'] = duplicatas.resumo()
+    salvar_json_dados(dados, caminho)
     return dados
 
+@medido()
+def gerar_json_dados(df, erro_ngrams=None, cache=None, caminho=CAMINHO_DADOS, agregados=None,
+                     sentimento=False, cache_sentimento=None, topicos=None, duplicatas=None):
+    """
+    Gera um arquivo JSON com todos os dados processados. Com `agregados`
+    (AgregadosTemporais), os dias das reviews são materializados nele e o JSON
+    ganha as tendências temporais. Com `sentimento`, inclui a análise de
+    sentimento e pontua os aspectos por ela. `topicos` (ver
+    topicos.descobrir_topicos) entra no JSON ao lado dos conceitos fixos, e
+    `duplicatas` (DetectorDuplicatas usado para filtrar ou ponderar `df`), o
+    resumo das quase duplicatas.
+    """
+    acumulador = AcumuladorAnalise(erro_ngrams, cache, agregados is not None, sentimento,
+                                   cache_sentimento).atualizar(df)
+    return _finalizar(acumulador, agregados, caminho, topicos, duplicatas)
+
+@medido()
+def gerar_json_dados_streaming(blocos, erro_ngrams=None, cache=None, agregados=None, sentimento=False,
+                               cache_sentimento=None, topicos=None, duplicatas=None):
+    """
+    Versão em fluxo de `gerar_json_dados`: consome um iterável de DataFrames
+    (ver armazenamento.ler_em_blocos) e mantém em memória apenas um bloco por
+    vez mais os acumuladores.
+    """
+    acumulador = AcumuladorAnalise(erro_ngrams, cache, agregados is not None, sentimento, cache_sentimento)
+    for i, bloco in enumerate(blocos, 1):
+        acumulador.atualizar(bloco)
+        print(f"Bloco {i}: {acumulador.total} reviews processadas")
+    
+    return _finalizar(acumulador, agregados, topicos=topicos, duplicatas=duplicatas)
+
+def dividir_em_blocos(df, tamanho_bloco):
+    """Fatias consecutivas de `df` com até `tamanho_bloco` linhas"""
+    for inicio in range(0, len(df), tamanho_bloco):
+        yield df.iloc[inicio:inicio + tamanho_bloco]
+
+def _analisar_bloco(bloco, erro_ngrams, por_dia=False, sentimento=False):
+    """Tarefa do worker: acumuladores parciais de um bloco"""
+    return AcumuladorAnalise(erro_ngrams, por_dia=por_dia, sentimento=sentimento).atualizar(bloco)
+
+@medido()
+def gerar_json_dados_paralelo(blocos, workers=None, erro_ngrams=None, agregados=None, sentimento=False,
+                              topicos=None, duplicatas=None):
+    """
+    Versão multiprocesso de `gerar_json_dados`: cada bloco é analisado em um
+    processo do pool e os acumuladores parciais são mesclados na ordem dos
+    blocos, o que mantém o resultado idêntico ao da execução serial.
+    No máximo 2 × workers blocos ficam em trânsito ao mesmo tempo.
+    """
+    workers = workers or os.cpu_count() or 1
+    por_dia = agregados is not None
+    acumulador = AcumuladorAnalise(erro_ngrams, por_dia=por_dia, sentimento=sentimento)
+    pendentes = deque()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for bloco in blocos:
+            pendentes.append(executor.submit(_analisar_bloco, bloco, erro_ngrams, por_dia, sentimento))
+            if len(pendentes) >= 2 * workers:
+                acumulador.mesclar(pendentes.popleft().result())
+                print(f"{acumulador.total} reviews processadas")
+        while pendentes:
+            acumulador.mesclar(pendentes.popleft().result())
+    
+    # As etapas internas rodam nos workers; aqui só entra o total de reviews
+    contar(reviews=acumulador.total)
+    print(f"Total: {acumulador.total} reviews em {workers} processos")
+    return _finalizar(acumulador, agregados, topicos=topicos, duplicatas=duplicatas)
+
 if __name__ == '__main__':
-    print("Carregando dados...")
-    df = carregar_dados()
-    print(f"Total de reviews carregadas: {len(df)}")
-    
-    print("\nProcessando dados...")
-    dados = gerar_json_dados(df)
-    
-    print("\n=== ESTATÍSTICAS GERAIS ===")
-    print(f"Total de Reviews: {dados['estatisticas']['totalReviews']}")
-    print(f"Reviews Positivas: {dados['estatisticas']['positiveReviews']}")
-    print(f"Reviews Negativas: {dados['estatisticas']['negativeReviews']}")
-    print(f"Tempo Médio Jogado: {dados['estatisticas']['avgPlaytime']}h")
-    
-    print("\n=== CONCEITOS MAIS RELEVANTES ===")
-    for conceito in dados['concepts'][:5]:
-        print(f"- {conceito['name']}: {conceito['count']} menções")
-    
-    print("\n=== AVALIAÇÃO DE ASPECTOS ===")
-    for aspecto, score in dados['opinions'].items():
-        print(f"- {aspecto}: {score}%")
+    parser = argparse.ArgumentParser(description='Processa as reviews e gera dados_processados.json')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Lê as reviews em blocos para manter a memória limitada ao tamanho do bloco')
+    parser.add_argument('--entrada', help='Diretório Parquet, .csv ou .jsonl usado no modo streaming')
+    parser.add_argument('--bloco', type=int, default=50_000, help='Reviews por bloco no modo streaming')
+    parser.add_argument('--appid', type=int, default=APPID_PADRAO,
+                        help=f'Jogo lido do armazenamento Parquet (padrão: {APPID_PADRAO})')
+    parser.add_argument('--ngrams-aproximados', type=float, metavar='ERRO', nargs='?', const=1e-4,
+                        help='Conta n-grams com sketch Count-Min de memória fixa (erro relativo, padrão 1e-4)')
+    parser.add_argument('--workers', type=int, nargs='?', const=0, metavar='N',
+                        help='Analisa os blocos em N processos (padrão: número de CPUs)')
+    parser.add_argument('--cache', metavar='ARQUIVO', nargs='?', const=CAMINHO_CACHE,
+                        help=f'Reaproveita a análise por review de execuções anteriores (padrão: {CAMINHO_CACHE})')
+    parser.add_argument('--cache-max', type=int, default=1_000_000, metavar='N',
+                        help='Número máximo de reviews mantidas no cache')
+    parser.add_argument('--agregados', metavar='ARQUIVO', nargs='?', const=CAMINHO_AGREGADOS,
+                        help=f'Materializa agregados diários e inclui tendências no JSON (padrão: {CAMINHO_AGREGADOS})')
+    parser.add_argument('--de-agregados', metavar='ARQUIVO', nargs='?', const=CAMINHO_AGREGADOS,
+                        help='Atualiza as estatísticas e as tendências do JSON a partir dos agregados diários '
+                             f'salvos, sem reler as reviews (padrão: {CAMINHO_AGREGADOS})')
+    parser.add_argument('--sentimento', action='store_true',
+                        help='Analisa o sentimento do texto (léxico offline) e pontua os aspectos por ele')
+    parser.add_argument('--topicos', type=int, nargs='?', const=8, metavar='K',
+                        help='Descobre K tópicos no texto das reviews (TF-IDF + k-means em mini-lotes, padrão 8)')
+    parser.add_argument('--duplicatas', choices=MODOS_DUPLICATAS,
+                        help='Reviews quase duplicadas (MinHash + LSH): excluir as cópias ou ponderar '
+                             'n-grams e co-ocorrências por 1/tamanho do grupo')
+    parser.add_argument('--limiar-duplicatas', type=float, default=LIMIAR_DUPLICATAS, metavar='J',
+                        help=f'Similaridade de Jaccard mínima entre quase duplicatas (padrão: {LIMIAR_DUPLICATAS})')
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+    if args.cache and args.workers is not None:
+        parser.error('--cache não pode ser combinado com --workers')
+    if args.duplicatas == 'ponderar' and args.ngrams_aproximados:
+        parser.error('--duplicatas ponderar não pode ser combinado com --ngrams-aproximados')
+    if args.de_agregados and (args.agregados or args.streaming or args.workers is not None or args.cache):
+        parser.error('--de-agregados não relê as reviews e não pode ser combinado com '
+                     '--agregados, --streaming, --workers ou --cache')
+    with Execucao('processamento', args.relatorio, args.perfil):
+        cache = abrir_cache(args.cache, args.cache_max) if args.cache else None
+        cache_sentimento = MOTOR_SENTIMENTO.abrir_cache(args.cache, args.cache_max) if args.cache and args.sentimento else None
+        # Processamento completo: os agregados são reconstruídos do zero
+        agregados = AgregadosTemporais(VERSAO_ANALISE) if args.agregados else None
+        detector = DetectorDuplicatas(args.limiar_duplicatas) if args.duplicatas else None
+
+        if args.de_agregados:
+            # Só os agregados salvos: as reviews não são relidas
+            salvos = AgregadosTemporais.carregar(args.de_agregados, VERSAO_ANALISE)
+            if not salvos.dias:
+                parser.error(f"sem agregados válidos em '{args.de_agregados}'; gere-os com --agregados")
+            dados = gerar_json_agregados(salvos)
+        elif args.streaming:
+            particao = diretorio_jogo(args.appid)
+            entrada = args.entrada or (particao if existe_armazenamento(particao) else 'The Vale - Shadow of the Crown  - reviews - Sheet1.csv')
+            print(f"Processando {entrada} em blocos de {args.bloco} reviews...")
+            colunas_topicos = ['Review', 'Recomendado', 'Idioma']
+            fonte_topicos = lambda: ler_em_blocos(entrada, args.bloco, colunas_topicos)
+            blocos = ler_em_blocos(entrada, args.bloco)
+            if args.duplicatas == 'excluir' and not args.topicos:
+                # Uma passada só: cada review é comparada com as anteriores ao entrar
+                blocos = filtrar_duplicatas(blocos, detector)
+            elif args.duplicatas:
+                # O peso depende do grupo inteiro, e os tópicos (ajustados em várias
+                # passadas) precisam das cópias já marcadas: uma passada antes só com o texto
+                for bloco in ler_em_blocos(entrada, args.bloco, ['Review']):
+                    detector.adicionar(bloco['Review'].tolist())
+                if args.duplicatas == 'excluir':
+                    duplicadas = detector.duplicadas()
+                    # Como no modo em memória, os tópicos são ajustados sem as cópias
+                    fonte_topicos = lambda: descartar_duplicadas(ler_em_blocos(entrada, args.bloco, colunas_topicos),
+                                                                 duplicadas)
+                    blocos = descartar_duplicadas(blocos, duplicadas)
+                else:
+                    blocos = anexar_pesos(blocos, detector.pesos())
+            # Os tópicos são ajustados antes, em passadas próprias só com o texto
+            topicos = descobrir_topicos(fonte_topicos, args.topicos) if args.topicos else None
+            if args.workers is not None:
+                dados = gerar_json_dados_paralelo(blocos, args.workers or None, args.ngrams_aproximados, agregados,
+                                                  args.sentimento, topicos, detector)
+            else:
+                dados = gerar_json_dados_streaming(blocos, args.ngrams_aproximados, cache, agregados,
+                                                   args.sentimento, cache_sentimento, topicos, detector)
+        else:
+            print("Carregando dados...")
+            df = carregar_dados(appid=args.appid)
+            print(f"Total de reviews carregadas: {len(df)}")
+            if args.duplicatas:
+                anteriores = detector.adicionar(df['Review'].tolist())
+                df = df[anteriores < 0] if args.duplicatas == 'excluir' else df.assign(Peso=detector.pesos())
+        
+            print("\nProcessando dados...")
+            topicos = descobrir_topicos(lambda: dividir_em_blocos(df, args.bloco), args.topicos) if args.topicos else None
+            if args.workers is not None:
+                dados = gerar_json_dados_paralelo(dividir_em_blocos(df, args.bloco), args.workers or None,
+                                                  args.ngrams_aproximados, agregados, args.sentimento, topicos,
+                                                  detector)
+            else:
+                dados = gerar_json_dados(df, args.ngrams_aproximados, cache, agregados=agregados,
+                                         sentimento=args.sentimento, cache_sentimento=cache_sentimento,
+                                         topicos=topicos, duplicatas=detector)
+    
+        if cache is not None:
+            cache.fechar()
+        if cache_sentimento is not None:
+            cache_sentimento.fechar()
+        if agregados is not None:
+            agregados.salvar(args.agregados)
+            print(f"Agregados diários ({agregados.dias} dias) salvos em '{args.agregados}'")
+    
+    imprimir_resumo(dados, args.duplicatas)
     
     print("\nProcessamento concluído! Abra 'index.html' no navegador.")
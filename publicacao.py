@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+
+DIRETORIO_PUBLICACAO = 'dados_dashboard'
+MANIFESTO = 'manifesto.json'
+# Subpasta dos shards: nomes com hash de conteúdo, servidos com cache imutável (ver vercel.json).
+# Não há variantes pré-comprimidas: o host comprime as respostas (gzip/brotli) sozinho.
+SUBDIRETORIO_SECOES = 'secoes'
+
+
+def json_compacto(dados):
+    """JSON minificado (sem indentação nem espaços após separadores)"""
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':'))
+
+
+def _gravar(caminho, conteudo):
+    """Grava em `caminho`.tmp e renomeia: uma execução interrompida não deixa arquivo truncado"""
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def gravar_shard(nome, dados, diretorio=DIRETORIO_PUBLICACAO):
+    """
+    Grava uma seção como `secoes/<nome>.<hash>.json`.
+    O hash vem do conteúdo: o mesmo dado gera o mesmo arquivo, e qualquer
+    mudança gera um nome novo. Devolve a entrada do manifesto.
+    """
+    conteudo = json_compacto(dados).encode('utf-8')
+    resumo = hashlib.sha256(conteudo).hexdigest()[:12]
+    pasta = os.path.join(diretorio, SUBDIRETORIO_SECOES)
+    os.makedirs(pasta, exist_ok=True)
+    arquivo = f"{nome}.{resumo}.json"
+    caminho = os.path.join(pasta, arquivo)
+
+    # Gravação atômica: um shard do tamanho certo veio completo de uma execução anterior
+    if not os.path.exists(caminho) or os.path.getsize(caminho) != len(conteudo):
+        _gravar(caminho, conteudo)
+
+    return {'arquivo': f"{SUBDIRETORIO_SECOES}/{arquivo}", 'bytes': len(conteudo)}
+
+
+def limpar_shards(referenciados, diretorio=DIRETORIO_PUBLICACAO):
+    """Remove os shards que nenhum manifesto referencia mais (e sobras de gravações interrompidas)"""
+    pasta = os.path.join(diretorio, SUBDIRETORIO_SECOES)
+    if not os.path.isdir(pasta):
+        return 0
+    removidos = 0
+    for arquivo in os.listdir(pasta):
+        # Entram também os .tmp e as antigas variantes .gz/.br, que nenhum manifesto cita
+        if arquivo not in referenciados:
+            os.remove(os.path.join(pasta, arquivo))
+            removidos += 1
+    return removidos
+
+
+def referenciados_nos_manifestos(diretorio=DIRETORIO_PUBLICACAO):
+    """Nomes dos shards citados por qualquer manifesto*.json do diretório"""
+    nomes = set()
+    for arquivo in os.listdir(diretorio):
+        if arquivo.startswith('manifesto') and arquivo.endswith('.json'):
+            with open(os.path.join(diretorio, arquivo), encoding='utf-8') as f:
+                manifesto = json.load(f)
+            pilha = [manifesto]
+            while pilha:
+                item = pilha.pop()
+                if isinstance(item, dict):
+                    if 'arquivo' in item and isinstance(item['arquivo'], str):
+                        nomes.add(os.path.basename(item['arquivo']))
+                    pilha.extend(item.values())
+                elif isinstance(item, list):
+                    pilha.extend(item)
+    return nomes
+
+
+def publicar(inline, secoes, diretorio=DIRETORIO_PUBLICACAO, manifesto=MANIFESTO):
+    """
+    Publica os dados do dashboard em partes: `inline` (dados pequenos exibidos
+    de imediato) vai no próprio manifesto e cada item de `secoes` vira um shard
+    com hash de conteúdo, baixado sob demanda. O manifesto tem nome fixo e é o
+    único arquivo que precisa ser revalidado pelo navegador.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    entradas = {nome: gravar_shard(nome, dados, diretorio) for nome, dados in secoes.items()}
+    conteudo = dict(inline)
+    conteudo['secoes'] = entradas
+    caminho = os.path.join(diretorio, manifesto)
+    _gravar(caminho, json_compacto(conteudo).encode('utf-8'))
+
+    removidos = limpar_shards(referenciados_nos_manifestos(diretorio), diretorio)
+    total = sum(e['bytes'] for e in entradas.values())
+    print(f"✓ Manifesto '{caminho}' com {len(entradas)} seções ({total / 1024:.1f} KiB minificados"
+          f"{f', {removidos} arquivos antigos removidos' if removidos else ''})")
+    return conteudo
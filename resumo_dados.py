@@ -0,0 +1,53 @@
+"""
+Resumo de dados_processados.json no terminal.
+
+Só usa a biblioteca padrão: `python cli.py resumo` reimprime o resumo de um
+processamento anterior sem carregar pandas nem o resto da pipeline.
+"""
+import json
+from typing import Any, Dict, Optional
+
+CAMINHO_DADOS = 'dados_processados.json'
+
+
+def carregar_dados_processados(caminho: str = CAMINHO_DADOS) -> Dict[str, Any]:
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def imprimir_resumo(dados: Dict[str, Any], modo_duplicatas: Optional[str] = None) -> None:
+    """Estatísticas, conceitos, aspectos e as seções opcionais presentes em `dados`"""
+    print("\n=== ESTATÍSTICAS GERAIS ===")
+    print(f"Total de Reviews: {dados['estatisticas']['totalReviews']}")
+    print(f"Reviews Positivas: {dados['estatisticas']['positiveReviews']}")
+    print(f"Reviews Negativas: {dados['estatisticas']['negativeReviews']}")
+    print(f"Tempo Médio Jogado: {dados['estatisticas']['avgPlaytime']}h")
+
+    print("\n=== CONCEITOS MAIS RELEVANTES ===")
+    for conceito in dados['concepts'][:5]:
+        print(f"- {conceito['name']}: {conceito['count']} menções")
+
+    print("\n=== AVALIAÇÃO DE ASPECTOS ===")
+    for aspecto, score in dados['opinions'].items():
+        print(f"- {aspecto}: {score}%")
+
+    if 'sentimento' in dados:
+        reviews = dados['sentimento']['reviews']
+        print("\n=== SENTIMENTO DO TEXTO ===")
+        print(f"Positivas: {reviews['positivo']}, neutras: {reviews['neutro']}, negativas: {reviews['negativo']}")
+        print(f"Concordância com a recomendação: {dados['sentimento']['concordanciaRecomendacao']}%")
+
+    if 'duplicatas' in dados:
+        resumo = dados['duplicatas']
+        # O modo (excluir/ponderar) não fica no JSON; só aparece logo após o processamento
+        modo = f"; modo: {modo_duplicatas}" if modo_duplicatas else ''
+        print("\n=== QUASE DUPLICATAS ===")
+        print(f"{resumo['duplicadas']} de {resumo['reviews']} reviews repetem uma anterior "
+              f"({resumo['grupos']} grupos, maior com {resumo['maiorGrupo']}){modo}")
+
+    if 'topicos' in dados:
+        print("\n=== TÓPICOS DESCOBERTOS ===")
+        for topico in dados['topicos']:
+            relacao = ', '.join(topico['conceitos'] + topico['aspectos']) or 'novo'
+            print(f"- {' '.join(topico['termos'][:6])}: {topico['reviews']} reviews, "
+                  f"{topico['recomendadas']}% recomendam ({relacao})")
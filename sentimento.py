@@ -0,0 +1,352 @@
+"""
+Análise de sentimento offline por léxico (português, inglês e espanhol).
+
+Cada review é dividida em sentenças; as palavras recebem a valência do léxico,
+ajustada por intensificadores ("muito bom"), negação até 3 palavras antes
+("not good", "não é bom") e contraste ("bom, mas curto": o trecho depois do
+"mas" pesa mais). A soma por sentença é normalizada para [-1, 1] como no
+VADER. Um aspecto recebe a polaridade das sentenças da review que o mencionam.
+
+Tudo roda na CPU, sem rede nem modelo externo, e o lote inteiro é pontuado
+com numpy sobre ids de palavras (uma tabela de valências indexada pelo id).
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from cache_reviews import CAMINHO_CACHE, CacheReviews, versao_de
+from tokenizador import Vocabulario
+
+# Valências de -3 (muito negativo) a 3 (muito positivo)
+LEXICO_EN = {
+    'amazing': 3, 'awesome': 3, 'brilliant': 3, 'excellent': 3, 'fantastic': 3, 'incredible': 3,
+    'masterpiece': 3, 'outstanding': 3, 'perfect': 3, 'phenomenal': 3, 'superb': 3, 'wonderful': 3,
+    'best': 3, 'love': 3, 'loved': 3, 'triumph': 3, 'groundbreaking': 3, 'revolutionary': 2.5,
+    'great': 2.5, 'beautiful': 2.5, 'stunning': 2.5, 'impressive': 2.5, 'gorgeous': 2.5, 'favorite': 2.5,
+    'good': 2, 'nice': 2, 'enjoy': 2, 'enjoyed': 2, 'enjoyable': 2, 'fun': 2, 'immersive': 2,
+    'engaging': 2, 'compelling': 2, 'innovative': 2, 'unique': 1.5, 'recommend': 2, 'recommended': 2,
+    'worth': 1.5, 'special': 1.5, 'solid': 1.5, 'polished': 1.5, 'charming': 2, 'memorable': 2,
+    'liked': 1.5, 'interesting': 1.5, 'creative': 1.5, 'accessible': 1.5, 'inclusive': 1.5,
+    'better': 1.5, 'happy': 2, 'glad': 1.5, 'satisfying': 2, 'ambitious': 1, 'succeeds': 2,
+    'intuitive': 1.5, 'cool': 1.5, 'thank': 1.5, 'thanks': 1.5, 'engaged': 1.5, 'entertaining': 2,
+    'bad': -2.5, 'boring': -2.5, 'awful': -3, 'terrible': -3, 'horrible': -3, 'worst': -3, 'hate': -3,
+    'hated': -3, 'garbage': -3, 'trash': -3, 'waste': -2.5, 'disappointing': -2.5, 'disappointed': -2.5,
+    'disappointment': -2.5, 'poor': -2, 'broken': -2.5, 'buggy': -2, 'bug': -1.5, 'bugs': -1.5,
+    'glitch': -1.5, 'glitches': -1.5, 'crash': -2, 'crashes': -2, 'crashed': -2, 'annoying': -2,
+    'frustrating': -2, 'frustrated': -2, 'repetitive': -1.5, 'tedious': -2, 'confusing': -1.5,
+    'confused': -1.5, 'dull': -2, 'mediocre': -1.5, 'weak': -1.5, 'short': -1, 'overpriced': -2,
+    'expensive': -1, 'problem': -1.5, 'problems': -1.5, 'issue': -1, 'issues': -1, 'flaw': -1.5,
+    'flaws': -1.5, 'lacking': -1.5, 'lacks': -1.5, 'unplayable': -3, 'refund': -2, 'refunded': -2,
+    'worse': -2, 'difficult': -0.5, 'hard': -0.5, 'clunky': -1.5, 'slow': -1, 'stuck': -1,
+    'meh': -1, 'dislike': -2, 'disliked': -2, 'unfortunately': -1.5, 'sadly': -1, 'sad': -1, 'fail': -2, 'fails': -2, 'failed': -2,
+}
+
+LEXICO_PT = {
+    'incrível': 3, 'incríveis': 3, 'excelente': 3, 'excelentes': 3, 'perfeito': 3, 'fantástico': 3,
+    'maravilhoso': 3, 'sensacional': 3, 'espetacular': 3, 'magnífico': 3, 'obra-prima': 3, 'amei': 3,
+    'amo': 3, 'adorei': 3, 'melhor': 2.5, 'melhores': 2.5, 'lindo': 2.5, 'ótimo': 2.5, 'impressionante': 2.5,
+    'bom': 2, 'bons': 2, 'boa': 2, 'boas': 2, 'legal': 2, 'gostei': 2, 'divertido': 2, 'imersivo': 2,
+    'envolvente': 2, 'envolventes': 2, 'inovador': 2, 'recomendo': 2, 'bonito': 2, 'único': 1.5,
+    'interessante': 1.5, 'interessantes': 1.5, 'criativo': 1.5, 'acessível': 1.5, 'acessíveis': 1.5,
+    'bem': 1, 'feliz': 2, 'satisfatório': 2, 'emocionante': 2, 'agradável': 1.5,
+    'obrigado': 1.5, 'parabéns': 2.5, 'gosto': 1, 'bacana': 2, 'top': 2,
+    'ruim': -2.5, 'ruins': -2.5, 'chato': -2.5, 'entediante': -2.5, 'péssimo': -3, 'horrível': -3,
+    'terrível': -3, 'pior': -3, 'odiei': -3, 'lixo': -3, 'decepcionante': -2.5, 'decepção': -2.5,
+    'decepcionado': -2.5, 'fraco': -1.5, 'bugado': -2, 'bug': -1.5, 'bugs': -1.5, 'travando': -2,
+    'trava': -1.5, 'irritante': -2, 'frustrante': -2, 'repetitivo': -1.5, 'cansativo': -2, 'confuso': -1.5,
+    'curto': -1, 'caro': -1, 'problema': -1.5, 'problemas': -1.5, 'falha': -1.5, 'falhas': -1.5,
+    'difícil': -0.5, 'lento': -1, 'infelizmente': -1.5, 'triste': -1, 'mediano': -1,
+    'defeito': -1.5, 'defeitos': -1.5, 'desperdício': -2.5, 'reembolso': -2,
+}
+
+LEXICO_ES = {
+    'increíble': 3, 'increíbles': 3, 'excelente': 3, 'perfecto': 3, 'fantástico': 3, 'maravilloso': 3,
+    'espectacular': 3, 'encantó': 3, 'mejor': 2.5, 'mejores': 2.5, 'genial': 2.5,
+    'hermoso': 2.5, 'precioso': 2.5, 'impresionante': 2.5, 'bueno': 2, 'buenos': 2, 'buena': 2,
+    'buenas': 2, 'gustó': 2, 'divertido': 2, 'inmersivo': 2, 'inmersiva': 2, 'innovador': 2,
+    'recomiendo': 2, 'bonito': 2, 'único': 1.5, 'interesante': 1.5, 'interesantes': 1.5, 'creativo': 1.5,
+    'accesible': 1.5, 'bien': 1, 'feliz': 2, 'emocionante': 2, 'agradable': 1.5, 'gracias': 1.5,
+    'malo': -2.5, 'malos': -2.5, 'mala': -2.5, 'aburrido': -2.5, 'pésimo': -3, 'horrible': -3,
+    'terrible': -3, 'peor': -3, 'odio': -3, 'basura': -3, 'decepcionante': -2.5, 'decepción': -2.5,
+    'débil': -1.5, 'bug': -1.5, 'bugs': -1.5, 'molesto': -2, 'frustrante': -2, 'repetitivo': -1.5,
+    'tedioso': -2, 'confuso': -1.5, 'corto': -1, 'caro': -1, 'problema': -1.5, 'problemas': -1.5,
+    'fallo': -1.5, 'fallos': -1.5, 'difícil': -0.5, 'lento': -1, 'desafortunadamente': -1.5,
+    'lamentablemente': -1.5, 'triste': -1, 'reembolso': -2,
+}
+
+NEGADORES_EN = frozenset({
+    'not', 'no', 'never', 'none', 'nothing', 'neither', 'nor', 'without', 'hardly', 'barely', 'cannot',
+    "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't", "can't", "couldn't", "won't",
+    "wouldn't", "shouldn't", "ain't", 'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'cant', 'wont',
+})
+# Sem 'no': em português é "em + o" ("o áudio no jogo é incrível")
+NEGADORES_PT = frozenset({'não', 'nao', 'nunca', 'nem', 'nenhum', 'nenhuma', 'sem', 'jamais'})
+NEGADORES_ES = frozenset({'no', 'nunca', 'ni', 'ningún', 'ninguno', 'ninguna', 'sin', 'jamás', 'tampoco'})
+
+# Negadores pelo idioma da review (mesmas chaves de STOPWORDS_POR_IDIOMA)
+NEGADORES_POR_IDIOMA = {
+    'brazilian': NEGADORES_PT,
+    'portuguese': NEGADORES_PT,
+    'english': NEGADORES_EN,
+    'spanish': NEGADORES_ES,
+    'latam': NEGADORES_ES,
+}
+
+# Conjunto usado quando o idioma da review é desconhecido ou não é considerado
+NEGADORES = NEGADORES_EN | NEGADORES_PT | NEGADORES_ES
+
+# Multiplicadores da palavra seguinte
+INTENSIFICADORES = {
+    'very': 1.3, 'really': 1.3, 'so': 1.2, 'extremely': 1.5, 'incredibly': 1.5, 'super': 1.3,
+    'truly': 1.3, 'absolutely': 1.5, 'totally': 1.3, 'highly': 1.3, 'pretty': 1.1, 'quite': 1.1,
+    'muito': 1.3, 'muita': 1.3, 'bem': 1.2, 'extremamente': 1.5, 'bastante': 1.2, 'realmente': 1.3,
+    'totalmente': 1.3, 'muy': 1.3, 'mucho': 1.3, 'tan': 1.2, 'extremadamente': 1.5,
+    'slightly': 0.6, 'somewhat': 0.7, 'bit': 0.6, 'little': 0.7, 'kinda': 0.7,
+    'pouco': 0.6, 'meio': 0.7, 'levemente': 0.6, 'poco': 0.6, 'algo': 0.7,
+}
+
+# Depois de uma conjunção adversativa o trecho pesa 1,5x e o anterior 0,5x
+CONTRASTES = frozenset({'but', 'however', 'yet', 'mas', 'porém', 'contudo', 'entretanto', 'pero', 'aunque'})
+
+
+def _flexionar(lexico, excecoes=frozenset({'caro'})):
+    """Acrescenta feminino e plural dos adjetivos terminados em -o (ex.: fraco -> fraca, fracos, fracas)"""
+    flexionado = dict(lexico)
+    for palavra, valencia in lexico.items():
+        if palavra.endswith('o') and palavra not in excecoes:
+            for forma in (palavra[:-1] + 'a', palavra + 's', palavra[:-1] + 'as'):
+                flexionado.setdefault(forma, valencia)
+    return flexionado
+
+
+LEXICO = {**LEXICO_EN, **_flexionar(LEXICO_PT), **_flexionar(LEXICO_ES)}
+
+FATOR_NEGACAO = -0.74
+JANELA_NEGACAO = 3
+# Normalização da soma de valências para [-1, 1] (constante do VADER)
+ALFA = 15.0
+# Polaridades com |p| abaixo disto são neutras
+LIMIAR = 0.05
+
+# Palavras, fins de sentença e o separador de reviews ('\x00') em uma única passada
+PADRAO_TOKEN = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?(?:-[^\W\d_]+)?|\x00|[.!?;\n]+")
+SEPARADOR_REVIEWS = '\x00'
+_FIM_SENTENCA = frozenset('.!?;\n')
+
+CLASSES = ('positivo', 'neutro', 'negativo')
+
+
+def normalizar(soma):
+    """Soma de valências -> polaridade em [-1, 1]"""
+    soma = np.asarray(soma, dtype=np.float64)
+    return soma / np.sqrt(soma * soma + ALFA)
+
+
+def classificar(polaridade):
+    if polaridade >= LIMIAR:
+        return 'positivo'
+    if polaridade <= -LIMIAR:
+        return 'negativo'
+    return 'neutro'
+
+
+class MotorSentimento:
+    """
+    Pontuador de sentimento por léxico, em lote.
+
+    `analisar_lote(textos, idiomas)` devolve, por review, {'polaridade': p,
+    'aspectos': {aspecto: p}}, com p em [-1, 1]; só entram os aspectos
+    mencionados. A negação usa os negadores do idioma de cada review
+    (NEGADORES_POR_IDIOMA); sem `idiomas`, ou fora do mapa, NEGADORES. O lote
+    é tokenizado com uma única regex sobre os textos concatenados; as tabelas
+    (valência, negação, intensificador, contraste, aspectos de cada palavra)
+    são arrays indexados pelo id da palavra e crescem com o vocabulário.
+
+    Os termos de aspecto casam como substring dentro das palavras (ex.: 'sound'
+    em 'soundtrack'), a mesma regra do CasadorConceitos para termos de uma
+    palavra; termos com espaço não são aceitos.
+    """
+
+    def __init__(self, aspectos: Optional[Dict[str, List[str]]] = None, lexico: Dict[str, float] = LEXICO):
+        aspectos = aspectos or {}
+        compostos = [t for termos in aspectos.values() for t in termos if not t.isalpha()]
+        if compostos:
+            raise ValueError(f"Termos de aspecto devem ser uma única palavra: {compostos}")
+        self.aspectos = list(aspectos)
+        self._termos_aspectos = [[t.lower() for t in termos] for termos in aspectos.values()]
+        self.lexico = {p.lower(): float(v) for p, v in lexico.items()}
+        self.vocabulario = Vocabulario()
+        # Coluna 0 da tabela de negação: NEGADORES; as outras, um conjunto por idioma
+        self._conjuntos_negacao = [NEGADORES] + list(dict.fromkeys(NEGADORES_POR_IDIOMA.values()))
+        self._grupo_idioma = {idioma: self._conjuntos_negacao.index(conjunto)
+                              for idioma, conjunto in NEGADORES_POR_IDIOMA.items()}
+        self.versao = versao_de(self.lexico, {i: sorted(c) for i, c in NEGADORES_POR_IDIOMA.items()},
+                                sorted(NEGADORES), INTENSIFICADORES, sorted(CONTRASTES),
+                                FATOR_NEGACAO, JANELA_NEGACAO, ALFA, LIMIAR, PADRAO_TOKEN.pattern, aspectos)
+        self._valencias = np.zeros(0, dtype=np.float64)
+        self._multiplicadores = np.zeros(0, dtype=np.float64)
+        self._negadores = np.zeros((0, len(self._conjuntos_negacao)), dtype=bool)
+        self._contrastes = np.zeros(0, dtype=bool)
+        self._fins = np.zeros(0, dtype=bool)
+        self._separadores = np.zeros(0, dtype=bool)
+        self._aspectos_palavra = np.zeros((0, len(self.aspectos)), dtype=bool)
+
+    def _tabelas(self):
+        """Estende as tabelas por id para as palavras novas do vocabulário"""
+        inicio = len(self._valencias)
+        novas = self.vocabulario.palavras[inicio:]
+        if not novas:
+            return
+        self._valencias = np.concatenate([self._valencias, [self.lexico.get(p, 0.0) for p in novas]])
+        self._multiplicadores = np.concatenate([self._multiplicadores, [INTENSIFICADORES.get(p, 1.0) for p in novas]])
+        negadores = np.array([[p in conjunto for conjunto in self._conjuntos_negacao] for p in novas],
+                             dtype=bool).reshape(len(novas), len(self._conjuntos_negacao))
+        self._negadores = np.concatenate([self._negadores, negadores])
+        self._contrastes = np.concatenate([self._contrastes, [p in CONTRASTES for p in novas]])
+        self._separadores = np.concatenate([self._separadores, [p == SEPARADOR_REVIEWS for p in novas]])
+        self._fins = np.concatenate([self._fins, [p == SEPARADOR_REVIEWS or p[0] in _FIM_SENTENCA for p in novas]])
+        mencoes = np.array([[any(t in p for t in termos) for termos in self._termos_aspectos] for p in novas],
+                           dtype=bool).reshape(len(novas), len(self.aspectos))
+        self._aspectos_palavra = np.concatenate([self._aspectos_palavra, mencoes])
+
+    def _ids(self, tokens: List[str]) -> np.ndarray:
+        """Ids dos tokens, internando as palavras novas na ordem de aparição"""
+        indices = self.vocabulario.indices
+        for palavra in dict.fromkeys(tokens):
+            if palavra not in indices:
+                self.vocabulario.id(palavra)
+        self._tabelas()
+        return np.fromiter(map(indices.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+
+    def _tokenizar(self, textos: Sequence[Any]):
+        """
+        Palavras do lote com a sentença de cada uma, mais a review de cada
+        sentença. Cada review termina com SEPARADOR_REVIEWS, que também fecha
+        a última sentença dela.
+        """
+        partes = [t.lower().replace(SEPARADOR_REVIEWS, ' ') if isinstance(t, str) else '' for t in textos]
+        ids = self._ids(PADRAO_TOKEN.findall(SEPARADOR_REVIEWS.join(partes) + SEPARADOR_REVIEWS))
+
+        fim = self._fins[ids]
+        # Sentença de cada token (o delimitador pertence à sentença que fecha)
+        sentenca = np.cumsum(fim) - fim
+        separador = self._separadores[ids]
+        review_da_sentenca = (np.cumsum(separador) - separador)[fim]
+        palavra = ~fim
+        return ids[palavra], sentenca[palavra], review_da_sentenca
+
+    def _grupos(self, idiomas: Optional[Sequence[Any]], n: int) -> np.ndarray:
+        """Coluna da tabela de negação de cada review (0 sem idioma ou fora do mapa)"""
+        if idiomas is None:
+            return np.zeros(n, dtype=np.int64)
+        return np.fromiter((self._grupo_idioma.get(i, 0) for i in idiomas), dtype=np.int64, count=n)
+
+    def _valencias_tokens(self, ids: np.ndarray, sentenca: np.ndarray, grupos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Valência de cada palavra ajustada por negação, intensificador e
+        contraste; `grupos` é a coluna de negação (idioma) de cada palavra.
+        """
+        if not len(ids):
+            return np.zeros(0)
+        inicio_sentenca = np.flatnonzero(np.r_[True, sentenca[1:] != sentenca[:-1]])
+        tamanhos = np.diff(np.r_[inicio_sentenca, len(ids)])
+        primeira = np.repeat(inicio_sentenca, tamanhos)
+        posicao = np.arange(len(ids)) - primeira
+
+        # Negação: algum negador nas JANELA_NEGACAO palavras anteriores da sentença
+        negador = self._negadores[ids, 0 if grupos is None else grupos]
+        negado = np.zeros(len(ids), dtype=bool)
+        for k in range(1, JANELA_NEGACAO + 1):
+            negado[k:] |= negador[:-k] & (posicao[k:] >= k)
+
+        # Intensificador: multiplica a palavra seguinte
+        fator = np.ones(len(ids))
+        fator[1:] = np.where(posicao[1:] >= 1, self._multiplicadores[ids[:-1]], 1.0)
+
+        # Contraste: 0,5x antes do primeiro "mas" da sentença e 1,5x depois dele
+        contraste = self._contrastes[ids]
+        acumulado = np.cumsum(contraste)
+        # Adversativas vistas na sentença até a palavra (inclusive)
+        vistos = acumulado - (acumulado[primeira] - contraste[primeira])
+        tem_contraste = np.repeat(np.add.reduceat(contraste, inicio_sentenca) > 0, tamanhos)
+        peso = np.where(tem_contraste, np.where(vistos > 0, 1.5, 0.5), 1.0)
+
+        return self._valencias[ids] * fator * np.where(negado, FATOR_NEGACAO, 1.0) * peso
+
+    def analisar_lote(self, textos: Sequence[Any], idiomas: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """Polaridade de cada review e de cada aspecto mencionado nela (`idiomas`: um por review)"""
+        if not len(textos):
+            return []
+        ids, sentenca, review_da_sentenca = self._tokenizar(textos)
+        grupos = self._grupos(idiomas, len(textos))[review_da_sentenca[sentenca]]
+        somas = np.bincount(sentenca, weights=self._valencias_tokens(ids, sentenca, grupos),
+                            minlength=len(review_da_sentenca))
+        polaridades = normalizar(np.bincount(review_da_sentenca, weights=somas, minlength=len(textos)))
+        resultados = [{'polaridade': p, 'aspectos': {}} for p in polaridades.tolist()]
+
+        # Sentenças distintas que mencionam cada aspecto; o aspecto soma as valências delas
+        n_aspectos = len(self.aspectos)
+        posicoes, aspecto = np.nonzero(self._aspectos_palavra[ids])
+        if len(posicoes):
+            pares = np.unique(sentenca[posicoes] * n_aspectos + aspecto)
+            s, a = np.divmod(pares, n_aspectos)
+            chaves, inverso = np.unique(review_da_sentenca[s] * n_aspectos + a, return_inverse=True)
+            por_aspecto = normalizar(np.bincount(inverso, weights=somas[s]))
+            for chave, p in zip(chaves.tolist(), por_aspecto.tolist()):
+                r, a = divmod(chave, n_aspectos)
+                resultados[r]['aspectos'][self.aspectos[a]] = p
+        return resultados
+
+    def rotular(self, texto: str) -> str:
+        """
+        Rótulo de um trecho curto: 'positive', 'negative' ou 'mixed' (palavras
+        de polaridades opostas sem que uma delas domine, ou polaridade neutra).
+        """
+        valencias = self._valencias_tokens(*self._tokenizar([texto])[:2])
+        polaridade = float(normalizar(valencias.sum()))
+        opostas = (valencias > 0).any() and (valencias < 0).any()
+        if abs(polaridade) < LIMIAR or opostas and abs(polaridade) < 0.5:
+            return 'mixed'
+        return 'positive' if polaridade > 0 else 'negative'
+
+    def abrir_cache(self, caminho: str = CAMINHO_CACHE, max_entradas: int = 1_000_000) -> CacheReviews:
+        """Cache das pontuações por hash da review (escopo próprio no arquivo de cache)"""
+        return CacheReviews('sentimento', self.versao, caminho, max_entradas)
+
+    def analisar(self, textos: Sequence[Any], cache: Optional[CacheReviews] = None,
+                 idiomas: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        if cache is None:
+            return self.analisar_lote(textos, idiomas)
+        if idiomas is None:
+            return cache.resolver(textos, self.analisar_lote)
+        # A negação depende do idioma: ele entra na chave do cache junto com o texto
+        chaves = [f'{idioma}{SEPARADOR_REVIEWS}{texto}' if isinstance(texto, str) else texto
+                  for texto, idioma in zip(textos, idiomas)]
+        return cache.resolver(chaves, self._analisar_chaves)
+
+    def _analisar_chaves(self, chaves: List[Any]) -> List[Dict[str, Any]]:
+        """analisar_lote sobre as chaves "idioma\\x00texto" do cache"""
+        pares = [c.split(SEPARADOR_REVIEWS, 1) if isinstance(c, str) else (None, c) for c in chaves]
+        return self.analisar_lote([texto for _, texto in pares], [idioma for idioma, _ in pares])
+
+
+# Motor do processo, montado na primeira chamada (os workers herdam ou recriam)
+_MOTORES: Dict[str, MotorSentimento] = {}
+
+
+def _analisar_bloco(aspectos, textos):
+    chave = versao_de(aspectos)
+    if chave not in _MOTORES:
+        _MOTORES[chave] = MotorSentimento(aspectos)
+    return _MOTORES[chave].analisar_lote(textos)
+
+
+def analisar_em_processos(textos: Sequence[Any], aspectos: Dict[str, List[str]], workers: Optional[int] = None,
+                          tamanho_bloco: int = 20_000) -> Iterable[Dict[str, Any]]:
+    """Analisa os textos em blocos distribuídos por um pool de processos, na ordem de entrada"""
+    blocos = [textos[i:i + tamanho_bloco] for i in range(0, len(textos), tamanho_bloco)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for resultado in executor.map(_analisar_bloco, [aspectos] * len(blocos), blocos):
+            yield from resultado
@@ -0,0 +1,180 @@
+import gzip
+import io
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from instrumentacao import contar, etapa
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DIRETORIO_SPOOL = 'spool_steam'
+
+
+def carregar_json(conteudo: bytes) -> Any:
+    """Decodifica JSON com orjson quando disponível (várias vezes mais rápido que json)"""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+
+def _extensao() -> str:
+    return '.jsonl.zst' if zstandard is not None else '.jsonl.gz'
+
+
+def _abrir(caminho: str, modo: str):
+    """Abre um arquivo do spool em modo binário ('rb', 'wb' ou 'ab') conforme a compressão"""
+    if caminho.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError(f"O pacote 'zstandard' é necessário para ler {caminho}")
+        if modo == 'rb':
+            leitor = zstandard.ZstdDecompressor().stream_reader(open(caminho, 'rb'), read_across_frames=True, closefd=True)
+            return io.BufferedReader(leitor)
+        # Cada execução anexa um novo frame zstd, lido em sequência na reprodução
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(caminho, modo), closefd=True)
+    # gzip aceita membros concatenados: anexar é abrir em 'ab'
+    return gzip.open(caminho, modo, compresslevel=6)
+
+
+class SaidaFluxo:
+    """
+    Grava as páginas brutas de um (appid, idioma), uma linha JSON por página.
+
+    Ao reescrever (`temporario`), as páginas vão para esse arquivo, que só
+    substitui `caminho` se o fluxo chegar ao fim (`concluir`). Uma coleta que
+    falha no meio descarta o temporário e mantém o spool anterior completo.
+    Ao anexar, as páginas entram direto em `caminho`.
+    """
+
+    def __init__(self, caminho: str, anexar: bool, temporario: Optional[str] = None,
+                 substituidos: Tuple[str, ...] = ()):
+        self.caminho = caminho
+        self.temporario = None if anexar else temporario
+        self.substituidos = substituidos
+        self.arquivo = _abrir(self.temporario or caminho, 'ab' if anexar else 'wb')
+        self.paginas = 0
+        self.concluido = False
+
+    def gravar(self, cursor: str, filtro: str, bruto: bytes) -> None:
+        cabecalho = json.dumps({'cursor': cursor, 'filtro': filtro, 'coletado_em': int(time.time())})
+        # O corpo da resposta entra sem ser decodificado de novo; só é
+        # normalizado se tiver quebras de linha (o que quebraria o JSONL)
+        if b'\n' in bruto:
+            bruto = json.dumps(carregar_json(bruto), ensure_ascii=False).encode('utf-8')
+        self.arquivo.write(cabecalho[:-1].encode('utf-8') + b', "resposta": ' + bruto + b'}\n')
+        self.paginas += 1
+
+    def concluir(self) -> None:
+        """Marca o fluxo como completo: ao fechar, o temporário vira o spool"""
+        self.concluido = True
+
+    def fechar(self) -> None:
+        self.arquivo.close()
+        if self.temporario is None:
+            return
+        if self.concluido:
+            os.replace(self.temporario, self.caminho)
+            # Spool anterior com a outra compressão deixaria de ser lido; sai também
+            for antigo in self.substituidos:
+                if antigo != self.caminho and os.path.exists(antigo):
+                    os.remove(antigo)
+        else:
+            os.remove(self.temporario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *exc):
+        if tipo is not None:
+            self.concluido = False
+        self.fechar()
+
+
+class SpoolRespostas:
+    """
+    Spool das respostas brutas da API da Steam em JSONL comprimido (zstd se o
+    pacote `zstandard` estiver instalado, senão gzip), um arquivo por
+    `diretorio/<appid>/<idioma>`, com o cursor e o filtro de cada página.
+
+    Uma coleta completa reescreve o arquivo do fluxo (só quando termina sem
+    falhas; ver SaidaFluxo); a incremental anexa as páginas novas. Assim o
+    spool sempre contém tudo o que foi coletado e o dataset pode ser
+    reconstruído offline (ReprodutorSpool) depois de mudanças no
+    processamento, sem refazer a coleta contra a API com limite de taxa.
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_SPOOL):
+        self.diretorio = diretorio
+
+    def caminho(self, appid: int, language: str) -> Optional[str]:
+        """Arquivo existente do fluxo (qualquer compressão) ou None"""
+        for extensao in ('.jsonl.zst', '.jsonl.gz'):
+            caminho = os.path.join(self.diretorio, str(appid), language + extensao)
+            if os.path.exists(caminho):
+                return caminho
+        return None
+
+    def fluxo(self, appid: int, language: str, anexar: bool = False) -> SaidaFluxo:
+        pasta = os.path.join(self.diretorio, str(appid))
+        os.makedirs(pasta, exist_ok=True)
+        existente = self.caminho(appid, language)
+        if anexar and existente:
+            return SaidaFluxo(existente, anexar=True)
+        # O temporário termina com a mesma extensão: _abrir escolhe a compressão por ela
+        return SaidaFluxo(os.path.join(pasta, language + _extensao()), anexar=False,
+                          temporario=os.path.join(pasta, f'.{language}.tmp{_extensao()}'),
+                          substituidos=(existente,) if existente else ())
+
+    def paginas(self, appid: int, language: str) -> Iterator[Dict[str, Any]]:
+        """Páginas gravadas do fluxo, na ordem de coleta"""
+        caminho = self.caminho(appid, language)
+        if caminho is None:
+            return
+        with _abrir(caminho, 'rb') as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    yield carregar_json(linha)
+
+
+class ReprodutorSpool:
+    """
+    Substituto offline do ColetorSteam: devolve as reviews gravadas no spool,
+    no mesmo formato de `ColetorSteam.coletar`, sem acessar a rede. Serve para
+    reconstruir o dataset e como fixture determinística para benchmarks.
+    """
+
+    def __init__(self, spool: SpoolRespostas):
+        self.spool = spool
+        # Mesma interface do ColetorSteam; o spool só guarda fluxos já coletados
+        self.incompletos: set = set()
+
+    def coletar_fluxo(self, appid: int, language: str,
+                      desde_timestamp: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Como `ColetorSteam.coletar_fluxo`; o fluxo do spool está sempre completo"""
+        reviews: List[Dict[str, Any]] = []
+        for pagina in self.spool.paginas(appid, language):
+            reviews.extend(pagina['resposta'].get('reviews', []))
+        contar(reviews=len(reviews))
+        print(f"Reproduzidas {len(reviews)} reviews de {language} (App ID: {appid}) do spool.")
+        return reviews, True
+
+    def coletar(self, appids: List[int], languages: List[str],
+                desde: Optional[Dict[Tuple[int, str], int]] = None) -> Dict[Tuple[int, str], List[Dict[str, Any]]]:
+        """`desde` é ignorado: a reprodução sempre devolve tudo o que está no spool"""
+        with etapa('reproducao_spool') as medicao:
+            resultados = {(appid, language): self.coletar_fluxo(appid, language)[0]
+                          for appid in appids for language in languages}
+            medicao.itens = sum(len(r) for r in resultados.values())
+        return resultados
+
+    def fechar(self) -> None:
+        pass
@@ -0,0 +1,170 @@
+import re
+import sys
+import zlib
+
+import numpy as np
+
+# Palavras de 3+ letras em qualquer alfabeto (inclui acentuadas: "história",
+# "mecânica"); dígitos e "_" não contam como letra, e \b evita pegar pedaços
+# de palavras mistas como "abc123"
+PADRAO_PALAVRA = re.compile(r'\b[^\W\d_]{3,}\b')
+
+# Stopwords por idioma (hardcoded para evitar dependências externas)
+STOPWORDS_PT = frozenset({'a', 'o', 'e', 'de', 'do', 'da', 'em', 'um', 'uma', 'que', 'é', 'com', 'não', 'os', 'as', 'para', 'se', 'na', 'no', 'por', 'mais', 'foi', 'ao', 'dos', 'das', 'seu', 'sua', 'ou', 'ser', 'quando', 'muito', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso', 'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse', 'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às', 'minha', 'têm', 'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas', 'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas', 'teu', 'tua', 'teus', 'tuas', 'nosso', 'nossa', 'nossos', 'nossas', 'dela', 'delas', 'esta', 'estes', 'estas', 'aquele', 'aquela', 'aqueles', 'aquelas', 'isto', 'aquilo', 'estou', 'estamos', 'estive', 'esteve', 'estivemos', 'estiveram', 'estava', 'estávamos', 'estavam', 'estivera', 'estivéramos', 'esteja', 'ejamos', 'estejam', 'estivesse', 'estivéssemos', 'estivessem', 'estiver', 'estivermos', 'estiverem', 'hei', 'há', 'havemos', 'hão', 'houve', 'houvemos', 'houveram', 'houvera', 'houvéramos', 'haja', 'hajamos', 'hajam', 'houvesse', 'houvéssemos', 'houvessem', 'houver', 'houvermos', 'houverem', 'houverei', 'houverá', 'houveremos', 'houverão', 'houveria', 'houveríamos', 'houveriam', 'sou', 'somos', 'são', 'éramos', 'eram', 'fui', 'fomos', 'fora', 'foramos', 'sejamos', 'sejam', 'fôssemos', 'fossem', 'for', 'formos', 'forem', 'serei', 'seremos', 'serão', 'seria', 'seríamos', 'seriam', 'tem', 'temos', 'tém', 'tínhamos', 'tinham', 'tive', 'teve', 'tivemos', 'tiveram', 'tivera', 'tivéramos', 'tenha', 'tenhamos', 'tenham', 'tivesse', 'tivéssemos', 'tivessem', 'tiver', 'tivermos', 'tiverem', 'terei', 'terá', 'teremos', 'terão', 'teria', 'teríamos', 'teriam'})
+STOPWORDS_EN = frozenset({
+    'the', 'and', 'of', 'to', 'a', 'in', 'is', 'it', 'you', 'that', 'for', 'on', 'with', 'as', 'was', 'are',
+    'this', 'but', 'be', 'have', 'not', 'an', 'at', 'or', 'if', 'from', 'my', 'all', 'so', 'me', 'by', 'one',
+    'can', 'just', 'like', 'about', 'very', 'out', 'what', 'game',
+    # Lista usual do inglês (pronomes, auxiliares, quantificadores e os restos
+    # de contrações que o PADRAO_PALAVRA separa no apóstrofo: "don't" -> "don")
+    'i', 'we', 'our', 'ours', 'ourselves', 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his',
+    'himself', 'she', 'her', 'hers', 'herself', 'its', 'itself', 'they', 'them', 'their', 'theirs',
+    'themselves', 'which', 'who', 'whom', 'these', 'those', 'am', 'were', 'been', 'being', 'has', 'had',
+    'having', 'do', 'does', 'did', 'doing', 'because', 'until', 'while', 'against', 'between', 'into',
+    'through', 'during', 'before', 'after', 'above', 'below', 'up', 'down', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'any', 'both', 'each', 'few',
+    'more', 'most', 'other', 'some', 'such', 'only', 'own', 'same', 'than', 'too', 'will', 'should', 'now',
+    'no', 'nor', 'much', 'many', 'every', 'also', 'even', 'would', 'could', 'still', 'though', 'ever',
+    'don', 'doesn', 'didn', 'isn', 'aren', 'wasn', 'weren', 'hasn', 'haven', 'hadn', 'won', 'wouldn',
+    'couldn', 'shouldn', 'ain', 'll', 've', 're',
+})
+STOPWORDS_ES = frozenset({'que', 'los', 'las', 'del', 'por', 'con', 'una', 'uno', 'unos', 'unas', 'para', 'como', 'más', 'pero', 'sus', 'este', 'esta', 'está', 'estos', 'estas', 'ese', 'esa', 'eso', 'esto', 'muy', 'sin', 'sobre', 'también', 'hay', 'todo', 'todos', 'fue', 'son', 'ser', 'tiene', 'era', 'porque', 'cuando', 'donde', 'entre', 'hasta', 'desde', 'nos', 'les', 'mis', 'tus', 'otro', 'otra', 'algo', 'nada', 'solo', 'sólo', 'aunque', 'mucho', 'poco', 'ella', 'ellos', 'usted', 'qué',
+    # Lista usual do espanhol (pronomes, possessivos e formas de estar/haber/ser/tener)
+    'yo', 'tú', 'él', 'nosotros', 'nosotras', 'vosotros', 'ellas', 'ustedes', 'mío', 'mía', 'tuyo', 'tuya',
+    'suyo', 'suya', 'nuestro', 'nuestra', 'nuestros', 'nuestras', 'vuestro', 'vuestra', 'cual', 'cuál',
+    'quien', 'quién', 'cuyo', 'donde', 'dónde', 'cómo', 'cuándo', 'cuánto', 'estoy', 'estás', 'estamos',
+    'están', 'estaba', 'estaban', 'estado', 'estar', 'estuvo', 'soy', 'eres', 'somos', 'era', 'eran',
+    'sido', 'siendo', 'sea', 'sean', 'fuera', 'fueron', 'será', 'sería', 'hemos', 'han', 'has', 'había',
+    'habían', 'haber', 'habido', 'tengo', 'tienes', 'tenemos', 'tienen', 'tenía', 'tener', 'tuve', 'tuvo',
+    'ante', 'bajo', 'contra', 'durante', 'mediante', 'según', 'tras', 'ambos', 'cada', 'tanto', 'tan',
+    'muchos', 'muchas', 'otros', 'otras', 'mismo', 'misma', 'ya', 'aquí', 'allí', 'ahí', 'así', 'luego',
+    'entonces', 'mientras', 'antes', 'después', 'siempre', 'nunca', 'también', 'tampoco', 'además'})
+
+STOPWORDS_POR_IDIOMA = {
+    'brazilian': STOPWORDS_PT,
+    'portuguese': STOPWORDS_PT,
+    'english': STOPWORDS_EN,
+    'spanish': STOPWORDS_ES,
+    'latam': STOPWORDS_ES,
+}
+
+# Conjunto usado quando o idioma da review é desconhecido ou não é considerado
+STOPWORDS = STOPWORDS_PT | STOPWORDS_EN | STOPWORDS_ES
+
+
+def tokenizar(texto, stopwords=STOPWORDS):
+    """Palavras de um texto (minúsculas, sem stopwords)"""
+    return [p for p in PADRAO_PALAVRA.findall(texto.lower()) if p not in stopwords]
+
+
+class Vocabulario:
+    """
+    Vocabulário internado palavra → id inteiro.
+
+    Os ids são atribuídos na ordem em que as palavras aparecem e valem apenas
+    dentro do processo; para combinar resultados entre processos use as
+    palavras ou `codigos` (crc32, determinístico).
+    """
+
+    def __init__(self):
+        self.indices = {}
+        self.palavras = []
+        self._codigos = np.zeros(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.palavras)
+
+    def id(self, palavra):
+        indice = self.indices.get(palavra)
+        if indice is None:
+            indice = self.indices[palavra] = len(self.palavras)
+            self.palavras.append(sys.intern(palavra))
+        return indice
+
+    def ids(self, palavras):
+        """Ids de uma sequência de palavras (internando as novas)"""
+        indices = self.indices
+        return np.array([indices[p] if p in indices else self.id(p) for p in palavras], dtype=np.int32)
+
+    def codigos(self):
+        """crc32 de cada palavra do vocabulário, indexado pelo id"""
+        if len(self._codigos) < len(self.palavras):
+            novos = [zlib.crc32(p.encode('utf-8')) for p in self.palavras[len(self._codigos):]]
+            self._codigos = np.concatenate([self._codigos, np.array(novos, dtype=np.uint64)])
+        return self._codigos
+
+
+# Vocabulário compartilhado por todas as análises do processo
+VOCABULARIO = Vocabulario()
+
+
+class LoteTokens:
+    """
+    Tokens de várias reviews em formato compacto: os ids de todas as reviews
+    concatenados em um único array int32 e `limites`, em que os tokens da
+    review i são ids[limites[i]:limites[i + 1]].
+    """
+
+    def __init__(self, ids, limites, vocabulario=VOCABULARIO):
+        self.ids = ids
+        self.limites = limites
+        self.vocabulario = vocabulario
+
+    @classmethod
+    def de_palavras(cls, listas_palavras, vocabulario=VOCABULARIO):
+        """Monta o lote a partir de listas de palavras já tokenizadas"""
+        tamanhos = [len(palavras) for palavras in listas_palavras]
+        limites = np.zeros(len(tamanhos) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=limites[1:])
+        ids = vocabulario.ids(p for palavras in listas_palavras for p in palavras)
+        return cls(ids, limites, vocabulario)
+
+    def __len__(self):
+        return len(self.limites) - 1
+
+    def __getitem__(self, i):
+        return self.ids[self.limites[i]:self.limites[i + 1]]
+
+    def palavras(self, i):
+        return [self.vocabulario.palavras[t] for t in self[i]]
+
+
+def remover_stopwords(lote, idiomas, stopwords_por_idioma=STOPWORDS_POR_IDIOMA, padrao=STOPWORDS):
+    """
+    Novo LoteTokens sem as stopwords do idioma de cada review (`idiomas`, um
+    por review, como a coluna 'Idioma'). Idiomas fora do mapa usam `padrao`.
+
+    As stopwords viram uma máscara idioma × id do vocabulário, e o filtro é
+    uma única indexação numpy sobre os ids do lote.
+    """
+    codigos_idioma = {}
+    codigos = np.array([codigos_idioma.setdefault(i if isinstance(i, str) else None, len(codigos_idioma))
+                        for i in idiomas], dtype=np.int64)
+    mascaras = np.zeros((max(len(codigos_idioma), 1), len(lote.vocabulario)), dtype=bool)
+    indices = lote.vocabulario.indices
+    for idioma, codigo in codigos_idioma.items():
+        conjunto = stopwords_por_idioma.get(idioma, padrao)
+        mascaras[codigo, [indices[p] for p in conjunto if p in indices]] = True
+
+    tamanhos = np.diff(lote.limites)
+    manter = ~mascaras[np.repeat(codigos, tamanhos), lote.ids]
+    limites = np.zeros(len(lote) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.repeat(np.arange(len(lote)), tamanhos)[manter], minlength=len(lote)), out=limites[1:])
+    return LoteTokens(lote.ids[manter], limites, lote.vocabulario)
+
+
+def tokenizar_lote(textos, vocabulario=VOCABULARIO, stopwords=STOPWORDS, idiomas=None):
+    """
+    Tokeniza vários textos de uma vez e devolve um LoteTokens.
+    Valores que não são texto (ex.: NaN) viram reviews sem tokens.
+
+    Com `idiomas` (um por texto), cada review perde as stopwords do seu
+    idioma (STOPWORDS_POR_IDIOMA) e `stopwords` vale só para idiomas fora do
+    mapa; sem ele, `stopwords` vale para todas.
+    """
+    if idiomas is not None:
+        return remover_stopwords(tokenizar_lote(textos, vocabulario, frozenset()), idiomas, padrao=stopwords)
+    return LoteTokens.de_palavras(
+        [tokenizar(t, stopwords) if isinstance(t, str) else [] for t in textos],
+        vocabulario
+    )
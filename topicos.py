@@ -0,0 +1,228 @@
+"""
+Descoberta de tópicos sem supervisão, complementar aos mapas fixos de palavras-chave.
+
+Cada review vira um vetor TF-IDF esparso no espaço de `n_features` colunas
+dado pelo hash (crc32) das palavras, sem vocabulário a ajustar antes. Os
+tópicos são os centróides de um k-means esférico em mini-lotes (similaridade
+de cosseno, atualização de Sculley), ajustado bloco a bloco. Assim, o corpus
+nunca precisa caber inteiro na memória e milhões de reviews rodam na CPU.
+
+    ajuste      `ajustar(fonte)` percorre os blocos `epocas` vezes (por
+                padrão, até somar MIN_ATUALIZACOES mini-lotes: uma época
+                em corpus grandes, várias em corpus pequenos); as
+                frequências de documento (IDF) se acumulam na primeira época
+    atribuição  `contar(blocos)` põe cada review no tópico mais próximo e
+                soma reviews e recomendações por tópico
+    termos      cada coluna do hash é rotulada pela palavra mais frequente
+                que cai nela; os termos de um tópico são as coordenadas em
+                que o centróide mais excede a média dos demais
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from instrumentacao import etapa
+from tokenizador import STOPWORDS, STOPWORDS_POR_IDIOMA, Vocabulario, remover_stopwords, tokenizar_lote
+
+N_FEATURES = 2 ** 18
+TAMANHO_MINILOTE = 2048
+# Reviews sorteadas para a inicialização k-means++
+AMOSTRA_INICIAL = 2000
+# Passos de mini-lote buscados no ajuste sem `epocas` fixo (limitado a MAX_EPOCAS)
+MIN_ATUALIZACOES = 20
+MAX_EPOCAS = 20
+
+
+class ModeloTopicos:
+    """
+    K-means esférico em mini-lotes sobre TF-IDF com hashing.
+
+    `fonte` é uma função que devolve um iterador novo de DataFrames (coluna
+    'Review' e, para as proporções, 'Recomendado') a cada chamada. Com a
+    coluna 'Idioma', cada review perde as stopwords do seu idioma
+    (`stopwords_por_idioma`); sem ela, ou fora do mapa, valem as `stopwords`.
+    """
+
+    def __init__(self, k: int = 8, n_features: int = N_FEATURES, epocas: Optional[int] = None,
+                 tamanho_minilote: int = TAMANHO_MINILOTE, semente: int = 0, stopwords=STOPWORDS,
+                 stopwords_por_idioma=STOPWORDS_POR_IDIOMA):
+        if k < 2:
+            raise ValueError(f"São necessários ao menos 2 tópicos: {k}")
+        self.k = k
+        self.n_features = n_features
+        self.epocas = epocas
+        self.tamanho_minilote = tamanho_minilote
+        self.stopwords = stopwords
+        self.stopwords_por_idioma = stopwords_por_idioma
+        self.rng = np.random.default_rng(semente)
+        self.vocabulario = Vocabulario()
+        self.frequencias = np.zeros(0, dtype=np.int64)
+        self.documentos = 0
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.centroides: Optional[np.ndarray] = None
+        self.epocas_ajustadas = 0
+        self.contagens = np.zeros(k, dtype=np.int64)
+        self.reviews_topico = np.zeros(k, dtype=np.int64)
+        self.recomendadas_topico = np.zeros(k, dtype=np.int64)
+
+    # --- Vetorização ---
+
+    def _contagens(self, textos: List[Any], acumular: bool, idiomas: Optional[List[Any]] = None) -> sparse.csr_matrix:
+        """Matriz review × coluna do hash com as contagens das palavras"""
+        if idiomas is None:
+            lote = tokenizar_lote(textos, self.vocabulario, self.stopwords)
+        else:
+            lote = remover_stopwords(tokenizar_lote(textos, self.vocabulario, frozenset()), idiomas,
+                                     self.stopwords_por_idioma, self.stopwords)
+        colunas = (self.vocabulario.codigos() % self.n_features).astype(np.int64)[lote.ids]
+        linhas = np.repeat(np.arange(len(lote)), np.diff(lote.limites))
+        if acumular:
+            frequencias = np.bincount(lote.ids, minlength=len(self.vocabulario))
+            frequencias[:len(self.frequencias)] += self.frequencias
+            self.frequencias = frequencias
+        matriz = sparse.csr_matrix((np.ones(len(linhas)), (linhas, colunas)), shape=(len(lote), self.n_features))
+        matriz.sum_duplicates()
+        return matriz
+
+    def _tfidf(self, contagens: sparse.csr_matrix) -> sparse.csr_matrix:
+        """TF sublinear × IDF suavizado, com as linhas normalizadas (norma L2)"""
+        idf = np.log((1 + self.documentos) / (1 + self.df)) + 1
+        matriz = contagens.copy()
+        matriz.data = (1 + np.log(matriz.data)) * idf[matriz.indices]
+        normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+        normas[normas == 0] = 1
+        return sparse.diags(1 / normas) @ matriz
+
+    def _minilotes(self, blocos: Iterable[pd.DataFrame]):
+        """Fatias de até `tamanho_minilote` reviews de cada bloco"""
+        for bloco in blocos:
+            for inicio in range(0, len(bloco), self.tamanho_minilote):
+                yield bloco.iloc[inicio:inicio + self.tamanho_minilote]
+
+    @staticmethod
+    def _idiomas(minilote: pd.DataFrame) -> Optional[List[Any]]:
+        return minilote['Idioma'].tolist() if 'Idioma' in minilote.columns else None
+
+    # --- Ajuste ---
+
+    def _inicializar(self, x: sparse.csr_matrix) -> None:
+        """k-means++ (distância de cosseno) em uma amostra do primeiro mini-lote"""
+        x = x[np.flatnonzero(x.getnnz(axis=1))]
+        if x.shape[0] > AMOSTRA_INICIAL:
+            x = x[self.rng.choice(x.shape[0], AMOSTRA_INICIAL, replace=False)]
+        if x.shape[0] < self.k:
+            raise ValueError(f"Reviews com texto insuficientes para {self.k} tópicos: {x.shape[0]}")
+        escolhidas = [int(self.rng.integers(x.shape[0]))]
+        distancias = 1 - (x @ x[escolhidas[0]].T).toarray().ravel()
+        for _ in range(1, self.k):
+            pesos = np.clip(distancias, 0, None) ** 2
+            proxima = int(self.rng.choice(x.shape[0], p=pesos / pesos.sum())) if pesos.sum() > 0 \
+                else int(self.rng.integers(x.shape[0]))
+            escolhidas.append(proxima)
+            distancias = np.minimum(distancias, 1 - (x @ x[proxima].T).toarray().ravel())
+        self.centroides = x[escolhidas].toarray()
+
+    def _atribuir(self, x: sparse.csr_matrix) -> np.ndarray:
+        """Tópico mais próximo de cada linha (-1 para reviews sem palavras)"""
+        topicos = np.asarray(x @ self.centroides.T).argmax(axis=1)
+        topicos[x.getnnz(axis=1) == 0] = -1
+        return topicos
+
+    def ajustar_parcial(self, textos: List[Any], atualizar_idf: bool = True,
+                        idiomas: Optional[List[Any]] = None) -> 'ModeloTopicos':
+        """Um passo do k-means em mini-lote com as reviews de `textos` (e seus `idiomas`)"""
+        contagens = self._contagens(textos, atualizar_idf, idiomas)
+        if atualizar_idf:
+            self.documentos += contagens.shape[0]
+            np.add.at(self.df, contagens.indices, 1)
+        x = self._tfidf(contagens)
+        if self.centroides is None:
+            self._inicializar(x)
+        topicos = self._atribuir(x)
+        validas = topicos >= 0
+        x, topicos = x[validas], topicos[validas]
+        # c ← (1 - η)·c + η·média dos membros, com η = novos / total acumulado do
+        # centróide; a soma dos membros é esparsa (tópico × coluna)
+        membros = sparse.csr_matrix((np.ones(len(topicos)), (topicos, np.arange(len(topicos)))),
+                                    shape=(self.k, len(topicos)))
+        somas = (membros @ x).tocoo()
+        novos = np.bincount(topicos, minlength=self.k)
+        self.contagens += novos
+        taxa = np.divide(novos, self.contagens, out=np.zeros(self.k), where=self.contagens > 0)
+        self.centroides *= (1 - taxa)[:, None]
+        fator = np.divide(taxa, novos, out=np.zeros(self.k), where=novos > 0)
+        self.centroides[somas.row, somas.col] += somas.data * fator[somas.row]
+        # Esférico: centróides de norma 1
+        normas = np.linalg.norm(self.centroides, axis=1, keepdims=True)
+        self.centroides /= np.where(normas > 0, normas, 1)
+        return self
+
+    def ajustar(self, fonte: Callable[[], Iterable[pd.DataFrame]]) -> 'ModeloTopicos':
+        atualizacoes = 0
+        with etapa('topicos_ajuste', itens=0) as medicao:
+            for epoca in range(self.epocas or MAX_EPOCAS):
+                for minilote in self._minilotes(fonte()):
+                    self.ajustar_parcial(minilote['Review'].tolist(), epoca == 0, self._idiomas(minilote))
+                    medicao.itens += len(minilote)
+                    atualizacoes += 1
+                self.epocas_ajustadas = epoca + 1
+                if self.epocas is None and atualizacoes >= MIN_ATUALIZACOES:
+                    break
+        return self
+
+    def prever(self, textos: List[Any], idiomas: Optional[List[Any]] = None) -> np.ndarray:
+        """Tópico de cada review (-1 para reviews sem palavras)"""
+        return self._atribuir(self._tfidf(self._contagens(textos, False, idiomas)))
+
+    def contar(self, blocos: Iterable[pd.DataFrame]) -> 'ModeloTopicos':
+        """Reviews e recomendações por tópico"""
+        with etapa('topicos_atribuicao', itens=0) as medicao:
+            for minilote in self._minilotes(blocos):
+                topicos = self.prever(minilote['Review'].tolist(), self._idiomas(minilote))
+                validas = topicos >= 0
+                self.reviews_topico += np.bincount(topicos[validas], minlength=self.k)
+                if 'Recomendado' in minilote.columns:
+                    recomendadas = minilote['Recomendado'].to_numpy(dtype=bool)[validas]
+                    self.recomendadas_topico += np.bincount(topicos[validas], weights=recomendadas,
+                                                            minlength=self.k).astype(np.int64)
+                medicao.itens += len(minilote)
+        return self
+
+    # --- Resultado ---
+
+    def rotulos_colunas(self) -> Dict[int, str]:
+        """Palavra mais frequente de cada coluna do hash usada pelo corpus"""
+        colunas = (self.vocabulario.codigos() % self.n_features).astype(np.int64)
+        # Ordena por coluna e, dentro dela, pela frequência decrescente
+        ordem = np.lexsort((-self.frequencias, colunas[:len(self.frequencias)]))
+        colunas_ordenadas = colunas[ordem]
+        primeiras = ordem[np.r_[True, colunas_ordenadas[1:] != colunas_ordenadas[:-1]]]
+        return {int(colunas[i]): self.vocabulario.palavras[i] for i in primeiras.tolist()}
+
+    def topicos(self, n_termos: int = 8) -> List[Dict[str, Any]]:
+        """Tópicos com reviews, do maior para o menor: termos, reviews e % de recomendações"""
+        rotulos = self.rotulos_colunas()
+        # Termos que distinguem o tópico: peso no centróide menos a média dos outros
+        # centróides (palavras comuns a todos, como "game" ou "very", perdem posições)
+        outros = (self.centroides.sum(axis=0) - self.centroides) / (self.k - 1)
+        distintivos = self.centroides - outros
+        resultado = []
+        for t in np.argsort(-self.reviews_topico, kind='stable').tolist():
+            reviews = int(self.reviews_topico[t])
+            if not reviews:
+                continue
+            principais = np.argsort(-distintivos[t])[:n_termos]
+            resultado.append({
+                'termos': [rotulos[c] for c in principais.tolist() if distintivos[t, c] > 0 and c in rotulos],
+                'reviews': reviews,
+                'recomendadas': round(100 * int(self.recomendadas_topico[t]) / reviews, 1),
+            })
+        return resultado
+
+
+def descobrir_topicos(fonte: Callable[[], Iterable[pd.DataFrame]], k: int = 8, **opcoes: Any) -> List[Dict[str, Any]]:
+    """Ajusta o modelo em `fonte` e devolve os tópicos com as proporções de recomendação"""
+    modelo = ModeloTopicos(k, **opcoes).ajustar(fonte)
+    return modelo.contar(fonte()).topicos()